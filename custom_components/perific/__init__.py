@@ -2,30 +2,65 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import aiohttp_client
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api import PerificAPI
-from .const import DOMAIN
+from .const import (
+    CONF_MAX_STALENESS,
+    CONF_OPENMETRICS,
+    CONF_THRESHOLDS,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    DOMAIN,
+    OPENMETRICS_VIEW,
+    SCAN_INTERVAL_POWER,
+)
+from .coordinator import create_shard_coordinators
+from .forecast import ConsumptionForecaster
+from .peaks import PeakTracker
+from .services import async_setup_services
+from .thresholds import Threshold, ThresholdMonitor
+from .tracing import RequestTracer
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Perific services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Perific from a config entry."""
+    # Sampled requests are traced through a session of their own
+    tracer = None
+    session = aiohttp_client.async_get_clientsession(hass)
+    if sample_rate := entry.options.get(
+        CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE
+    ):
+        tracer = RequestTracer(sample_rate)
+        session = aiohttp_client.async_create_clientsession(
+            hass, trace_configs=[tracer.trace_config()]
+        )
+        entry.async_on_unload(session.close)
+
     api = PerificAPI(
-        entry.data["email"],
-        entry.data.get("token"),
-        session=aiohttp_client.async_get_clientsession(hass),
+        entry.data["email"], entry.data.get("token"), session=session, tracer=tracer
     )
 
     try:
@@ -38,65 +73,87 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as err:
         raise ConfigEntryNotReady(f"Failed to authenticate: {err}") from err
 
-    coordinator = PerificDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    # Items are known from their packets, their parameters are looked up in
+    # the background once polling runs
+    try:
+        packets, _ = await api.get_latest_packets_snapshot()
+    except Exception as err:
+        raise ConfigEntryNotReady(f"Failed to discover items: {err}") from err
+    items = api.discover_items(packets)
+
+    forecaster = ConsumptionForecaster(hass, entry.entry_id)
+    await forecaster.async_load()
+    peaks = PeakTracker(hass, entry.entry_id)
+    await peaks.async_load()
+
+    # Large accounts are split into shards that refresh one after another.
+    # The first refresh reuses the packets fetched for discovery, the entry's
+    # phase offset staggers every scheduled refresh after it, so accounts
+    # set up together don't poll the API at the same moment.
+    slot, slots = _entry_slot(hass, entry)
+    interval = SCAN_INTERVAL_POWER.total_seconds()
+    coordinators = create_shard_coordinators(
+        hass,
+        api,
+        [item["id"] for item in items],
+        phase_offset=interval * slot / slots,
+        spread=interval / slots,
+        max_staleness=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+        forecaster=forecaster,
+        peaks=peaks,
+        thresholds=ThresholdMonitor(
+            Threshold.from_dict(threshold)
+            for threshold in entry.options.get(CONF_THRESHOLDS, [])
+        ),
+    )
+    await asyncio.gather(
+        *(
+            coordinator.async_config_entry_first_refresh()
+            for coordinator in coordinators
+        )
+    )
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
-        "coordinator": coordinator,
+        "coordinators": coordinators,
+        "forecaster": forecaster,
+        "peaks": peaks,
     }
 
+    # Views cannot be removed, the view serves the entries that enable it
+    if entry.options.get(CONF_OPENMETRICS) and not hass.data.get(OPENMETRICS_VIEW):
+        from .openmetrics import PerificMetricsView
+
+        hass.http.register_view(PerificMetricsView(hass))
+        hass.data[OPENMETRICS_VIEW] = True
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["forecaster"].async_save()
+        await entry_data["peaks"].async_save()
+        await entry_data["api"].close()
 
     return unload_ok
 
 
-class PerificDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Perific data."""
-
-    def __init__(self, hass: HomeAssistant, api: PerificAPI) -> None:
-        """Initialize."""
-        self.api = api
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=30),
-        )
-
-    async def _async_update_data(self):
-        """Fetch data from API."""
-        try:
-            data = {}
-
-            # Get user info
-            user_info = await self.api.get_user_info()
-            data["user"] = user_info
-
-            # Discover items/meters
-            items = await self.api.discover_items()
-
-            # Get power and energy data for each item
-            data["items"] = {}
-            for item in items:
-                item_id = item["id"]
-                item_data = {
-                    "info": item,
-                    "power": await self.api.get_current_power(item_id),
-                    "energy_today": await self.api.get_energy_today(item_id),
-                }
-
-                data["items"][item_id] = item_data
-
-            return data
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+def _entry_slot(hass: HomeAssistant, entry: ConfigEntry) -> tuple[int, int]:
+    """Return the entry's stable position among all Perific entries."""
+    entry_ids = sorted(e.entry_id for e in hass.config_entries.async_entries(DOMAIN))
+    if entry.entry_id not in entry_ids:
+        return 0, 1
+    return entry_ids.index(entry.entry_id), len(entry_ids)
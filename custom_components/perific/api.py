@@ -2,15 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import ssl
-from datetime import datetime, timedelta
-from typing import Any
-
-import aiohttp
-import certifi
-from aiohttp import ClientError, ClientSession
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
 
+from .cache import SnapshotCache
 from .const import (
     API_ACCOUNT_OVERVIEW,
     API_BASE_URL,
@@ -21,11 +19,37 @@ from .const import (
     API_REFRESH_TOKEN,
     API_REPORTER_SETTINGS,
     API_USER_INFO,
+    ITEM_PARAMETERS_MAX_RETRY,
+    ITEM_PARAMETERS_RETRY,
+    METADATA_MAX_CONCURRENCY,
+    PACKET_PERIODS,
 )
+from .limiter import RequestPriority, get_limiter
+from .profiler import span
+
+if TYPE_CHECKING:
+    import ssl
+
+    from aiohttp import ClientSession
+
+    from .replay import RequestRecorder
+    from .tracing import RequestTracer
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _create_ssl_context() -> ssl.SSLContext:
+    """Create an SSL context with certifi's CA bundle.
+
+    This reads the CA bundle from disk, so run it in an executor.
+    """
+    import ssl
+
+    import certifi
+
+    return ssl.create_default_context(cafile=certifi.where())
+
+
 class PerificAuthError(Exception):
     """Authentication error."""
 
@@ -42,40 +66,100 @@ class PerificAPI:
         username: str,
         token: str | None = None,
         session: ClientSession | None = None,
+        tracer: RequestTracer | None = None,
     ) -> None:
         """Initialize the API client."""
         self._username = username
         self._token = token
 
-        # Create SSL context with proper certificates
-        if session is None:
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            self._session = ClientSession(connector=connector)
-            self._session_owner = True  # We created the session
-        else:
-            self._session = session
-            self._session_owner = False  # Session provided by Home Assistant
+        # Without a session from Home Assistant, one is created on first use
+        self._session = session
+        self._session_owner = False
 
+        self._limiter = get_limiter(API_BASE_URL)
+        self.tracer = tracer
+        self._snapshots = SnapshotCache(tracer=tracer)
         self._token_expires: datetime | None = None
         self._user_id: int | None = None
         self._items: list[dict[str, Any]] = []
+        self._item_info: dict[int, dict[str, Any]] = {}
+        # Loop time and delay of the next lookup of items whose lookup failed
+        self._item_info_retry: dict[int, tuple[float, float]] = {}
+        self._item_info_lock = asyncio.Lock()
+
+    async def _async_get_session(self) -> ClientSession:
+        """Return the session, creating our own on first use."""
+        if self._session is None:
+            from aiohttp import ClientSession, TCPConnector
+
+            # Create SSL context with proper certificates off the event loop
+            ssl_context = await asyncio.get_running_loop().run_in_executor(
+                None, _create_ssl_context
+            )
+            if self._session is None:
+                self._session = ClientSession(connector=TCPConnector(ssl=ssl_context))
+                self._session_owner = True  # We created the session
+        return self._session
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        priority: RequestPriority,
+        error: type[Exception],
+        message: str,
+        **kwargs,
+    ) -> Any:
+        """Send a request through the shared limiter and return the JSON body.
+
+        Sampled requests are traced however they end, including timeouts and
+        cancellation.
+        """
+        from aiohttp import ClientError
+
+        session = await self._async_get_session()
+        trace = self.tracer.start(method, url) if self.tracer else None
+        status = None
+        failure: BaseException | None = None
+        try:
+            with span("limiter"):
+                await self._limiter.acquire(priority)
+            if trace is not None:
+                trace.dequeued()
+                kwargs["trace_request_ctx"] = trace
+            with span("request"):
+                async with session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    response.raise_for_status()
+                    with span("json"):
+                        return await response.json()
+        except ClientError as err:
+            failure = err
+            raise error(f"{message}: {err}") from err
+        except asyncio.TimeoutError as err:
+            failure = err
+            raise error(f"{message}: request timed out") from err
+        except asyncio.CancelledError as err:
+            failure = err
+            raise
+        finally:
+            if trace is not None:
+                self.tracer.finish(trace, status, failure)
 
     async def check_activation(self) -> bool:
         """Check if user is activated."""
         data = {"username": self._username}
 
-        try:
-            async with self._session.put(
-                f"{API_BASE_URL}{API_IS_ACTIVATED}",
-                json=data,
-                headers={"Content-Type": "application/json"},
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result.get("UserIsActivated", False)
-        except ClientError as err:
-            raise PerificAuthError(f"Activation check failed: {err}") from err
+        result = await self._send(
+            "PUT",
+            f"{API_BASE_URL}{API_IS_ACTIVATED}",
+            RequestPriority.REALTIME,
+            PerificAuthError,
+            "Activation check failed",
+            json=data,
+            headers={"Content-Type": "application/json"},
+        )
+        return result.get("UserIsActivated", False)
 
     async def refresh_token(self) -> None:
         """Refresh the access token."""
@@ -84,34 +168,32 @@ class PerificAPI:
 
         data = {"token": self._token}
 
-        try:
-            async with self._session.put(
-                f"{API_BASE_URL}{API_REFRESH_TOKEN}",
-                json=data,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Authorization": self._token,
-                },
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-
-                token_info = result.get("TokenInfo", {})
-                self._token = token_info.get("Token")
+        result = await self._send(
+            "PUT",
+            f"{API_BASE_URL}{API_REFRESH_TOKEN}",
+            RequestPriority.REALTIME,
+            PerificAuthError,
+            "Token refresh failed",
+            json=data,
+            headers={
+                "Content-Type": "application/json",
+                "X-Authorization": self._token,
+            },
+        )
 
-                # Parse expiration
-                valid_to = token_info.get("ValidTo")
-                if valid_to:
-                    self._token_expires = datetime.fromisoformat(
-                        valid_to.replace("Z", "+00:00")
-                    )
+        token_info = result.get("TokenInfo", {})
+        self._token = token_info.get("Token")
 
-                # Store user ID
-                user_info = result.get("User", {})
-                self._user_id = user_info.get("UserId")
+        # Parse expiration
+        valid_to = token_info.get("ValidTo")
+        if valid_to:
+            self._token_expires = datetime.fromisoformat(
+                valid_to.replace("Z", "+00:00")
+            )
 
-        except ClientError as err:
-            raise PerificAuthError(f"Token refresh failed: {err}") from err
+        # Store user ID
+        user_info = result.get("User", {})
+        self._user_id = user_info.get("UserId")
 
     async def _ensure_authenticated(self) -> None:
         """Ensure we have a valid token."""
@@ -124,7 +206,13 @@ class PerificAPI:
         ):
             await self.refresh_token()
 
-    async def _request(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        priority: RequestPriority = RequestPriority.METADATA,
+        **kwargs,
+    ) -> dict[str, Any]:
         """Make an authenticated request."""
         await self._ensure_authenticated()
 
@@ -139,14 +227,15 @@ class PerificAPI:
 
         url = f"{API_BASE_URL}{endpoint}"
 
-        try:
-            async with self._session.request(
-                method, url, headers=headers, **kwargs
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
-        except ClientError as err:
-            raise PerificAPIError(f"API request failed: {err}") from err
+        return await self._send(
+            method,
+            url,
+            priority,
+            PerificAPIError,
+            "API request failed",
+            headers=headers,
+            **kwargs,
+        )
 
     async def get_user_info(self) -> dict[str, Any]:
         """Get user information."""
@@ -159,7 +248,29 @@ class PerificAPI:
 
     async def get_latest_packets(self) -> list[dict[str, Any]]:
         """Get latest meter readings."""
-        return await self._request("PUT", API_LATEST_PACKETS)
+        return await self._request(
+            "PUT", API_LATEST_PACKETS, priority=RequestPriority.REALTIME
+        )
+
+    async def get_latest_packets_snapshot(
+        self, max_age: float = 0.0
+    ) -> tuple[list[dict[str, Any]], float]:
+        """Get latest meter readings, falling back to the last good response.
+
+        A response younger than `max_age` seconds is reused as is. Returns the
+        packets and their age in seconds.
+        """
+        return await self._snapshots.get(
+            "latest_packets", self.get_latest_packets, max_age
+        )
+
+    async def get_reporter_settings_snapshot(
+        self, max_age: float = 0.0
+    ) -> tuple[dict[str, Any], float]:
+        """Get reporter settings, falling back to the last good response."""
+        return await self._snapshots.get(
+            "reporter_settings", self.get_reporter_settings, max_age
+        )
 
     async def get_phase_data(
         self,
@@ -167,32 +278,37 @@ class PerificAPI:
         from_date: datetime,
         to_date: datetime,
         data_type: str = "Avg",
+        priority: RequestPriority = RequestPriority.HISTORY,
     ) -> list[dict[str, Any]]:
         """Get phase data for time range."""
         # This endpoint uses form data
-        form_data = aiohttp.FormData()
-        form_data.add_field("itemId", str(item_id))
-        form_data.add_field("fromDate", from_date.isoformat())
-        form_data.add_field("toDate", to_date.isoformat())
-        form_data.add_field("dataType", data_type)
+        form_data = {
+            "itemId": str(item_id),
+            "fromDate": from_date.isoformat(),
+            "toDate": to_date.isoformat(),
+            "dataType": data_type,
+        }
 
         headers = {"X-Authorization": self._token}
 
         url = f"{API_BASE_URL}{API_PHASE_DATA}"
 
-        try:
-            async with self._session.post(
-                url, data=form_data, headers=headers
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
-        except ClientError as err:
-            raise PerificAPIError(f"Phase data request failed: {err}") from err
+        return await self._send(
+            "POST",
+            url,
+            priority,
+            PerificAPIError,
+            "Phase data request failed",
+            data=form_data,
+            headers=headers,
+        )
 
-    async def get_item_parameters(self, item_id: int) -> dict[str, Any]:
+    async def get_item_parameters(
+        self, item_id: int, priority: RequestPriority = RequestPriority.METADATA
+    ) -> dict[str, Any]:
         """Get item parameters."""
         data = {"itemId": item_id}
-        return await self._request("PUT", API_ITEM_PARAMETERS, json=data)
+        return await self._request("PUT", API_ITEM_PARAMETERS, priority, json=data)
 
     async def get_reporter_settings(self) -> dict[str, Any]:
         """Get reporter settings (EV chargers, etc.)."""
@@ -201,129 +317,319 @@ class PerificAPI:
     async def get_current_power(self, item_id: int) -> dict[str, Any]:
         """Get current power reading from latest packets."""
         packets = await self.get_latest_packets()
-
-        for packet in packets:
-            if packet.get("ItemId") == item_id:
-                latest_packets = packet.get("LatestPackets", {})
-
-                # Try to get the most recent data
-                for packet_type in ["PhaseRealTime", "PhaseMinute", "PhaseHour"]:
-                    if packet_type in latest_packets:
-                        phase_data = latest_packets[packet_type]
-                        data = phase_data.get("data", {})
-
-                        # Calculate total power from current and voltage
-                        hiavg = data.get("hiavg", [0, 0, 0])
-                        huavg = data.get("huavg", [230, 230, 230])
-
-                        # Calculate power per phase (P = U * I)
-                        power_phases = [
-                            abs(current) * voltage
-                            for current, voltage in zip(hiavg, huavg)
-                        ]
-                        total_power = sum(power_phases)
-
-                        return {
-                            "timestamp": datetime.fromtimestamp(
-                                phase_data.get("ts", 0) / 1000
-                            ).isoformat(),
-                            "power": {
-                                "total": total_power,
-                                "l1": power_phases[0],
-                                "l2": power_phases[1],
-                                "l3": power_phases[2],
-                            },
-                            "voltage": {
-                                "l1": huavg[0],
-                                "l2": huavg[1],
-                                "l3": huavg[2],
-                            },
-                            "current": {
-                                "l1": hiavg[0],
-                                "l2": hiavg[1],
-                                "l3": hiavg[2],
-                            },
-                            "imported_energy": data.get("hwi", 0),
-                            "exported_energy": data.get("hwo", 0),
-                            "firmware": phase_data.get("fw"),
-                            "signal_strength": phase_data.get("rssi"),
-                        }
-
-        return {}
+        return parse_current_power(find_item_packets(packets, item_id))
 
     async def get_energy_today(self, item_id: int) -> dict[str, Any]:
         """Get today's energy consumption."""
         packets = await self.get_latest_packets()
-
-        for packet in packets:
-            if packet.get("ItemId") == item_id:
-                latest_packets = packet.get("LatestPackets", {})
-
-                # Get day data if available
-                if "PhaseDay" in latest_packets:
-                    day_data = latest_packets["PhaseDay"].get("data", {})
-
-                    # Calculate energy from power data
-                    hwpi = day_data.get("hwpi", [0, 0, 0])
-                    hwpo = day_data.get("hwpo", [0, 0, 0])
-
-                    imported_today = sum(hwpi)
-                    exported_today = sum(hwpo)
-
-                    return {
-                        "imported": imported_today,
-                        "exported": exported_today,
-                        "net": imported_today - exported_today,
-                        "unit": "kWh",
-                    }
-
-        return {"imported": 0, "exported": 0, "net": 0, "unit": "kWh"}
-
-    async def discover_items(self) -> list[dict[str, Any]]:
-        """Discover available items/meters."""
-        packets = await self.get_latest_packets()
-        items = []
-
-        for packet in packets:
-            item_id = packet.get("ItemId")
-            if item_id:
-                # Get item parameters for more details
-                try:
-                    params = await self.get_item_parameters(item_id)
-                    actual_params = params.get("ActualParameters", {})
-
-                    items.append(
-                        {
-                            "id": item_id,
-                            "name": actual_params.get("Name", f"Item {item_id}"),
-                            "system_name": actual_params.get("SystemName", ""),
-                            "type": actual_params.get("ItemType", "Phase"),
-                            "subtype": actual_params.get("ItemSubType", ""),
-                            "category": actual_params.get("ItemCategory", ""),
-                            "mac": actual_params.get("Mac", ""),
-                            "timezone": actual_params.get("TimeZone", ""),
-                        }
-                    )
-                except Exception as e:
-                    _LOGGER.warning(f"Could not get parameters for item {item_id}: {e}")
-                    items.append(
-                        {
-                            "id": item_id,
-                            "name": f"Item {item_id}",
-                            "system_name": "",
-                            "type": "Phase",
-                            "subtype": "",
-                            "category": "",
-                            "mac": "",
-                            "timezone": "",
-                        }
-                    )
-
-        self._items = items
-        return items
+        return parse_energy_today(find_item_packets(packets, item_id))
+
+    def discover_items(self, packets: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the items/meters of a latest packets response.
+
+        Items are known by the ItemId of their packets alone. Until their
+        parameters are fetched with `async_fetch_item_info`, they get
+        fallback details.
+        """
+        self._items = [
+            self.item_info(packet["ItemId"])
+            for packet in packets
+            if packet.get("ItemId")
+        ]
+        return self._items
+
+    def item_info(self, item_id: int) -> dict[str, Any]:
+        """Return an item's details, or fallback details until they are fetched."""
+        if (info := self._item_info.get(item_id)) is not None:
+            return info
+        return {
+            "id": item_id,
+            "name": f"Item {item_id}",
+            "system_name": "",
+            "type": "Phase",
+            "subtype": "",
+            "category": "",
+            "mac": "",
+            "timezone": "",
+        }
+
+    def missing_item_info(self, item_ids: Iterable[int]) -> list[int]:
+        """Return the items whose parameters are due to be fetched."""
+        now = asyncio.get_running_loop().time()
+        return [
+            item_id
+            for item_id in item_ids
+            if item_id not in self._item_info
+            and self._item_info_retry.get(item_id, (0.0, 0.0))[0] <= now
+        ]
+
+    async def async_fetch_item_info(
+        self,
+        item_ids: Iterable[int],
+        max_concurrency: int = METADATA_MAX_CONCURRENCY,
+    ) -> None:
+        """Fetch the parameters of the items that are missing them.
+
+        Callers take turns, so shards fetch one after another, and the
+        lookups leave the limiter's reserve to polling. Item parameters are
+        fetched once per item and then reused, a failed lookup is retried
+        after a backoff.
+        """
+        async with self._item_info_lock:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            await asyncio.gather(
+                *(
+                    self._async_item_info(item_id, semaphore)
+                    for item_id in self.missing_item_info(item_ids)
+                )
+            )
+
+    async def _async_item_info(
+        self, item_id: int, semaphore: asyncio.Semaphore
+    ) -> None:
+        """Fetch and store an item's details."""
+        try:
+            async with semaphore:
+                params = await self.get_item_parameters(
+                    item_id, RequestPriority.HISTORY
+                )
+        except (PerificAPIError, PerificAuthError) as err:
+            _, delay = self._item_info_retry.get(item_id, (0.0, 0.0))
+            delay = min(
+                delay * 2 or ITEM_PARAMETERS_RETRY.total_seconds(),
+                ITEM_PARAMETERS_MAX_RETRY.total_seconds(),
+            )
+            self._item_info_retry[item_id] = (
+                asyncio.get_running_loop().time() + delay,
+                delay,
+            )
+            _LOGGER.warning(
+                "Could not get parameters for item %s, retrying in %.0f s: %s",
+                item_id,
+                delay,
+                err,
+            )
+            return
+
+        actual_params = params.get("ActualParameters", {})
+        self._item_info_retry.pop(item_id, None)
+        self._item_info[item_id] = {
+            "id": item_id,
+            "name": actual_params.get("Name", f"Item {item_id}"),
+            "system_name": actual_params.get("SystemName", ""),
+            "type": actual_params.get("ItemType", "Phase"),
+            "subtype": actual_params.get("ItemSubType", ""),
+            "category": actual_params.get("ItemCategory", ""),
+            "mac": actual_params.get("Mac", ""),
+            "timezone": actual_params.get("TimeZone", ""),
+        }
+
+    @property
+    def recording(self) -> bool:
+        """Return True while requests are being recorded."""
+        from .replay import RecordingSession
+
+        return isinstance(self._session, RecordingSession)
+
+    async def async_record(self, recorder: RequestRecorder | None) -> None:
+        """Record requests with `recorder`, or stop recording if None."""
+        from .replay import RecordingSession
+
+        if isinstance(self._session, RecordingSession):
+            self._session = self._session.session
+        if recorder is not None:
+            self._session = recorder.wrap(await self._async_get_session())
+
+    def has_spare_capacity(self) -> bool:
+        """Return True if the shared limiter has tokens beyond its bulk reserve."""
+        return self._limiter.has_spare()
+
+    @property
+    def limiter_metrics(self) -> dict[str, Any]:
+        """Return metrics of the shared request limiter."""
+        return self._limiter.metrics
+
+    @property
+    def snapshot_metrics(self) -> dict[str, int]:
+        """Return snapshot cache hit/miss/error counts."""
+        return {
+            "hits": self._snapshots.hits,
+            "misses": self._snapshots.misses,
+            "errors": self._snapshots.errors,
+        }
 
     async def close(self) -> None:
         """Close the session."""
+        await self._snapshots.close()
         # Only close the session if we created it
-        if self._session_owner:
+        if self._session_owner and self._session is not None:
             await self._session.close()
+            self._session = None
+            self._session_owner = False
+
+
+def find_item_packets(packets: list[dict[str, Any]], item_id: int) -> dict[str, Any]:
+    """Return the LatestPackets of one item from a /getlatestpackets response."""
+    for packet in packets:
+        if packet.get("ItemId") == item_id:
+            return packet.get("LatestPackets", {})
+    return {}
+
+
+def phase_powers(hiavg: list[float], huavg: list[float]) -> list[float]:
+    """Calculate power per phase (P = U * I)."""
+    return [abs(current) * voltage for current, voltage in zip(hiavg, huavg)]
+
+
+def parse_current_power(latest_packets: dict[str, Any]) -> dict[str, Any]:
+    """Parse the current power reading from an item's latest packets."""
+    # Try to get the most recent data
+    for packet_type in ["PhaseRealTime", "PhaseMinute", "PhaseHour"]:
+        if packet_type in latest_packets:
+            phase_data = latest_packets[packet_type]
+            data = phase_data.get("data", {})
+
+            # Calculate total power from current and voltage
+            hiavg = data.get("hiavg", [0, 0, 0])
+            huavg = data.get("huavg", [230, 230, 230])
+
+            power_phases = phase_powers(hiavg, huavg)
+            total_power = sum(power_phases)
+
+            return {
+                "timestamp": datetime.fromtimestamp(
+                    phase_data.get("ts", 0) / 1000, timezone.utc
+                ).isoformat(),
+                "power": {
+                    "total": total_power,
+                    "l1": power_phases[0],
+                    "l2": power_phases[1],
+                    "l3": power_phases[2],
+                },
+                "voltage": {
+                    "l1": huavg[0],
+                    "l2": huavg[1],
+                    "l3": huavg[2],
+                },
+                "current": {
+                    "l1": hiavg[0],
+                    "l2": hiavg[1],
+                    "l3": hiavg[2],
+                },
+                "imported_energy": data.get("hwi", 0),
+                "exported_energy": data.get("hwo", 0),
+                "firmware": phase_data.get("fw"),
+                "signal_strength": phase_data.get("rssi"),
+            }
+
+    return {}
+
+
+def parse_energy_today(latest_packets: dict[str, Any]) -> dict[str, Any]:
+    """Parse today's energy consumption from an item's latest packets."""
+    # Get day data if available
+    if "PhaseDay" in latest_packets:
+        day_data = latest_packets["PhaseDay"].get("data", {})
+
+        # Calculate energy from power data
+        hwpi = day_data.get("hwpi", [0, 0, 0])
+        hwpo = day_data.get("hwpo", [0, 0, 0])
+
+        imported_today = sum(hwpi)
+        exported_today = sum(hwpo)
+
+        return {
+            "imported": imported_today,
+            "exported": exported_today,
+            "net": imported_today - exported_today,
+            "unit": "kWh",
+        }
+
+    return {"imported": 0, "exported": 0, "net": 0, "unit": "kWh"}
+
+
+def parse_counters(latest_packets: dict[str, Any]) -> dict[str, float]:
+    """Return the latest cumulative imported and exported energy in kWh.
+
+    Realtime packets carry no counters, the freshest are in the minute packet.
+    """
+    for packet_type in PACKET_PERIODS.values():
+        data = latest_packets.get(packet_type, {}).get("data", {})
+        if data.get("hwi") is not None and data.get("hwo") is not None:
+            return {"imported": data["hwi"], "exported": data["hwo"]}
+    return {}
+
+
+def _phases(values: list[float] | None) -> dict[str, float] | None:
+    """Map a per-phase list to L1-L3."""
+    if not values or len(values) < 3:
+        return None
+    return {"l1": values[0], "l2": values[1], "l3": values[2]}
+
+
+def parse_envelope(latest_packets: dict[str, Any]) -> dict[str, Any]:
+    """Parse per-phase current extremes and energy from aggregated packets.
+
+    Returns one entry per available period ("minute", "hour", "day") with the
+    signed minimum and maximum current, the peak current magnitude and, when
+    the packet carries them, the imported and exported energy per phase.
+    """
+    envelope = {}
+    for period, packet_type in PACKET_PERIODS.items():
+        data = latest_packets.get(packet_type, {}).get("data", {})
+        values = {
+            "current_min": _phases(data.get("himin")),
+            "current_max": _phases(data.get("himax")),
+            "energy_imported": _phases(data.get("hwpi")),
+            "energy_exported": _phases(data.get("hwpo")),
+        }
+        if values["current_min"] and values["current_max"]:
+            values["current_peak"] = {
+                phase: max(abs(low), abs(values["current_max"][phase]))
+                for phase, low in values["current_min"].items()
+            }
+        values = {key: value for key, value in values.items() if value}
+        if values:
+            envelope[period] = values
+    return envelope
+
+
+def parse_fuse_levels(reporter_settings: dict[str, Any]) -> dict[int, dict[str, Any]]:
+    """Map the items linked to EV charger reporters to their fuse levels.
+
+    Every "...Reporters" list is searched, so all charger brands are covered.
+    An item linked to several reporters gets the lowest mains fuse level.
+    """
+    fuses: dict[int, dict[str, Any]] = {}
+    for key, reporters in (reporter_settings or {}).items():
+        if not key.endswith("Reporters") or not isinstance(reporters, list):
+            continue
+        for reporter in reporters:
+            settings = reporter.get("SimpleSettings") or {}
+            item_id = settings.get("ItemId")
+            mains = settings.get("MainsFuseLevel")
+            if item_id is None or not mains or mains <= 0:
+                continue
+            if item_id in fuses and fuses[item_id]["mains_fuse"] <= mains:
+                continue
+            fuses[item_id] = {
+                "mains_fuse": mains,
+                "charger_fuse": settings.get("ChargerFuseLevel"),
+                "reporter": key.removesuffix("Reporters").lower(),
+            }
+    return fuses
+
+
+def fuse_headroom(
+    mains_fuse: float, current: dict[str, float] | None
+) -> dict[str, float]:
+    """Return the current left per phase below the mains fuse level.
+
+    Current in either direction counts against the fuse, so exported current
+    is not treated as extra headroom.
+    """
+    if not current:
+        return {}
+    return {
+        phase: round(mains_fuse - abs(value), 2) for phase, value in current.items()
+    }
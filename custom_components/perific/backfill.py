@@ -0,0 +1,173 @@
+"""Gap detection and minute history for Perific/Enegic energy meters."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from .api import phase_powers
+from .const import GAP_THRESHOLD, MIN_HOUR_COVERAGE, MINUTE_HISTORY_RETENTION
+from .history import iter_phase_records, parse_phase_timestamp
+
+
+def floor_hour(value: datetime) -> datetime:
+    """Return the start of the hour containing `value`."""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def packet_time(packet: dict[str, Any]) -> datetime | None:
+    """Return the timestamp of a latest packet as an aware datetime."""
+    ts = packet.get("ts")
+    if not ts:
+        return None
+    return datetime.fromtimestamp(ts / 1000, timezone.utc)
+
+
+def _total_power(data: dict[str, Any]) -> float:
+    """Return total power for phase data with hiavg/huavg readings."""
+    return sum(phase_powers(data["hiavg"], data.get("huavg", [230, 230, 230])))
+
+
+def phase_power_samples(
+    response: list[dict[str, Any]] | None,
+) -> list[tuple[datetime, float]]:
+    """Return (minute, total power) samples of a /getphasedata response."""
+    return [
+        (
+            parse_phase_timestamp(ts).replace(second=0, microsecond=0),
+            _total_power(data),
+        )
+        for ts, data in iter_phase_records(response)
+        if "hiavg" in data
+    ]
+
+
+@dataclass(frozen=True)
+class PacketGap:
+    """A time range with missing packets for one item."""
+
+    item_id: int
+    start: datetime
+    end: datetime
+
+
+class GapDetector:
+    """Detect missed PhaseRealTime packets from their seqno and ts."""
+
+    def __init__(self, threshold: timedelta = GAP_THRESHOLD) -> None:
+        """Initialize the detector."""
+        self._threshold = threshold
+        self._last: dict[int, tuple[int | None, datetime]] = {}
+
+    def observe(self, item_id: int, packet: dict[str, Any]) -> PacketGap | None:
+        """Record a realtime packet and return the gap before it, if any.
+
+        The first packet seen for an item only seeds the detector, so starting
+        or reloading the integration does not fetch phase data for every item.
+        """
+        ts = packet_time(packet)
+        if ts is None:
+            return None
+        seqno = packet.get("seqno")
+
+        last = self._last.get(item_id)
+        if last is None:
+            self._last[item_id] = (seqno, ts)
+            return None
+
+        last_seqno, last_ts = last
+        if ts <= last_ts:
+            # Same packet as last poll, nothing new
+            return None
+        self._last[item_id] = (seqno, ts)
+
+        if ts - last_ts > self._threshold:
+            return PacketGap(item_id, last_ts, ts)
+        if seqno is not None and last_seqno is not None and seqno < last_seqno:
+            # Sequence counter reset, the meter restarted in between
+            return PacketGap(item_id, last_ts, ts)
+        return None
+
+
+class MinuteHistory:
+    """Bounded in-memory history of minute power samples per item."""
+
+    def __init__(self, retention: timedelta = MINUTE_HISTORY_RETENTION) -> None:
+        """Initialize the history."""
+        self._retention = retention
+        self._max_samples = retention / timedelta(minutes=1) + 60
+        self._samples: dict[int, dict[datetime, float]] = {}
+
+    def add(self, item_id: int, ts: datetime, power: float) -> None:
+        """Add or replace the sample for one minute."""
+        samples = self._samples.setdefault(item_id, {})
+        samples[ts.replace(second=0, microsecond=0)] = power
+        self._trim(samples)
+
+    def _trim(self, samples: dict[datetime, float]) -> None:
+        """Trim once an hour's worth of samples is past retention."""
+        if len(samples) > self._max_samples:
+            cutoff = max(samples) - self._retention
+            for minute in [minute for minute in samples if minute < cutoff]:
+                del samples[minute]
+
+    def add_packet(
+        self, item_id: int, packet: dict[str, Any], received: datetime
+    ) -> None:
+        """Add a PhaseMinute packet `received` at the given time.
+
+        The packet has no timestamp. It is sent when a minute ends, so it
+        holds the minute before the one it was received in. A poll just after
+        a minute ends may still see the previous packet, later polls in the
+        same minute replace that sample.
+        """
+        data = packet.get("data", {})
+        if "hiavg" not in data:
+            return
+        self.add(item_id, received - timedelta(minutes=1), _total_power(data))
+
+    def add_phase_records(
+        self, item_id: int, response: list[dict[str, Any]] | None
+    ) -> set[datetime]:
+        """Add minute records from /getphasedata and return the hours touched."""
+        return self.add_samples(item_id, phase_power_samples(response))
+
+    def add_samples(
+        self, item_id: int, samples: Iterable[tuple[datetime, float]]
+    ) -> set[datetime]:
+        """Add samples from `phase_power_samples` and return the hours touched."""
+        samples = list(samples)
+        item_samples = self._samples.setdefault(item_id, {})
+        item_samples.update(samples)
+        self._trim(item_samples)
+        return {floor_hour(minute) for minute, _ in samples}
+
+    def item_samples(self, item_id: int) -> dict[datetime, float]:
+        """Return all samples of an item by minute, to be read only."""
+        return self._samples.get(item_id, {})
+
+    def samples(
+        self, item_id: int, start: datetime, end: datetime
+    ) -> list[tuple[datetime, float]]:
+        """Return the samples in [start, end) in time order."""
+        return sorted(
+            (minute, power)
+            for minute, power in self._samples.get(item_id, {}).items()
+            if start <= minute < end
+        )
+
+    def hour_statistics(self, item_id: int, hour: datetime) -> dict[str, Any] | None:
+        """Return mean/min/max power for an hour with enough coverage."""
+        values = [
+            power for _, power in self.samples(item_id, hour, hour + timedelta(hours=1))
+        ]
+        if len(values) < MIN_HOUR_COVERAGE:
+            return None
+        return {
+            "start": hour,
+            "mean": sum(values) / len(values),
+            "min": min(values),
+            "max": max(values),
+        }
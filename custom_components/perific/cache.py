@@ -0,0 +1,112 @@
+"""Stale-while-revalidate snapshot cache for Perific/Enegic API responses."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import SNAPSHOT_WAIT
+
+if TYPE_CHECKING:
+    from .tracing import RequestTracer
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Snapshot:
+    """A cached API response and the loop time it was fetched."""
+
+    value: Any
+    fetched: float
+
+
+class SnapshotCache:
+    """Serve the last good response while a fresh one is fetched.
+
+    Every `get` starts a revalidation unless one is already running and waits
+    up to `wait` seconds for it. If the fetch is slower, or fails, the last
+    good snapshot is returned instead together with its age, and a slow fetch
+    keeps running in the background for the next call.
+    """
+
+    def __init__(
+        self, wait: float = SNAPSHOT_WAIT, tracer: RequestTracer | None = None
+    ) -> None:
+        """Initialize the cache."""
+        self._wait = wait
+        self._tracer = tracer
+        self._snapshots: dict[str, Snapshot] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], max_age: float = 0.0
+    ) -> tuple[Any, float]:
+        """Return the freshest available value for `key` and its age.
+
+        A snapshot younger than `max_age` seconds is returned without
+        revalidating, so several consumers can share one fetch.
+        """
+        loop = asyncio.get_running_loop()
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and loop.time() - snapshot.fetched < max_age:
+            self.hits += 1
+            age = loop.time() - snapshot.fetched
+            if self._tracer:
+                self._tracer.cache_lookup(key, True, age)
+            return snapshot.value, age
+
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = self._tasks[key] = loop.create_task(self._revalidate(key, fetch))
+            task.add_done_callback(self._log_failure)
+
+        if key not in self._snapshots:
+            # Nothing to fall back on, wait for the fetch and raise its error
+            await asyncio.shield(task)
+        else:
+            await asyncio.wait({task}, timeout=self._wait)
+
+        snapshot = self._snapshots[key]
+        hit = not (task.done() and not task.cancelled() and task.exception() is None)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        age = loop.time() - snapshot.fetched
+        if self._tracer:
+            self._tracer.cache_lookup(key, hit, age)
+        return snapshot.value, age
+
+    def age(self, key: str) -> float | None:
+        """Return the age of the snapshot for `key`, if any."""
+        if (snapshot := self._snapshots.get(key)) is None:
+            return None
+        return asyncio.get_running_loop().time() - snapshot.fetched
+
+    async def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Fetch a fresh value and store it."""
+        value = await fetch()
+        self._snapshots[key] = Snapshot(value, asyncio.get_running_loop().time())
+
+    def _log_failure(self, task: asyncio.Task) -> None:
+        """Count and log a failed revalidation."""
+        if task.cancelled() or (err := task.exception()) is None:
+            return
+        self.errors += 1
+        _LOGGER.debug("Revalidation failed, serving cached data: %s", err)
+
+    async def close(self) -> None:
+        """Cancel running revalidations."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
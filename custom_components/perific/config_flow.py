@@ -8,11 +8,27 @@ from typing import Any
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import PerificAPI, PerificAuthError
-from .const import DOMAIN
+from .const import (
+    BURST_MAX_DURATION,
+    CONF_HEARTBEAT,
+    CONF_MAX_STALENESS,
+    CONF_OPENMETRICS,
+    CONF_THRESHOLDS,
+    CONF_TRACE_SAMPLE_RATE,
+    DEADBAND_GROUPS,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_THRESHOLD_HYSTERESIS,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    DOMAIN,
+)
+from .thresholds import METRICS, PHASES, Threshold
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +45,14 @@ class PerificConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> PerificOptionsFlow:
+        """Get the options flow for this handler."""
+        return PerificOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -83,6 +107,164 @@ class PerificConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class PerificOptionsFlow(config_entries.OptionsFlow):
+    """Handle Perific options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choose what to change."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["settings", "deadband", "add_threshold", "remove_threshold"],
+        )
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the general options."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_MAX_STALENESS,
+                        default=options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                    vol.Optional(
+                        CONF_TRACE_SAMPLE_RATE,
+                        default=options.get(
+                            CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                    vol.Optional(
+                        CONF_OPENMETRICS, default=options.get(CONF_OPENMETRICS, False)
+                    ): bool,
+                }
+            ),
+        )
+
+    async def async_step_deadband(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the deadbands of the measurement sensor groups."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+        schema: dict[vol.Marker, Any] = {}
+        for group in DEADBAND_GROUPS:
+            for key in (f"{group}_deadband", f"{group}_deadband_percent"):
+                schema[vol.Optional(key, default=options.get(key, 0.0))] = vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                )
+        schema[
+            vol.Optional(
+                CONF_HEARTBEAT, default=options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT)
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+        return self.async_show_form(step_id="deadband", data_schema=vol.Schema(schema))
+
+    async def async_step_add_threshold(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add a per-phase current threshold."""
+        if user_input is not None:
+            threshold = Threshold.from_dict(
+                {
+                    **user_input,
+                    "item_id": user_input["item_id"] or None,
+                    "phase": user_input["phase"] or None,
+                }
+            )
+            thresholds = self.config_entry.options.get(CONF_THRESHOLDS, [])
+            return self.async_create_entry(
+                title="",
+                data={
+                    **self.config_entry.options,
+                    CONF_THRESHOLDS: [*thresholds, threshold.as_dict()],
+                },
+            )
+
+        items = {"": "All items"}
+        items.update(
+            {str(item_id): name for item_id, name in self._item_names().items()}
+        )
+        phases = {"": "Any phase", **{phase: phase.upper() for phase in PHASES}}
+        return self.async_show_form(
+            step_id="add_threshold",
+            data_schema=vol.Schema(
+                {
+                    vol.Required("item_id", default=""): vol.In(items),
+                    vol.Required("phase", default=""): vol.In(phases),
+                    vol.Required("metric", default="current"): vol.In(list(METRICS)),
+                    vol.Required("level"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(
+                        "hysteresis", default=DEFAULT_THRESHOLD_HYSTERESIS
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required("burst", default=0): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=BURST_MAX_DURATION.total_seconds()),
+                    ),
+                }
+            ),
+        )
+
+    async def async_step_remove_threshold(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Remove current thresholds."""
+        thresholds = self.config_entry.options.get(CONF_THRESHOLDS, [])
+        if user_input is not None:
+            removed = set(user_input["thresholds"])
+            return self.async_create_entry(
+                title="",
+                data={
+                    **self.config_entry.options,
+                    CONF_THRESHOLDS: [
+                        threshold
+                        for index, threshold in enumerate(thresholds)
+                        if str(index) not in removed
+                    ],
+                },
+            )
+
+        item_names = self._item_names()
+        labels = {
+            str(index): Threshold.from_dict(threshold).label(item_names)
+            for index, threshold in enumerate(thresholds)
+        }
+        return self.async_show_form(
+            step_id="remove_threshold",
+            data_schema=vol.Schema(
+                {vol.Optional("thresholds", default=[]): cv.multi_select(labels)}
+            ),
+        )
+
+    def _item_names(self) -> dict[int, str]:
+        """Return the names of the items of a loaded entry."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if not entry_data:
+            return {}
+        return {
+            item_id: item_data["info"]["name"]
+            for coordinator in entry_data["coordinators"]
+            for item_id, item_data in (coordinator.data or {}).get("items", {}).items()
+        }
+
+
 class CannotConnect(Exception):
     """Error to indicate we cannot connect."""
 
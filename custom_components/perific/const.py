@@ -27,6 +27,9 @@ SENSOR_TYPE_CURRENT = "current"
 SENSOR_TYPE_POWER_FACTOR = "power_factor"
 SENSOR_TYPE_FREQUENCY = "frequency"
 
+# Aggregated packets in /getlatestpackets and the period they cover
+PACKET_PERIODS = {"minute": "PhaseMinute", "hour": "PhaseHour", "day": "PhaseDay"}
+
 # Units
 UNIT_POWER = "W"
 UNIT_ENERGY = "kWh"
@@ -46,3 +49,82 @@ ATTR_EXPORTED = "exported"
 ATTR_FIRMWARE = "firmware"
 ATTR_SIGNAL_STRENGTH = "signal_strength"
 ATTR_TIMESTAMP = "timestamp"
+ATTR_DATA_AGE = "data_age"
+
+# History
+PHASE_DATA_TYPES = ("Avg", "Min", "Max")
+HISTORY_CHUNK = timedelta(days=1)
+HISTORY_MAX_CONCURRENCY = 4
+HISTORY_PARSE_CHUNK = 2000  # phase data records decoded per executor job
+
+# Stale-while-revalidate snapshots
+SNAPSHOT_WAIT = 5.0  # seconds to wait for a fresh response before serving cache
+CONF_MAX_STALENESS = "max_staleness"
+DEFAULT_MAX_STALENESS = 300  # seconds before entities become unavailable
+
+# Gap detection and backfill
+GAP_THRESHOLD = timedelta(minutes=2)
+MINUTE_HISTORY_RETENTION = timedelta(hours=6)
+MIN_HOUR_COVERAGE = 30  # minute samples needed to import an hour's statistics
+
+# Rate limiting (shared per API host). The API allows 1000 requests per hour,
+# a full burst plus an hour of refill stays below that.
+RATE_LIMIT_HOURLY = 1000
+RATE_LIMIT_RATE = 900 / 3600  # tokens per second
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_BULK_RESERVE = 3  # tokens history requests must leave for polling
+
+# Sharding of large accounts
+SHARD_SIZE = 25  # items per coordinator
+METADATA_MAX_CONCURRENCY = 4  # item parameter requests in flight per shard
+ITEM_PARAMETERS_RETRY = timedelta(minutes=5)  # after a failed lookup, doubling
+ITEM_PARAMETERS_MAX_RETRY = timedelta(hours=6)
+
+# Consumption forecast
+FORECAST_TIME_CONSTANT = timedelta(minutes=15)  # of the import rate average
+FORECAST_PROFILE_ALPHA = 0.2  # weight of a new day in the hour-of-day profile
+FORECAST_PROFILE_WEIGHT = 0.5  # weight of the profile in next hour projections
+FORECAST_SAVE_DELAY = 60  # seconds
+
+# Monthly peak hours (power tariff)
+PEAK_COUNT = 3  # top hours averaged for billing
+PEAK_SAVE_DELAY = 10  # seconds
+
+# Fuse headroom from EV charger reporter settings
+REPORTER_SETTINGS_MAX_AGE = timedelta(hours=1)  # fuse levels rarely change
+
+# Threshold events
+CONF_THRESHOLDS = "thresholds"
+DEFAULT_THRESHOLD_HYSTERESIS = 1.0  # amperes
+EVENT_THRESHOLD = f"{DOMAIN}_threshold"
+
+# Sampled API request tracing
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+DEFAULT_TRACE_SAMPLE_RATE = 0.0  # share of requests traced, off by default
+TRACE_BUFFER_SIZE = 500  # most recent records kept for diagnostics
+
+# OpenMetrics endpoint
+CONF_OPENMETRICS = "openmetrics"
+OPENMETRICS_URL = "/api/perific/metrics"
+OPENMETRICS_VIEW = f"{DOMAIN}_openmetrics_view"  # hass.data flag once registered
+
+# Deadband filtering of high-churn measurement sensors
+DEADBAND_GROUPS = ("power", "voltage", "current")
+CONF_HEARTBEAT = "heartbeat"
+DEFAULT_HEARTBEAT = 600  # seconds, longest time a filtered state is not written
+
+# Burst polling of single items
+BURST_INTERVAL = timedelta(seconds=10)  # default realtime poll while bursting
+BURST_MIN_INTERVAL = timedelta(seconds=5)
+BURST_DURATION = timedelta(minutes=10)  # default burst length
+BURST_MAX_DURATION = timedelta(hours=1)  # hard expiry of any burst
+
+# Memory footprint sensors, measured at most this often
+FOOTPRINT_INTERVAL = timedelta(minutes=5)
+
+# Services
+SERVICE_PROFILE = "profile"
+DEFAULT_PROFILE_CYCLES = 3
+SERVICE_SET_BURST_MODE = "set_burst_mode"
+SERVICE_RECORD_REQUESTS = "record_requests"
+DEFAULT_RECORD_DURATION = 300  # seconds
@@ -0,0 +1,688 @@
+"""Data update coordinator for the Perific integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Collection, Coroutine, Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    PerificAPI,
+    PerificAPIError,
+    PerificAuthError,
+    fuse_headroom,
+    parse_counters,
+    parse_current_power,
+    parse_energy_today,
+    parse_envelope,
+    parse_fuse_levels,
+)
+from .backfill import (
+    GapDetector,
+    MinuteHistory,
+    PacketGap,
+    floor_hour,
+    packet_time,
+    phase_power_samples,
+)
+from .const import (
+    ATTR_DATA_AGE,
+    ATTR_FIRMWARE,
+    ATTR_ITEM_ID,
+    ATTR_ITEM_NAME,
+    BURST_INTERVAL,
+    BURST_MAX_DURATION,
+    BURST_MIN_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    DOMAIN,
+    EVENT_THRESHOLD,
+    METADATA_MAX_CONCURRENCY,
+    REPORTER_SETTINGS_MAX_AGE,
+    SCAN_INTERVAL_POWER,
+    SHARD_SIZE,
+    SNAPSHOT_WAIT,
+)
+from .forecast import ConsumptionForecaster
+from .history import (
+    async_iter_phase_chunks,
+    async_run_in_executor,
+    fetch_phase_data_requests,
+    plan_phase_data_requests,
+)
+from .metrics import evaluate_metrics
+from .peaks import PeakTracker, hourly_energy
+from .profiler import CycleProfiler, span
+from .stats import (
+    async_import_energy_statistics,
+    async_import_power_statistics,
+    hour_energy_statistics,
+)
+from .thresholds import ThresholdMonitor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def plan_shards(item_ids: Iterable[int], size: int = SHARD_SIZE) -> list[frozenset]:
+    """Split item ids into stable shards of at most `size` items."""
+    ordered = sorted(set(item_ids))
+    return [frozenset(ordered[i : i + size]) for i in range(0, len(ordered), size)]
+
+
+class PerificDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching Perific data.
+
+    A coordinator serves either every item of the account or, for large
+    accounts, one shard of them. Shards share the account-wide API responses
+    through the snapshot cache and only process their own items. Item
+    parameters are looked up in the background, items have fallback details
+    until then. Given the entry's `known_item_ids`, meters that show up later
+    reload the entry, so they get entities and a shard.
+
+    Items can be put in burst mode for a while. Between the regular refreshes
+    the coordinator then runs burst cycles that only process those items, as
+    long as the shared limiter has capacity to spare.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: PerificAPI,
+        phase_offset: float = 0.0,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+        item_ids: Collection[int] | None = None,
+        max_concurrency: int = METADATA_MAX_CONCURRENCY,
+        known_item_ids: Collection[int] | None = None,
+        forecaster: ConsumptionForecaster | None = None,
+        peaks: PeakTracker | None = None,
+        thresholds: ThresholdMonitor | None = None,
+    ) -> None:
+        """Initialize."""
+        self.forecaster = forecaster or ConsumptionForecaster()
+        self.peaks = peaks or PeakTracker()
+        self.thresholds = thresholds or ThresholdMonitor()
+        self.api = api
+        self.phase_offset = phase_offset
+        self.max_staleness = max_staleness
+        self.item_ids = item_ids
+        self.max_concurrency = max_concurrency
+        self.known_item_ids = known_item_ids
+        self.gaps = GapDetector()
+        self.minute_history = MinuteHistory()
+        self._current_hour: dict[int, datetime] = {}
+        self._hour_counters: dict[int, tuple[float, float]] = {}
+        self._reporter_settings: dict[str, Any] | None = None
+        self._fuse_levels: dict[int, dict[str, Any]] = {}
+        self._reporters_retry = 0.0
+        self._bursts: dict[int, tuple[float, float]] = {}
+        self._next_full: float | None = None
+        self._next_refresh = 0.0
+        self._burst_due = False
+        self._burst_items: frozenset[int] | None = None
+        self._item_info_task: asyncio.Task | None = None
+        self._reloading = False
+        self.profiler: CycleProfiler | None = None
+        # Refreshes are scheduled here rather than by the base class, so they
+        # keep to the phase offset and fit burst cycles in between
+        self.refresh_interval = SCAN_INTERVAL_POWER
+        self._refresh_job = HassJob(
+            self._async_handle_refresh, f"{DOMAIN} refresh", cancel_on_shutdown=True
+        )
+        self._unsub_refresh_timer: CALLBACK_TYPE | None = None
+        self._polling: set[object] = set()
+        self._stopped = False
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=None)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, refreshing on schedule while anyone listens."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        token = object()
+        self._polling.add(token)
+        if self._unsub_refresh_timer is None:
+            self._async_schedule_refresh()
+
+        @callback
+        def remove() -> None:
+            remove_listener()
+            self._polling.discard(token)
+            if not self._polling:
+                self._async_cancel_refresh()
+
+        return remove
+
+    async def async_shutdown(self) -> None:
+        """Cancel the scheduled refresh and ignore new runs."""
+        self._stopped = True
+        self._async_cancel_refresh()
+        await super().async_shutdown()
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Schedule the next refresh on this coordinator's phase offset.
+
+        Refreshes land at `phase_offset` seconds into each polling interval on
+        the event loop clock, so entries with different offsets never line up.
+        While items are bursting, burst cycles are scheduled in between.
+        """
+        if self._stopped or not self._polling:
+            return
+
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_cancel_refresh()
+
+        interval = self.refresh_interval.total_seconds()
+        now = self.hass.loop.time()
+        if self._next_full is None or self._next_full <= now:
+            next_full = now - now % interval + self.phase_offset % interval
+            # Skip a slot that is too close to avoid back-to-back refreshes
+            while next_full < now + interval / 2:
+                next_full += interval
+            self._next_full = next_full
+
+        next_refresh = self._next_full
+        self._burst_due = False
+        if burst_interval := self._burst_interval(now):
+            # No burst cycle right before a regular refresh
+            if now + burst_interval * 1.5 <= self._next_full:
+                next_refresh = now + burst_interval
+                self._burst_due = True
+
+        self._next_refresh = next_refresh
+        self._unsub_refresh_timer = async_call_later(
+            self.hass, next_refresh - now, self._refresh_job
+        )
+
+    @callback
+    def _async_cancel_refresh(self) -> None:
+        """Cancel the scheduled refresh, if any."""
+        if self._unsub_refresh_timer is not None:
+            self._unsub_refresh_timer()
+            self._unsub_refresh_timer = None
+
+    async def _async_handle_refresh(self, _now: datetime) -> None:
+        """Run the scheduled refresh, a burst cycle if one is due."""
+        self._unsub_refresh_timer = None
+        if self.hass.is_stopping:
+            return
+        if self._burst_due and self.data:
+            self._burst_interval(self.hass.loop.time())
+            self._burst_items = frozenset(self._bursts)
+        await self.async_refresh()
+
+    @property
+    def bursts(self) -> dict[int, float]:
+        """Return the remaining seconds of each bursting item."""
+        now = self.hass.loop.time()
+        return {
+            item_id: round(expiry - now, 1)
+            for item_id, (expiry, _) in self._bursts.items()
+            if expiry > now
+        }
+
+    @callback
+    def async_set_burst(self, item_id: int, duration: float, interval: float) -> None:
+        """Poll an item every `interval` seconds for `duration` seconds.
+
+        A zero duration ends the item's burst. Durations and intervals are
+        clamped to the burst limits.
+        """
+        if duration <= 0:
+            self._bursts.pop(item_id, None)
+        else:
+            duration = min(duration, BURST_MAX_DURATION.total_seconds())
+            interval = max(interval, BURST_MIN_INTERVAL.total_seconds())
+            self._bursts[item_id] = (self.hass.loop.time() + duration, interval)
+        _LOGGER.debug("Bursting items %s", self.bursts)
+        # A refresh that is already due schedules the next one itself
+        if self._unsub_refresh_timer and self._next_refresh > self.hass.loop.time():
+            self._async_schedule_refresh()
+
+    def _burst_interval(self, now: float) -> float | None:
+        """Drop expired bursts and return the shortest active burst interval."""
+        for item_id in [i for i, (expiry, _) in self._bursts.items() if expiry <= now]:
+            del self._bursts[item_id]
+        return min((interval for _, interval in self._bursts.values()), default=None)
+
+    def _max_age(self) -> float:
+        """Return the age up to which a shared API response is reused.
+
+        While an item is bursting, regular refreshes keep to its interval too.
+        """
+        max_age = self.refresh_interval.total_seconds() / 2
+        if burst_interval := self._burst_interval(self.hass.loop.time()):
+            max_age = min(max_age, burst_interval / 2)
+        return max_age
+
+    async def async_refresh(self) -> None:
+        """Refresh data, profiling the cycle while a profile is requested.
+
+        Any refresh but a burst cycle counts as the regular one. The next
+        refresh is scheduled once it is done.
+        """
+        if self._burst_items is None:
+            self._next_full = None
+        try:
+            if (profiler := self.profiler) is None:
+                await super().async_refresh()
+                return
+            with profiler.cycle(self):
+                await super().async_refresh()
+        finally:
+            self._burst_items = None
+            self._async_schedule_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        with span("dispatch"):
+            super().async_update_listeners()
+
+    async def _async_update_data(self):
+        """Fetch data from API."""
+        if self._burst_items is not None:
+            return await self._async_update_burst(self._burst_items)
+
+        try:
+            # Get latest packets, serving cached responses while the API is
+            # slow or failing. Responses from earlier in this polling
+            # interval, e.g. fetched by another shard, are reused.
+            with span("fetch"):
+                (packets, age), fuse_levels = await asyncio.gather(
+                    self.api.get_latest_packets_snapshot(self._max_age()),
+                    self._async_fuse_levels(),
+                )
+            if age > self.max_staleness:
+                raise UpdateFailed(f"Latest data is {age:.0f} seconds old")
+
+            if self.known_item_ids is not None:
+                self._async_reload_for_new_items(packets)
+            if self.item_ids is not None:
+                packets = [p for p in packets if p.get("ItemId") in self.item_ids]
+
+            # Discover items/meters from the same latest packets
+            with span("discover"):
+                items = self.api.discover_items(packets)
+                self._async_fetch_item_info(item["id"] for item in items)
+
+            # Get power and energy data for each item. The previous data stays
+            # untouched, so a failing cycle leaves all of it in place.
+            previous = (self.data or {}).get("items", {})
+            with span("parse"):
+                return {
+                    "items": self._parse_items(
+                        items, packets, age, fuse_levels, previous
+                    )
+                }
+        except UpdateFailed:
+            raise
+        except Exception as err:
+            raise UpdateFailed(f"Error fetching data: {err}") from err
+
+    async def _async_update_burst(self, item_ids: frozenset[int]) -> dict[str, Any]:
+        """Refresh only the bursting items, reusing everything else.
+
+        The cycle is skipped while the shared limiter has no capacity to
+        spare, so bursts never delay regular polling of any entry.
+        """
+        if not item_ids:
+            return self.data
+        if not self.api.has_spare_capacity():
+            _LOGGER.debug("Skipping burst cycle, request limiter is busy")
+            return self.data
+
+        try:
+            with span("fetch"):
+                packets, age = await self.api.get_latest_packets_snapshot(
+                    self._max_age()
+                )
+            if age > self.max_staleness:
+                raise UpdateFailed(f"Latest data is {age:.0f} seconds old")
+
+            with span("parse"):
+                items = dict(self.data["items"])
+                bursting = [
+                    items[item_id]["info"] for item_id in item_ids & items.keys()
+                ]
+                items.update(
+                    self._parse_items(
+                        bursting, packets, age, self._fuse_levels, self.data["items"]
+                    )
+                )
+            return {**self.data, "items": items}
+        except UpdateFailed:
+            raise
+        except Exception as err:
+            raise UpdateFailed(f"Error fetching burst data: {err}") from err
+
+    def _parse_items(
+        self,
+        items: Iterable[dict[str, Any]],
+        packets: list[dict[str, Any]],
+        age: float,
+        fuse_levels: dict[int, dict[str, Any]],
+        previous: dict[int, dict[str, Any]],
+    ) -> dict[int, dict[str, Any]]:
+        """Parse the latest packets of `items` into the data entities read.
+
+        Thresholds, forecasts, history and peaks only see the cycle once
+        every item parsed, so a cycle failing halfway through changes none of
+        them.
+        """
+        latest = {
+            packet.get("ItemId"): packet.get("LatestPackets", {}) for packet in packets
+        }
+        parsed = {
+            item["id"]: self._item_data(
+                item,
+                latest.get(item["id"], {}),
+                age,
+                fuse_levels,
+                previous.get(item["id"]),
+            )
+            for item in items
+        }
+
+        received = dt_util.utcnow() - timedelta(seconds=age)
+        for item_id, item_data in parsed.items():
+            if item_data is not previous.get(item_id):
+                self._apply_item_data(item_data, latest.get(item_id, {}), received)
+        return parsed
+
+    def _item_data(
+        self,
+        item: dict[str, Any],
+        latest_packets: dict[str, Any],
+        age: float,
+        fuse_levels: dict[int, dict[str, Any]],
+        previous: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Parse one item's latest packets into the data its entities read.
+
+        While the realtime packet, the item and its fuse are unchanged, the
+        `previous` dict is returned as is. Otherwise a new one bumps the
+        `revision`, entities compare revisions to spot new data.
+        """
+        item_id = item["id"]
+        realtime = latest_packets.get("PhaseRealTime", {})
+        packet = (realtime.get("seqno"), realtime.get("ts"))
+        fuse = fuse_levels.get(item_id)
+        if (
+            previous is not None
+            and realtime.get("ts") is not None
+            and previous.get("packet") == packet
+            and previous["info"] == item
+            and previous.get("fuse") == fuse
+        ):
+            return previous
+
+        power = parse_current_power(latest_packets)
+        item_data = dict(
+            info=item,
+            packet=packet,
+            power=power,
+            metrics=evaluate_metrics(power),
+            energy_today=parse_energy_today(latest_packets),
+            counters=parse_counters(latest_packets),
+            envelope=parse_envelope(latest_packets),
+            data_age=round(age, 1),
+            revision=(previous or {}).get("revision", 0) + 1,
+        )
+
+        if fuse:
+            item_data["fuse"] = fuse
+            item_data["headroom"] = fuse_headroom(
+                fuse["mains_fuse"], power.get("current")
+            )
+
+        # Shared by all entities of the item
+        attributes = item_data["attributes"] = {
+            ATTR_ITEM_ID: item_id,
+            ATTR_ITEM_NAME: item["name"],
+        }
+        if power.get("firmware"):
+            attributes[ATTR_FIRMWARE] = power["firmware"]
+        attributes[ATTR_DATA_AGE] = item_data["data_age"]
+        return item_data
+
+    @callback
+    def _apply_item_data(
+        self,
+        item_data: dict[str, Any],
+        latest_packets: dict[str, Any],
+        received: datetime,
+    ) -> None:
+        """Run the side effects of an item's new data and add their results."""
+        item = item_data["info"]
+        self._fire_threshold_events(item, item_data["power"])
+        item_data["forecast"] = self.forecaster.update(
+            item["id"], latest_packets, received
+        )
+        self._track_history(item, latest_packets, received)
+        item_data["peaks"] = self.peaks.peaks(item["id"])
+
+    @callback
+    def _fire_threshold_events(
+        self, item: dict[str, Any], power: dict[str, Any]
+    ) -> None:
+        """Fire an event for every threshold crossed by the latest currents.
+
+        Crossing a threshold with a burst duration upwards puts the item in
+        burst mode.
+        """
+        for crossing in self.thresholds.evaluate(item["id"], power.get("current")):
+            if crossing["state"] == "above" and crossing["burst"]:
+                self.async_set_burst(
+                    item["id"], crossing["burst"], BURST_INTERVAL.total_seconds()
+                )
+            self.hass.bus.async_fire(
+                EVENT_THRESHOLD,
+                {
+                    **crossing,
+                    "item_name": item["name"],
+                    "timestamp": power.get("timestamp"),
+                    "currents": power.get("current"),
+                    "voltages": power.get("voltage"),
+                },
+            )
+
+    async def _async_fuse_levels(self) -> dict[int, dict[str, Any]]:
+        """Return fuse levels per item from slowly refreshed reporter settings.
+
+        The settings are shared by all shards through the snapshot cache and
+        only parsed again when a new response arrives. Headroom is optional,
+        so a slow, failing or malformed response never fails the poll, the
+        last fuse levels are used instead.
+        """
+        now = self.hass.loop.time()
+        if now < self._reporters_retry:
+            return self._fuse_levels
+
+        max_age = REPORTER_SETTINGS_MAX_AGE.total_seconds()
+        try:
+            # The cache shields the fetch, it finishes for a later poll
+            settings, _ = await asyncio.wait_for(
+                self.api.get_reporter_settings_snapshot(max_age), SNAPSHOT_WAIT
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Reporter settings are slow, using the last fuse levels")
+            return self._fuse_levels
+        except (PerificAPIError, PerificAuthError) as err:
+            # Accounts without reporter settings are not asked every poll
+            _LOGGER.debug("Reporter settings unavailable: %s", err)
+            self._reporters_retry = now + max_age
+            return self._fuse_levels
+
+        if settings is not self._reporter_settings:
+            self._reporter_settings = settings
+            try:
+                self._fuse_levels = parse_fuse_levels(settings)
+            except (AttributeError, KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning("Unexpected reporter settings: %s", err)
+        return self._fuse_levels
+
+    @callback
+    def _track_history(
+        self, item: dict[str, Any], latest_packets: dict[str, Any], received: datetime
+    ) -> None:
+        """Update minute history, start backfills and import statistics.
+
+        Only the realtime packet has a timestamp, the aggregated packets are
+        placed by the time they were `received`.
+        """
+        item_id = item["id"]
+
+        if minute := latest_packets.get("PhaseMinute"):
+            self.minute_history.add_packet(item_id, minute, received)
+
+        realtime = latest_packets.get("PhaseRealTime", {})
+        if gap := self.gaps.observe(item_id, realtime):
+            self._async_create_background_task(
+                self._async_backfill(item, gap), f"{DOMAIN} backfill {item_id}"
+            )
+
+        # Import the previous hour once the meter moves into a new one
+        hour = floor_hour(packet_time(realtime) or dt_util.utcnow())
+        previous = self._current_hour.get(item_id)
+        self._current_hour[item_id] = hour
+        if previous and hour > previous:
+            self._async_import_hours(item, {previous})
+
+        # Each new hourly packet, told apart by its counters, closes an hour
+        # of metered energy
+        energy = hour_energy_statistics(latest_packets.get("PhaseHour", {}), received)
+        counters = energy and (energy["imported"]["state"], energy["exported"]["state"])
+        if energy and self._hour_counters.get(item_id) != counters:
+            self._hour_counters[item_id] = counters
+            async_import_energy_statistics(self.hass, item_id, item["name"], energy)
+
+            # Track the month's peak hours, rebuilding hours missed while down
+            imported = energy["imported"]
+            if missing := self.peaks.close_hour(
+                item_id, imported["start"], imported["state"]
+            ):
+                self._async_create_background_task(
+                    self._async_rebuild_peaks(item_id, *missing),
+                    f"{DOMAIN} peaks {item_id}",
+                )
+
+    async def _async_backfill(self, item: dict[str, Any], gap: PacketGap) -> None:
+        """Fetch minute phase data for a gap at history priority.
+
+        Records are decoded in the executor, a chunk at a time.
+        """
+        try:
+            response = await self.api.get_phase_data(
+                gap.item_id, floor_hour(gap.start), gap.end
+            )
+        except (PerificAPIError, PerificAuthError) as err:
+            _LOGGER.debug("Backfill for item %s failed: %s", gap.item_id, err)
+            return
+
+        hours: set[datetime] = set()
+        async for samples in async_iter_phase_chunks(phase_power_samples, response):
+            hours |= self.minute_history.add_samples(gap.item_id, samples)
+        self._async_import_hours(item, hours)
+
+    async def _async_rebuild_peaks(
+        self, item_id: int, start: datetime, end: datetime
+    ) -> None:
+        """Add the hourly energy of [start, end) from phase data to the peaks."""
+        requests = plan_phase_data_requests([item_id], start, end, ["Avg"])
+        try:
+            results = await fetch_phase_data_requests(self.api, requests)
+        except (PerificAPIError, PerificAuthError) as err:
+            _LOGGER.debug("Peak rebuild for item %s failed: %s", item_id, err)
+            return
+
+        for _, response in results:
+            energy_per_hour = await async_run_in_executor(hourly_energy, response)
+            for hour, energy in energy_per_hour.items():
+                if start <= hour < end:
+                    self.peaks.add(item_id, hour, energy)
+
+    @callback
+    def _async_import_hours(self, item: dict[str, Any], hours: set[datetime]) -> None:
+        """Import power statistics for the finished hours in `hours`."""
+        current = floor_hour(dt_util.utcnow())
+        statistics = []
+        for hour in sorted(hours):
+            if hour >= current:
+                continue
+            if stat := self.minute_history.hour_statistics(item["id"], hour):
+                statistics.append(stat)
+
+        async_import_power_statistics(self.hass, item["id"], item["name"], statistics)
+
+    @callback
+    def _async_fetch_item_info(self, item_ids: Iterable[int]) -> None:
+        """Look up missing item parameters in a background task of its own."""
+        if self._item_info_task is not None and not self._item_info_task.done():
+            return
+        if missing := self.api.missing_item_info(item_ids):
+            self._item_info_task = self._async_create_background_task(
+                self.api.async_fetch_item_info(missing, self.max_concurrency),
+                f"{DOMAIN} item parameters",
+            )
+
+    @callback
+    def _async_reload_for_new_items(self, packets: list[dict[str, Any]]) -> None:
+        """Reload the entry once packets arrive for items it was set up without."""
+        if self._reloading or self.config_entry is None:
+            return
+        seen = {packet.get("ItemId") for packet in packets} - {None}
+        if new := seen.difference(self.known_item_ids or ()):
+            _LOGGER.info("Found new items %s, reloading", sorted(new))
+            self._reloading = True
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    @callback
+    def _async_create_background_task(
+        self, target: Coroutine, name: str
+    ) -> asyncio.Task:
+        """Create a task that is cancelled when the config entry unloads."""
+        if self.config_entry:
+            return self.config_entry.async_create_background_task(
+                self.hass, target, name
+            )
+        return self.hass.async_create_background_task(target, name)
+
+
+def create_shard_coordinators(
+    hass: HomeAssistant,
+    api: PerificAPI,
+    item_ids: Iterable[int],
+    phase_offset: float = 0.0,
+    spread: float = SCAN_INTERVAL_POWER.total_seconds(),
+    shard_size: int = SHARD_SIZE,
+    **kwargs: Any,
+) -> list[PerificDataUpdateCoordinator]:
+    """Create one coordinator per shard of items.
+
+    Shards refresh one after another over the first half of `spread` seconds
+    from `phase_offset`, so they all share one latest packets response. The
+    first shard watches for new items.
+    """
+    item_ids = frozenset(item_ids)
+    shards: list[frozenset | None] = plan_shards(item_ids, shard_size) or [None]
+    return [
+        PerificDataUpdateCoordinator(
+            hass,
+            api,
+            phase_offset=phase_offset + spread * index / (2 * len(shards)),
+            item_ids=shard,
+            known_item_ids=None if index else item_ids,
+            **kwargs,
+        )
+        for index, shard in enumerate(shards)
+    ]
@@ -0,0 +1,74 @@
+"""Deadband and heartbeat filtering of Perific sensor state writes."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from .const import CONF_HEARTBEAT, DEFAULT_HEARTBEAT
+
+
+@dataclass(frozen=True)
+class Deadband:
+    """Smallest change of a sensor group's value worth writing.
+
+    A change is written once it exceeds `absolute` or `relative` times the
+    last written value, whichever is larger, or once `heartbeat` has passed
+    since the last write.
+    """
+
+    absolute: float = 0.0
+    relative: float = 0.0
+    heartbeat: timedelta | None = None
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any], group: str) -> Deadband | None:
+        """Return the configured deadband of `group`, or None if it is off."""
+        absolute = options.get(f"{group}_deadband", 0.0)
+        relative = options.get(f"{group}_deadband_percent", 0.0) / 100
+        if not absolute and not relative:
+            return None
+        heartbeat = options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT)
+        return cls(
+            absolute, relative, timedelta(seconds=heartbeat) if heartbeat else None
+        )
+
+    def width(self, value: float) -> float:
+        """Return the deadband around a written `value`."""
+        return max(self.absolute, self.relative * abs(value))
+
+
+class StateFilter:
+    """Decide which state updates of one entity are written."""
+
+    __slots__ = ("deadband", "_value", "_available", "_written")
+
+    def __init__(self, deadband: Deadband) -> None:
+        """Initialize the filter."""
+        self.deadband = deadband
+        self._value: Any = None
+        self._available: bool | None = None
+        self._written: datetime | None = None
+
+    def should_write(self, value: Any, available: bool, now: datetime) -> bool:
+        """Return True, and remember the state, if the update is to be written.
+
+        Availability changes and changes to or from a missing value are always
+        written, as are values that are not numbers.
+        """
+        heartbeat = self.deadband.heartbeat
+        if not (
+            self._written is None
+            or available != self._available
+            or not isinstance(value, (int, float))
+            or not isinstance(self._value, (int, float))
+            or abs(value - self._value) > self.deadband.width(self._value)
+            or (heartbeat is not None and now - self._written >= heartbeat)
+        ):
+            return False
+        self._value = value
+        self._available = available
+        self._written = now
+        return True
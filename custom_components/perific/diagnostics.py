@@ -0,0 +1,41 @@
+"""Diagnostics support for Perific."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_EMAIL, "token"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    api = entry_data["api"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "limiter": api.limiter_metrics,
+        "snapshots": api.snapshot_metrics,
+        "coordinators": [
+            {
+                "items": len((coordinator.data or {}).get("items", {})),
+                "phase_offset": coordinator.phase_offset,
+                "last_update_success": coordinator.last_update_success,
+                "bursts": coordinator.bursts,
+            }
+            for coordinator in entry_data["coordinators"]
+        ],
+        "traces": list(api.tracer.records) if api.tracer else [],
+    }
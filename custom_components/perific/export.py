@@ -0,0 +1,339 @@
+"""Export Perific/Enegic phase data history to CSV or Parquet.
+
+Usage:
+    python -m custom_components.perific.export --item 1714035408660 \\
+        --from 2025-01-01 --to 2026-01-01 --output history.csv
+
+Credentials are read from --email/--token or the PERIFIC_EMAIL and
+PERIFIC_TOKEN environment variables. Time windows are fetched concurrently
+but written in order, so memory stays bounded by the number of windows in
+flight. Re-running with --resume continues after the last finished window.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from collections.abc import Callable, Iterator, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .api import PerificAPI
+from .const import HISTORY_CHUNK, HISTORY_MAX_CONCURRENCY, PHASE_DATA_TYPES
+from .history import (
+    PhaseDataRequest,
+    async_run_in_executor,
+    fetch_phase_data_requests,
+    merge_phase_data,
+    plan_phase_data_requests,
+)
+
+PHASES = ("l1", "l2", "l3")
+PHASE_FIELDS = ("hiavg", "huavg")
+SCALAR_FIELDS = ("hwi", "hwo")
+
+
+def columns(data_types: Sequence[str]) -> list[str]:
+    """Return the output columns for the given data types."""
+    result = ["item_id", "ts"]
+    for data_type in data_types:
+        prefix = data_type.lower()
+        for field in PHASE_FIELDS:
+            result.extend(f"{prefix}_{field}_{phase}" for phase in PHASES)
+        result.extend(f"{prefix}_{field}" for field in SCALAR_FIELDS)
+    return result
+
+
+def flatten_rows(
+    merged: dict[int, list[dict[str, Any]]], data_types: Sequence[str]
+) -> Iterator[list[Any]]:
+    """Flatten merged phase data rows into output records."""
+    for item_id, rows in merged.items():
+        for row in rows:
+            record: list[Any] = [item_id, row["ts"]]
+            for data_type in data_types:
+                data = row.get(data_type.lower()) or {}
+                for field in PHASE_FIELDS:
+                    values = list(data.get(field) or [])
+                    values += [None] * (len(PHASES) - len(values))
+                    record.extend(values[: len(PHASES)])
+                record.extend(data.get(field) for field in SCALAR_FIELDS)
+            yield record
+
+
+class CsvWriter:
+    """Append windows to one CSV file."""
+
+    def __init__(self, output: Path, header: list[str], offset: int | None) -> None:
+        """Open the output file, truncated to `offset` when resuming."""
+        if offset is None:
+            self._file = output.open("w", newline="")
+            csv.writer(self._file).writerow(header)
+        else:
+            # Drop anything written after the last finished window
+            self._file = output.open("r+", newline="")
+            self._file.truncate(offset)
+            self._file.seek(offset)
+        self._writer = csv.writer(self._file)
+
+    @staticmethod
+    def can_resume(output: Path, offset: int) -> bool:
+        """Return whether the output still holds the rows up to `offset`."""
+        return output.is_file() and output.stat().st_size >= offset
+
+    def write(self, window: datetime, records: list[list[Any]]) -> int:
+        """Write one window, flush it to disk and return the file offset."""
+        self._writer.writerows(records)
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self) -> None:
+        """Close the output file."""
+        self._file.close()
+
+
+class ParquetWriter:
+    """Write each window as one part file of a Parquet dataset directory."""
+
+    def __init__(self, output: Path, header: list[str], offset: int | None) -> None:
+        """Create the output directory."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as err:
+            raise SystemExit(
+                "Parquet export requires pyarrow: pip install pyarrow"
+            ) from err
+
+        self._header = header
+        self._output = output
+        output.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def can_resume(output: Path, offset: int) -> bool:
+        """Return whether the dataset directory is still there."""
+        return output.is_dir()
+
+    def write(self, window: datetime, records: list[list[Any]]) -> int:
+        """Write one window atomically."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(
+            {
+                name: [record[index] for record in records]
+                for index, name in enumerate(self._header)
+            }
+        )
+        part = self._output / f"part-{window:%Y%m%dT%H%M%S}.parquet"
+        tmp = part.with_suffix(".tmp")
+        pq.write_table(table, tmp)
+        tmp.replace(part)
+        return 0
+
+    def close(self) -> None:
+        """Nothing to close, parts are written whole."""
+
+
+class Progress:
+    """Track the last finished window next to the output."""
+
+    def __init__(self, output: Path, params: dict[str, Any]) -> None:
+        """Initialize progress tracking."""
+        self._path = output.with_name(output.name + ".progress.json")
+        self._params = params
+
+    def load(self) -> tuple[datetime, int] | None:
+        """Return the end and output offset of the last finished window."""
+        if not self._path.exists():
+            return None
+        state = json.loads(self._path.read_text())
+        if state.get("params") != self._params:
+            raise SystemExit(
+                f"{self._path} belongs to a different export, remove it to restart"
+            )
+        return datetime.fromisoformat(state["completed_until"]), state["offset"]
+
+    def save(self, completed_until: datetime, offset: int) -> None:
+        """Record a finished window."""
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "params": self._params,
+                    "completed_until": completed_until.isoformat(),
+                    "offset": offset,
+                }
+            )
+        )
+        tmp.replace(self._path)
+
+    def clear(self) -> None:
+        """Remove progress once the export is complete."""
+        self._path.unlink(missing_ok=True)
+
+
+def group_windows(
+    requests: list[PhaseDataRequest],
+) -> list[tuple[datetime, datetime, list[PhaseDataRequest]]]:
+    """Group planned requests by time window."""
+    windows: dict[datetime, tuple[datetime, list[PhaseDataRequest]]] = {}
+    for request in requests:
+        windows.setdefault(request.from_date, (request.to_date, []))[1].append(request)
+    return [(start, end, group) for start, (end, group) in windows.items()]
+
+
+async def export_history(
+    api: PerificAPI,
+    item_ids: Sequence[int],
+    from_date: datetime,
+    to_date: datetime,
+    output: Path,
+    output_format: str = "csv",
+    data_types: Sequence[str] = PHASE_DATA_TYPES,
+    chunk: timedelta = HISTORY_CHUNK,
+    max_concurrency: int = HISTORY_MAX_CONCURRENCY,
+    resume: bool = False,
+    on_window: Callable[[datetime, int], None] | None = None,
+) -> int:
+    """Export phase data and return the number of rows written.
+
+    `on_window` is called with the start and row count of each window once
+    it is written, e.g. to report progress.
+    """
+    header = columns(data_types)
+    progress = Progress(
+        output,
+        {
+            "items": list(item_ids),
+            "from": from_date.isoformat(),
+            "to": to_date.isoformat(),
+            "types": list(data_types),
+            "format": output_format,
+        },
+    )
+
+    writer_class = ParquetWriter if output_format == "parquet" else CsvWriter
+    start, offset = from_date, None
+    if resume and (completed := progress.load()):
+        # Start over if the output was removed since, the rows are gone
+        if writer_class.can_resume(output, completed[1]):
+            start, offset = completed
+
+    windows = group_windows(
+        plan_phase_data_requests(item_ids, start, to_date, data_types, chunk)
+    )
+    writer = writer_class(output, header, offset)
+
+    # Fetch a few windows ahead, but write them strictly in order
+    semaphore = asyncio.Semaphore(max_concurrency)
+    ahead = max(2, max_concurrency)
+    pending: dict[int, asyncio.Task] = {}
+    rows = 0
+
+    def decode_window(
+        results: list[tuple[PhaseDataRequest, list[dict[str, Any]]]],
+    ) -> list[list[Any]]:
+        return list(flatten_rows(merge_phase_data(results, data_types), data_types))
+
+    async def fetch_window(group: list[PhaseDataRequest]) -> list[list[Any]]:
+        results = await fetch_phase_data_requests(api, group, semaphore=semaphore)
+        # Keep decoding off the loop so requests for other windows keep flowing
+        return await async_run_in_executor(decode_window, results)
+
+    try:
+        for index, (window_start, window_end, _) in enumerate(windows):
+            for ahead_index in range(index, min(index + ahead, len(windows))):
+                if ahead_index not in pending:
+                    pending[ahead_index] = asyncio.ensure_future(
+                        fetch_window(windows[ahead_index][2])
+                    )
+
+            records = await pending.pop(index)
+            progress.save(window_end, writer.write(window_start, records))
+            rows += len(records)
+            if on_window:
+                on_window(window_start, len(records))
+    finally:
+        for task in pending.values():
+            task.cancel()
+        writer.close()
+
+    progress.clear()
+    return rows
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse an ISO date or datetime, assuming UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--item", dest="items", type=int, action="append", required=True
+    )
+    parser.add_argument("--from", dest="from_date", type=_parse_date, required=True)
+    parser.add_argument("--to", dest="to_date", type=_parse_date, required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        choices=PHASE_DATA_TYPES,
+        help="data types to export (default: all)",
+    )
+    parser.add_argument(
+        "--chunk-hours", type=int, default=int(HISTORY_CHUNK.total_seconds() // 3600)
+    )
+    parser.add_argument("--concurrency", type=int, default=HISTORY_MAX_CONCURRENCY)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--email", default=os.getenv("PERIFIC_EMAIL"))
+    parser.add_argument("--token", default=os.getenv("PERIFIC_TOKEN"))
+    args = parser.parse_args(argv)
+
+    if not args.email or not args.token:
+        parser.error("set --email/--token or PERIFIC_EMAIL/PERIFIC_TOKEN")
+    return args
+
+
+def _print_window(window_start: datetime, rows: int) -> None:
+    """Print the progress of the export."""
+    print(f"{window_start:%Y-%m-%d %H:%M} {rows} rows", file=sys.stderr)
+
+
+async def async_main(argv: Sequence[str] | None = None) -> None:
+    """Run the export."""
+    args = parse_args(argv)
+    api = PerificAPI(args.email, args.token)
+    try:
+        await api.refresh_token()
+        rows = await export_history(
+            api,
+            args.items,
+            args.from_date,
+            args.to_date,
+            args.output,
+            args.format,
+            args.types or PHASE_DATA_TYPES,
+            timedelta(hours=args.chunk_hours),
+            args.concurrency,
+            args.resume,
+            _print_window,
+        )
+    finally:
+        await api.close()
+    print(f"Exported {rows} rows to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main())
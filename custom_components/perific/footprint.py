@@ -0,0 +1,85 @@
+"""Approximate memory footprint of the Perific integration's state."""
+
+from __future__ import annotations
+
+import sys
+from collections import deque
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .coordinator import PerificDataUpdateCoordinator
+
+_CONTAINERS = (list, tuple, set, frozenset, deque)
+_VALUES = (str, bytes, int, float, complex, type(None), date, datetime, time, timedelta)
+
+
+def _attributes(obj: Any) -> list[Any]:
+    """Return the attribute values of an object."""
+    values = list(getattr(obj, "__dict__", {}).values())
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                values.append(getattr(obj, slot))
+    return values
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Return the approximate size in bytes of `obj` and everything it holds.
+
+    Containers are followed, as are the attributes of this integration's own
+    objects. Other objects, such as sessions, tasks, callbacks and Home
+    Assistant itself, are neither followed nor counted. Objects already in
+    `seen` are not counted again, so shared structures are counted once.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, _CONTAINERS):
+            stack.extend(obj)
+        elif type(obj).__module__.startswith(__package__):
+            stack.extend(_attributes(obj))
+        elif not isinstance(obj, _VALUES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+    return size
+
+
+def item_footprint(coordinator: PerificDataUpdateCoordinator, item_id: int) -> int:
+    """Return the approximate bytes held for one meter.
+
+    This covers the meter's coordinator data and its minute history, which
+    make up nearly all per-meter state.
+    """
+    seen: set[int] = set()
+    return deep_sizeof(
+        (coordinator.data or {}).get("items", {}).get(item_id), seen
+    ) + deep_sizeof(coordinator.minute_history.item_samples(item_id), seen)
+
+
+def account_footprint(entry_data: dict[str, Any]) -> dict[str, int]:
+    """Return the approximate bytes held for one account, by part."""
+    seen: set[int] = set()
+    coordinators = entry_data["coordinators"]
+    footprint = {
+        "data": sum(deep_sizeof(c.data, seen) for c in coordinators),
+        "minute_history": sum(
+            deep_sizeof(c.minute_history, seen) for c in coordinators
+        ),
+        "api": deep_sizeof(entry_data["api"], seen),
+        "forecast": deep_sizeof(entry_data["forecaster"], seen),
+        "peaks": deep_sizeof(entry_data["peaks"], seen),
+    }
+    # Gap detection, burst and threshold state and whatever else is left
+    footprint["other"] = deep_sizeof(coordinators, seen)
+    footprint["total"] = sum(footprint.values())
+    return footprint
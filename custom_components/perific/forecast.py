@@ -0,0 +1,160 @@
+"""Short-term consumption forecast for Perific/Enegic energy meters."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    FORECAST_PROFILE_ALPHA,
+    FORECAST_PROFILE_WEIGHT,
+    FORECAST_SAVE_DELAY,
+    FORECAST_TIME_CONSTANT,
+)
+from .stats import hour_energy_statistics
+
+STORAGE_VERSION = 1
+HOUR = timedelta(hours=1)
+
+
+@dataclass
+class ItemForecast:
+    """Incremental forecast state of one item."""
+
+    rate: float | None = None  # EWMA of the import rate in kWh per hour
+    last_ts: float | None = None  # timestamp and counter of the last minute
+    last_counter: float | None = None
+    hour_start: float | None = None  # start and counter of the current hour
+    hour_counter: float | None = None
+    profile: list[float | None] = field(default_factory=lambda: [None] * 24)
+
+
+class ConsumptionForecaster:
+    """Project imported energy for the current and the next hour.
+
+    The import rate is an exponentially weighted moving average of the
+    cumulative import counter in PhaseMinute packets. Every hour closed by a
+    PhaseHour packet also updates an hour-of-day profile. The current hour is
+    projected from the energy so far plus the rate, the next hour from a blend
+    of the rate and the profile. Each update is O(1) per item.
+    """
+
+    def __init__(self, hass: HomeAssistant | None = None, key: str = DOMAIN) -> None:
+        """Initialize the forecaster, persisted in `key` when hass is given."""
+        self._items: dict[int, ItemForecast] = {}
+        self._store: Store | None = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.forecast.{key}") if hass else None
+        )
+
+    async def async_load(self) -> None:
+        """Restore the forecast state."""
+        if self._store and (data := await self._store.async_load()):
+            self._items = {
+                int(item_id): ItemForecast(**state) for item_id, state in data.items()
+            }
+
+    async def async_save(self) -> None:
+        """Write the forecast state now."""
+        if self._store:
+            await self._store.async_save(self._data())
+
+    def _data(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {str(item_id): asdict(state) for item_id, state in self._items.items()}
+
+    @callback
+    def update(
+        self, item_id: int, latest_packets: dict[str, Any], received: datetime
+    ) -> dict[str, float]:
+        """Update with an item's latest packets and return its projection.
+
+        `received` is when the packets were fetched, which places the
+        aggregated packets since they carry no timestamp.
+        """
+        state = self._items.setdefault(item_id, ItemForecast())
+
+        # A new hourly packet, told apart by its counter, closes an hour and
+        # starts the next one
+        hourly = latest_packets.get("PhaseHour", {})
+        if energy := hour_energy_statistics(hourly, received):
+            closed = energy["imported"]
+            start = (closed["start"] + HOUR).timestamp()
+            if state.hour_counter != closed["state"]:
+                if state.hour_start == start - HOUR.total_seconds():
+                    self._learn(state, closed["start"], closed["state"])
+                state.hour_start = start
+                state.hour_counter = closed["state"]
+
+        # The minute packet carries the counter at the start of the minute
+        # it was received in
+        minute = latest_packets.get("PhaseMinute", {})
+        counter = minute.get("data", {}).get("hwi")
+        if counter is None:
+            return {}
+        ts = received.replace(second=0, microsecond=0)
+        self._observe(state, ts.timestamp(), counter)
+
+        if self._store:
+            self._store.async_delay_save(self._data, FORECAST_SAVE_DELAY)
+        return self._project(state, ts, counter)
+
+    def _observe(self, state: ItemForecast, ts: float, counter: float) -> None:
+        """Fold a new counter reading into the import rate."""
+        if state.last_ts is not None and ts > state.last_ts:
+            elapsed = ts - state.last_ts
+            rate = (counter - state.last_counter) * 3600 / elapsed
+            if rate >= 0:
+                if state.rate is None:
+                    state.rate = rate
+                else:
+                    alpha = 1 - math.exp(
+                        -elapsed / FORECAST_TIME_CONSTANT.total_seconds()
+                    )
+                    state.rate += alpha * (rate - state.rate)
+        if state.last_ts is None or ts > state.last_ts:
+            state.last_ts = ts
+            state.last_counter = counter
+
+    @staticmethod
+    def _learn(state: ItemForecast, start: datetime, counter: float) -> None:
+        """Add a closed hour's energy to the hour-of-day profile."""
+        energy = counter - state.hour_counter
+        if energy < 0:
+            return
+        slot = dt_util.as_local(start).hour
+        previous = state.profile[slot]
+        state.profile[slot] = (
+            energy
+            if previous is None
+            else previous + FORECAST_PROFILE_ALPHA * (energy - previous)
+        )
+
+    @staticmethod
+    def _project(
+        state: ItemForecast, now: datetime, counter: float
+    ) -> dict[str, float]:
+        """Return projected kWh for the current and the next hour."""
+        if state.rate is None or state.hour_start is None:
+            return {}
+        remaining = state.hour_start + HOUR.total_seconds() - now.timestamp()
+        if not 0 <= remaining <= HOUR.total_seconds():
+            return {}
+
+        next_hour = state.rate
+        slot = dt_util.as_local(now + HOUR).hour
+        if (profile := state.profile[slot]) is not None:
+            next_hour += FORECAST_PROFILE_WEIGHT * (profile - next_hour)
+
+        return {
+            "current_hour": round(
+                counter - state.hour_counter + state.rate * remaining / 3600, 3
+            ),
+            "next_hour": round(next_hour, 3),
+        }
@@ -0,0 +1,194 @@
+"""Bulk phase data fetching for Perific/Enegic energy meters."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .const import (
+    HISTORY_CHUNK,
+    HISTORY_MAX_CONCURRENCY,
+    HISTORY_PARSE_CHUNK,
+    PHASE_DATA_TYPES,
+)
+
+if TYPE_CHECKING:
+    from .api import PerificAPI
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class PhaseDataRequest:
+    """A single /getphasedata call."""
+
+    item_id: int
+    data_type: str
+    from_date: datetime
+    to_date: datetime
+
+
+def plan_phase_data_requests(
+    item_ids: Iterable[int],
+    from_date: datetime,
+    to_date: datetime,
+    data_types: Sequence[str] = PHASE_DATA_TYPES,
+    chunk: timedelta = HISTORY_CHUNK,
+) -> list[PhaseDataRequest]:
+    """Split a history job into per-item, per-type, per-chunk requests.
+
+    Requests are ordered by time window first so the earliest data for every
+    item is fetched before later windows.
+    """
+    item_ids = list(item_ids)
+    requests = []
+
+    start = from_date
+    while start < to_date:
+        end = min(start + chunk, to_date)
+        for item_id in item_ids:
+            for data_type in data_types:
+                requests.append(PhaseDataRequest(item_id, data_type, start, end))
+        start = end
+
+    return requests
+
+
+def iter_phase_records(
+    response: list[dict[str, Any]] | None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield (timestamp, data) pairs from a /getphasedata response."""
+    for group in response or []:
+        for record in group.get("data", []):
+            ts = record.get("ts")
+            if ts:
+                yield ts, record.get("data", {})
+
+
+def chunk_phase_response(
+    response: list[dict[str, Any]] | None, size: int = HISTORY_PARSE_CHUNK
+) -> Iterator[list[dict[str, Any]]]:
+    """Split a /getphasedata response into responses of at most `size` records."""
+    for group in response or []:
+        records = group.get("data", [])
+        for start in range(0, len(records), size):
+            yield [{**group, "data": records[start : start + size]}]
+
+
+async def async_iter_phase_chunks(
+    func: Callable[[list[dict[str, Any]]], _T],
+    response: list[dict[str, Any]] | None,
+    size: int = HISTORY_PARSE_CHUNK,
+) -> AsyncIterator[_T]:
+    """Run `func` on chunks of a response in the executor, yielding each result.
+
+    Decoding stays off the event loop and each result is handed back as soon
+    as its chunk is done, so applying it on the loop takes a short slice too.
+    Cancelling the consumer stops the job once the running chunk finishes.
+    """
+    loop = asyncio.get_running_loop()
+    for chunk in chunk_phase_response(response, size):
+        yield await loop.run_in_executor(None, func, chunk)
+
+
+async def async_run_in_executor(func: Callable[..., _T], *args: Any) -> _T:
+    """Run a whole-response aggregation in the executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def parse_phase_timestamp(value: str) -> datetime:
+    """Parse a /getphasedata timestamp.
+
+    The API returns naive ISO timestamps in UTC, not in the meter's TimeZone
+    (e.g. Europe/Stockholm): the documented record at 16:13:00 is the same
+    minute as the PhaseRealTime packet with ts 1752509560000, 16:12:40 UTC.
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def merge_phase_data(
+    results: Iterable[tuple[PhaseDataRequest, list[dict[str, Any]]]],
+    data_types: Sequence[str] = PHASE_DATA_TYPES,
+) -> dict[int, list[dict[str, Any]]]:
+    """Merge responses into one timestamp-aligned row list per item.
+
+    Each row has a "ts" key plus one key per data type ("avg", "min", "max")
+    holding that type's data for the timestamp, or None if it was missing.
+    """
+    keys = [data_type.lower() for data_type in data_types]
+    rows: dict[int, dict[str, dict[str, Any]]] = {}
+
+    for request, response in results:
+        item_rows = rows.setdefault(request.item_id, {})
+        key = request.data_type.lower()
+        for ts, data in iter_phase_records(response):
+            row = item_rows.get(ts)
+            if row is None:
+                row = item_rows[ts] = {"ts": ts, **dict.fromkeys(keys)}
+            row[key] = data
+
+    return {
+        item_id: [item_rows[ts] for ts in sorted(item_rows)]
+        for item_id, item_rows in rows.items()
+    }
+
+
+async def fetch_phase_data_requests(
+    api: PerificAPI,
+    requests: Sequence[PhaseDataRequest],
+    max_concurrency: int = HISTORY_MAX_CONCURRENCY,
+    semaphore: asyncio.Semaphore | None = None,
+) -> list[tuple[PhaseDataRequest, list[dict[str, Any]]]]:
+    """Run phase data requests with bounded concurrency.
+
+    Requests go through the API's shared rate limiter at history priority, so
+    they only use capacity left over by realtime polling. Results are returned
+    in request order. If any request fails the remaining ones are cancelled and
+    the error is raised. Pass `semaphore` to share one concurrency bound
+    between several calls.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _fetch(request: PhaseDataRequest) -> list[dict[str, Any]]:
+        async with semaphore:
+            return await api.get_phase_data(
+                request.item_id,
+                request.from_date,
+                request.to_date,
+                request.data_type,
+            )
+
+    tasks = [asyncio.ensure_future(_fetch(request)) for request in requests]
+    try:
+        responses = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return list(zip(requests, responses))
+
+
+async def fetch_phase_data_bulk(
+    api: PerificAPI,
+    item_ids: Iterable[int],
+    from_date: datetime,
+    to_date: datetime,
+    data_types: Sequence[str] = PHASE_DATA_TYPES,
+    chunk: timedelta = HISTORY_CHUNK,
+    max_concurrency: int = HISTORY_MAX_CONCURRENCY,
+) -> dict[int, list[dict[str, Any]]]:
+    """Fetch and merge phase data for many items and data types at once.
+
+    Responses are merged in the executor.
+    """
+    requests = plan_phase_data_requests(item_ids, from_date, to_date, data_types, chunk)
+    results = await fetch_phase_data_requests(api, requests, max_concurrency)
+    return await async_run_in_executor(merge_phase_data, results, data_types)
@@ -0,0 +1,168 @@
+"""Request rate limiting for the Perific/Enegic API."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from enum import IntEnum
+from typing import Any
+from urllib.parse import urlsplit
+
+from .const import RATE_LIMIT_BULK_RESERVE, RATE_LIMIT_BURST, RATE_LIMIT_RATE
+
+
+class RequestPriority(IntEnum):
+    """Priority classes, lower values are served first."""
+
+    REALTIME = 0
+    METADATA = 1
+    HISTORY = 2
+
+
+class RequestLimiter:
+    """Token bucket with priority queueing.
+
+    Waiting requests are granted tokens strictly in priority order. History
+    requests may not take the last `bulk_reserve` tokens, so bulk work only
+    uses capacity that realtime polling leaves over.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_RATE,
+        burst: int = RATE_LIMIT_BURST,
+        bulk_reserve: int = RATE_LIMIT_BULK_RESERVE,
+    ) -> None:
+        """Initialize the limiter."""
+        self.rate = rate
+        self.burst = burst
+        self.bulk_reserve = min(bulk_reserve, burst - 1)
+        self._tokens = float(burst)
+        self._updated: float | None = None
+        self._waiters: list[tuple[int, int, asyncio.Future[None], float]] = []
+        self._seq = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+        self.granted = dict.fromkeys(RequestPriority, 0)
+        self.total_wait = dict.fromkeys(RequestPriority, 0.0)
+        self.max_wait = dict.fromkeys(RequestPriority, 0.0)
+        self.max_queue_depth = 0
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        if self._updated is not None and now > self._updated:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def _reserve(self, priority: RequestPriority) -> int:
+        """Return the tokens a request of this priority must leave behind."""
+        return self.bulk_reserve if priority >= RequestPriority.HISTORY else 0
+
+    def _record(self, priority: RequestPriority, waited: float) -> None:
+        """Record a granted request."""
+        self.granted[priority] += 1
+        self.total_wait[priority] += waited
+        self.max_wait[priority] = max(self.max_wait[priority], waited)
+
+    async def acquire(
+        self, priority: RequestPriority = RequestPriority.METADATA
+    ) -> None:
+        """Wait for a token."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._refill(now)
+
+        queue_clear = not self._waiters or self._waiters[0][0] > priority
+        if queue_clear and self._tokens >= 1 + self._reserve(priority):
+            self._tokens -= 1
+            self._record(priority, 0.0)
+            return
+
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future, now))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # Token was granted just before cancellation, hand it back
+                self._tokens += 1
+            self._waiters = [w for w in self._waiters if w[2] is not future]
+            heapq.heapify(self._waiters)
+            self._dispatch()
+            raise
+
+    def has_spare(self) -> bool:
+        """Return True if a request would be granted now beyond the bulk reserve.
+
+        Optional realtime work, such as burst polling, checks this first so it
+        never queues behind or delays regular polling.
+        """
+        self._refill(asyncio.get_running_loop().time())
+        queued = any(not waiter[2].done() for waiter in self._waiters)
+        return not queued and self._tokens >= 1 + self.bulk_reserve
+
+    def _dispatch(self) -> None:
+        """Grant tokens to waiters and schedule the next wakeup."""
+        if self._wakeup:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._refill(now)
+
+        while self._waiters:
+            priority, _, future, queued = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            needed = 1 + self._reserve(RequestPriority(priority))
+            if self._tokens < needed:
+                delay = (needed - self._tokens) / self.rate
+                self._wakeup = loop.call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._record(RequestPriority(priority), now - queued)
+            future.set_result(None)
+
+    @property
+    def queue_depth(self) -> dict[str, int]:
+        """Return the number of waiting requests per priority class."""
+        depth = {priority.name.lower(): 0 for priority in RequestPriority}
+        for priority, _, future, _ in self._waiters:
+            if not future.done():
+                depth[RequestPriority(priority).name.lower()] += 1
+        return depth
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return limiter metrics."""
+        return {
+            "tokens": round(self._tokens, 2),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "granted": {p.name.lower(): n for p, n in self.granted.items()},
+            "max_wait": {p.name.lower(): w for p, w in self.max_wait.items()},
+            "avg_wait": {
+                p.name.lower(): (self.total_wait[p] / n if n else 0.0)
+                for p, n in self.granted.items()
+            },
+        }
+
+
+_LIMITERS: dict[str, RequestLimiter] = {}
+
+
+def get_limiter(url: str) -> RequestLimiter:
+    """Return the limiter shared by all clients of the host in `url`."""
+    host = urlsplit(url).netloc or url
+    if host not in _LIMITERS:
+        _LIMITERS[host] = RequestLimiter()
+    return _LIMITERS[host]
@@ -0,0 +1,166 @@
+"""Per-phase metrics derived once per update for Perific sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfPower,
+)
+
+PHASES = ("l1", "l2", "l3")
+
+
+class PhaseSnapshot:
+    """An item's parsed reading with intermediate values computed on demand.
+
+    Each intermediate is computed at most once per update, however many
+    metrics use it.
+    """
+
+    def __init__(self, power: dict[str, Any]) -> None:
+        """Initialize from the output of `parse_current_power`."""
+        self._power = power
+
+    @cached_property
+    def currents(self) -> dict[str, float]:
+        """Signed current per phase, import being negative."""
+        return self._power.get("current", {})
+
+    @cached_property
+    def voltages(self) -> dict[str, float]:
+        """Voltage per phase."""
+        return self._power.get("voltage", {})
+
+    @cached_property
+    def magnitudes(self) -> dict[str, float]:
+        """Current magnitude per phase."""
+        return {phase: abs(value) for phase, value in self.currents.items()}
+
+    @cached_property
+    def powers(self) -> dict[str, float]:
+        """Power |I| * U per phase and in total, as parsed."""
+        return self._power.get("power", {})
+
+    @cached_property
+    def net_power(self) -> float:
+        """Imported minus exported power over all phases."""
+        return -sum(
+            current * self.voltages.get(phase, 0.0)
+            for phase, current in self.currents.items()
+        )
+
+    @cached_property
+    def imbalance(self) -> float | None:
+        """Largest deviation of a phase current from their mean, in percent."""
+        values = [
+            self.magnitudes[phase] for phase in PHASES if phase in self.magnitudes
+        ]
+        if not values or not (mean := sum(values) / len(values)):
+            return None
+        return max(abs(value - mean) for value in values) / mean * 100
+
+
+@dataclass(frozen=True, kw_only=True)
+class PerificMetricDescription(SensorEntityDescription):
+    """Describes a sensor whose value is derived from an item's reading.
+
+    `sensor_type` and `phase` build the entity's unique ID and name as for
+    every other Perific sensor. `deadband_group` selects the configured
+    deadband that filters the sensor's state writes.
+    """
+
+    sensor_type: str
+    phase: str | None = None
+    deadband_group: str | None = None
+    value_fn: Callable[[PhaseSnapshot], float | None]
+
+
+def _phase_metrics(
+    sensor_type: str,
+    value_fn: Callable[[PhaseSnapshot, str], float | None],
+    phases: Sequence[str] = PHASES,
+    **kwargs: Any,
+) -> tuple[PerificMetricDescription, ...]:
+    """Describe one metric for each phase."""
+    return tuple(
+        PerificMetricDescription(
+            key=f"{sensor_type}_{phase}",
+            sensor_type=sensor_type,
+            phase=phase,
+            value_fn=lambda snapshot, phase=phase: value_fn(snapshot, phase),
+            **kwargs,
+        )
+        for phase in phases
+    )
+
+
+METRIC_DESCRIPTIONS: tuple[PerificMetricDescription, ...] = (
+    *_phase_metrics(
+        "power",
+        lambda snapshot, phase: snapshot.powers.get(phase),
+        ("total", *PHASES),
+        deadband_group="power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+    ),
+    *_phase_metrics(
+        "voltage",
+        lambda snapshot, phase: snapshot.voltages.get(phase),
+        deadband_group="voltage",
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+    ),
+    *_phase_metrics(
+        "current",
+        lambda snapshot, phase: snapshot.magnitudes.get(phase, 0),
+        deadband_group="current",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+    ),
+    PerificMetricDescription(
+        key="net_power",
+        sensor_type="net_power",
+        value_fn=lambda snapshot: snapshot.net_power,
+        deadband_group="power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+    ),
+    PerificMetricDescription(
+        key="phase_imbalance",
+        sensor_type="phase_imbalance",
+        value_fn=lambda snapshot: snapshot.imbalance,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+def evaluate_metrics(
+    power: dict[str, Any],
+    descriptions: Sequence[PerificMetricDescription] = METRIC_DESCRIPTIONS,
+) -> dict[str, float | None]:
+    """Evaluate every described metric of one item's parsed reading."""
+    if not power:
+        return {}
+    snapshot = PhaseSnapshot(power)
+    return {
+        description.key: description.value_fn(snapshot) for description in descriptions
+    }
@@ -0,0 +1,189 @@
+"""OpenMetrics endpoint for the latest Perific readings."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_OPENMETRICS, DOMAIN, OPENMETRICS_URL
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# name: (type, unit, help)
+FAMILIES = {
+    "perific_power_watts": ("gauge", "watts", "Power per phase, |I| * U."),
+    "perific_voltage_volts": ("gauge", "volts", "Voltage per phase."),
+    "perific_current_amperes": (
+        "gauge",
+        "amperes",
+        "Signed current per phase, negative while importing.",
+    ),
+    "perific_energy_imported_kwh": (
+        "counter",
+        "kwh",
+        "Imported energy meter reading.",
+    ),
+    "perific_energy_exported_kwh": (
+        "counter",
+        "kwh",
+        "Exported energy meter reading.",
+    ),
+    "perific_reading_timestamp_seconds": (
+        "gauge",
+        "seconds",
+        "Time of the latest reading.",
+    ),
+    "perific_data_age_seconds": (
+        "gauge",
+        "seconds",
+        "Age of the latest API response when polled.",
+    ),
+    "perific_coordinator_up": ("gauge", "", "Whether the last refresh succeeded."),
+    "perific_snapshot_lookups": ("counter", "", "Snapshot cache lookups."),
+    "perific_snapshot_errors": ("counter", "", "Failed snapshot revalidations."),
+    "perific_limiter_granted": ("counter", "", "Requests let through the limiter."),
+    "perific_limiter_queue_depth": ("gauge", "", "Requests waiting for a token."),
+    "perific_limiter_max_wait_seconds": (
+        "gauge",
+        "seconds",
+        "Longest limiter wait per priority.",
+    ),
+}
+
+
+def _labels(labels: dict[str, Any]) -> str:
+    """Format a label set."""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def render_openmetrics(entries: Iterable[tuple[str, dict[str, Any]]]) -> str:
+    """Render the latest data of the given config entries.
+
+    Only data already held by the coordinators and the API client is read,
+    so rendering never triggers a request.
+    """
+    samples: dict[str, list[str]] = {name: [] for name in FAMILIES}
+
+    def add(name: str, labels: dict[str, Any], value: Any, suffix: str = "") -> None:
+        if value is not None:
+            samples[name].append(f"{name}{suffix}{_labels(labels)} {float(value)!r}")
+
+    limiter_done = False
+    for entry_id, entry_data in entries:
+        for shard, coordinator in enumerate(entry_data["coordinators"]):
+            add(
+                "perific_coordinator_up",
+                {"entry_id": entry_id, "shard": shard},
+                int(coordinator.last_update_success),
+            )
+            for item_id, item_data in (coordinator.data or {}).get("items", {}).items():
+                power = item_data.get("power")
+                if not power:
+                    continue
+                item = {"item_id": item_id, "item_name": item_data["info"]["name"]}
+                for phase, value in power["power"].items():
+                    add("perific_power_watts", {**item, "phase": phase}, value)
+                for phase, value in power["voltage"].items():
+                    add("perific_voltage_volts", {**item, "phase": phase}, value)
+                for phase, value in power["current"].items():
+                    add("perific_current_amperes", {**item, "phase": phase}, value)
+                counters = item_data.get("counters", {})
+                add(
+                    "perific_energy_imported_kwh",
+                    item,
+                    counters.get("imported"),
+                    "_total",
+                )
+                add(
+                    "perific_energy_exported_kwh",
+                    item,
+                    counters.get("exported"),
+                    "_total",
+                )
+                add("perific_data_age_seconds", item, item_data.get("data_age"))
+                if reading := power.get("timestamp"):
+                    add(
+                        "perific_reading_timestamp_seconds",
+                        item,
+                        datetime.fromisoformat(reading).timestamp(),
+                    )
+
+        api = entry_data["api"]
+        snapshots = api.snapshot_metrics
+        for result, key in (("hit", "hits"), ("miss", "misses")):
+            add(
+                "perific_snapshot_lookups",
+                {"entry_id": entry_id, "result": result},
+                snapshots[key],
+                "_total",
+            )
+        add(
+            "perific_snapshot_errors",
+            {"entry_id": entry_id},
+            snapshots["errors"],
+            "_total",
+        )
+
+        # The limiter is shared by every entry talking to the API host
+        if not limiter_done:
+            limiter_done = True
+            limiter = api.limiter_metrics
+            for priority, depth in limiter["queue_depth"].items():
+                add("perific_limiter_queue_depth", {"priority": priority}, depth)
+            for priority, granted in limiter["granted"].items():
+                add(
+                    "perific_limiter_granted",
+                    {"priority": priority},
+                    granted,
+                    "_total",
+                )
+            for priority, wait in limiter["max_wait"].items():
+                add("perific_limiter_max_wait_seconds", {"priority": priority}, wait)
+
+    lines = []
+    for name, (kind, unit, help_text) in FAMILIES.items():
+        if not samples[name]:
+            continue
+        lines.append(f"# TYPE {name} {kind}")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.extend(samples[name])
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class PerificMetricsView(HomeAssistantView):
+    """Serve the latest readings of entries with the endpoint enabled."""
+
+    url = OPENMETRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the metrics."""
+        entries = [
+            (entry_id, entry_data)
+            for entry_id, entry_data in self.hass.data.get(DOMAIN, {}).items()
+            if (entry := self.hass.config_entries.async_get_entry(entry_id))
+            and entry.options.get(CONF_OPENMETRICS)
+        ]
+        if not entries:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        return web.Response(
+            body=render_openmetrics(entries).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
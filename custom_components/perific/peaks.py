@@ -0,0 +1,182 @@
+"""Monthly peak hour tracking for Perific/Enegic energy meters."""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .backfill import floor_hour
+from .const import DOMAIN, MIN_HOUR_COVERAGE, PEAK_COUNT, PEAK_SAVE_DELAY
+from .history import iter_phase_records, parse_phase_timestamp
+
+STORAGE_VERSION = 1
+HOUR = timedelta(hours=1)
+
+
+def _import_power(data: dict[str, Any]) -> float:
+    """Return imported power in W, negative currents being import."""
+    voltages = data.get("huavg", [230, 230, 230])
+    return sum(
+        -current * voltage
+        for current, voltage in zip(data["hiavg"], voltages)
+        if current < 0
+    )
+
+
+def hourly_energy(response: list[dict[str, Any]] | None) -> dict[datetime, float]:
+    """Return imported kWh per hour of a /getphasedata response.
+
+    Hours are measured with the cumulative import counter between their
+    first reading and the next hour's when the records carry it, otherwise
+    from the mean import power of hours with enough minute samples.
+    """
+    counters: dict[datetime, tuple[datetime, float]] = {}
+    powers: dict[datetime, list[float]] = {}
+    for ts, data in iter_phase_records(response):
+        minute = parse_phase_timestamp(ts)
+        hour = floor_hour(minute)
+        if data.get("hwi") is not None and (
+            hour not in counters or minute < counters[hour][0]
+        ):
+            counters[hour] = (minute, data["hwi"])
+        if "hiavg" in data:
+            powers.setdefault(hour, []).append(_import_power(data))
+
+    energy = {}
+    for hour, values in powers.items():
+        if len(values) >= MIN_HOUR_COVERAGE:
+            energy[hour] = sum(values) / len(values) / 1000
+    for hour, (_, counter) in counters.items():
+        if (following := counters.get(hour + HOUR)) and following[1] >= counter:
+            energy[hour] = following[1] - counter
+    return energy
+
+
+@dataclass
+class MonthPeaks:
+    """The top hours of one item in the current month."""
+
+    month: str | None = None
+    peaks: list[list] = field(default_factory=list)  # min-heap of [kWh, start ts]
+    hour_start: float | None = None  # start and counter of the last closed hour
+    hour_counter: float | None = None
+
+
+class PeakTracker:
+    """Keep each item's top hourly imports of the month.
+
+    Hours are closed by PhaseHour packets and measured as the difference of
+    consecutive cumulative import counters. Only a heap of the top
+    `PEAK_COUNT` hours is kept per item. Missing hours are reported so that
+    they can be rebuilt from /getphasedata.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant | None = None,
+        key: str = DOMAIN,
+        count: int = PEAK_COUNT,
+    ) -> None:
+        """Initialize the tracker, persisted in `key` when hass is given."""
+        self._count = count
+        self._items: dict[int, MonthPeaks] = {}
+        self._store: Store | None = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.peaks.{key}") if hass else None
+        )
+
+    async def async_load(self) -> None:
+        """Restore the peaks."""
+        if self._store and (data := await self._store.async_load()):
+            self._items = {
+                int(item_id): MonthPeaks(**state) for item_id, state in data.items()
+            }
+
+    async def async_save(self) -> None:
+        """Write the peaks now."""
+        if self._store:
+            await self._store.async_save(self._data())
+
+    def _data(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {str(item_id): asdict(state) for item_id, state in self._items.items()}
+
+    @callback
+    def close_hour(
+        self, item_id: int, start: datetime, counter: float
+    ) -> tuple[datetime, datetime] | None:
+        """Record the import counter at the end of the hour from `start`.
+
+        Returns the range of this month's hours that were missed since the
+        previous reading, if any.
+        """
+        state = self._items.setdefault(item_id, MonthPeaks())
+        end = start + HOUR
+        if state.hour_start is not None and start.timestamp() <= state.hour_start:
+            return None
+
+        missing = None
+        if state.hour_start is not None and state.hour_counter is not None:
+            previous_end = datetime.fromtimestamp(state.hour_start, timezone.utc) + HOUR
+            if previous_end == start:
+                self.add(item_id, start, counter - state.hour_counter)
+            elif previous_end < start:
+                # Hours since the previous reading, and this one, are unknown
+                month_start = dt_util.as_local(start).replace(
+                    day=1, hour=0, minute=0, second=0, microsecond=0
+                )
+                missing = (max(previous_end, dt_util.as_utc(month_start)), end)
+
+        state.hour_start = start.timestamp()
+        state.hour_counter = counter
+        self._async_schedule_save()
+        return missing
+
+    @callback
+    def add(self, item_id: int, start: datetime, energy: float) -> None:
+        """Add one hour's imported energy."""
+        state = self._items.setdefault(item_id, MonthPeaks())
+        month = dt_util.as_local(start).strftime("%Y-%m")
+        if state.month != month:
+            if state.month is not None and month < state.month:
+                return
+            state.month = month
+            state.peaks = []
+
+        ts = start.timestamp()
+        if energy < 0 or any(peak[1] == ts for peak in state.peaks):
+            return
+        if len(state.peaks) < self._count:
+            heapq.heappush(state.peaks, [energy, ts])
+        elif energy > state.peaks[0][0]:
+            heapq.heapreplace(state.peaks, [energy, ts])
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the peaks soon."""
+        if self._store:
+            self._store.async_delay_save(self._data, PEAK_SAVE_DELAY)
+
+    def peaks(self, item_id: int) -> dict[str, Any]:
+        """Return an item's peaks, highest first, and their average."""
+        state = self._items.get(item_id)
+        if state is None or not state.peaks:
+            return {}
+        peaks = [
+            {
+                "start": datetime.fromtimestamp(ts, timezone.utc).isoformat(),
+                "energy": round(energy, 3),
+            }
+            for energy, ts in sorted(state.peaks, reverse=True)
+        ]
+        return {
+            "month": state.month,
+            "peaks": peaks,
+            "average": round(sum(peak[0] for peak in state.peaks) / len(peaks), 3),
+        }
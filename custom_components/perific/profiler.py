@@ -0,0 +1,150 @@
+"""On-demand profiling of Perific coordinator cycles."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+PROFILE_MODES = ("timing", "cprofile")
+
+_TRACE: ContextVar[CycleTrace | None] = ContextVar("perific_trace", default=None)
+_NO_SPAN = contextlib.nullcontext()
+
+
+@dataclass
+class CycleTrace:
+    """Timed spans of one coordinator cycle."""
+
+    coordinator: str
+    start: float = field(default_factory=time.perf_counter)
+    spans: list[tuple[str, float, float]] = field(default_factory=list)
+    duration: float | None = None
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed code as `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.duration is None:
+                end = time.perf_counter()
+                self.spans.append((name, start - self.start, end - start))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace with times in milliseconds."""
+        return {
+            "coordinator": self.coordinator,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "spans": [
+                {
+                    "name": name,
+                    "offset_ms": round(offset * 1000, 3),
+                    "duration_ms": round(duration * 1000, 3),
+                }
+                for name, offset, duration in self.spans
+            ],
+        }
+
+
+def span(name: str) -> contextlib.AbstractContextManager:
+    """Time the enclosed code in the current cycle's trace, if one is recorded.
+
+    Tasks started inside a traced cycle inherit its trace, so API calls made
+    through the snapshot cache are timed as part of the cycle that awaits them.
+    """
+    if (trace := _TRACE.get()) is None:
+        return _NO_SPAN
+    return trace.span(name)
+
+
+class CycleProfiler:
+    """Profile the next `cycles` refreshes of a set of coordinators.
+
+    In "timing" mode each cycle records how long it spent waiting for the
+    API, decoding JSON, parsing and dispatching to entities. In "cprofile"
+    mode the interpreter is profiled while at least one cycle runs; other
+    work on the event loop during those cycles is included as well.
+    """
+
+    def __init__(
+        self, mode: str, cycles: int, coordinators: dict[Any, str], path: str
+    ) -> None:
+        """Initialize the profiler for coordinators mapped to their labels."""
+        self.mode = mode
+        self.path = Path(path)
+        self._labels = coordinators
+        self._remaining = dict.fromkeys(coordinators, cycles)
+        self._running = 0
+        self._profile = None
+        if mode == "cprofile":
+            # Only loaded when asked for, the API client imports this module
+            import cProfile
+
+            self._profile = cProfile.Profile()
+        self.traces: list[CycleTrace] = []
+        self.finished = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        """Return True once every coordinator ran its cycles."""
+        return not any(self._remaining.values())
+
+    @contextlib.contextmanager
+    def cycle(self, coordinator: Any) -> Iterator[None]:
+        """Profile one refresh of `coordinator` if it still needs one."""
+        if not self._remaining.get(coordinator):
+            yield
+            return
+
+        trace = CycleTrace(self._labels[coordinator])
+        token = _TRACE.set(trace) if self._profile is None else None
+        if self._profile is not None and not self._running:
+            self._profile.enable()
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            if self._profile is not None and not self._running:
+                self._profile.disable()
+            if token is not None:
+                _TRACE.reset(token)
+            trace.duration = time.perf_counter() - trace.start
+            self.traces.append(trace)
+            self._remaining[coordinator] -= 1
+            if self.done:
+                self.finished.set()
+
+    def write(self) -> Path:
+        """Write the report, to be run in an executor."""
+        if self._profile is not None:
+            import pstats
+
+            self._profile.dump_stats(self.path.with_suffix(".prof"))
+            output = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=output)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+            self.path.with_suffix(".txt").write_text(output.getvalue())
+            return self.path.with_suffix(".txt")
+
+        totals: dict[str, dict[str, float]] = {}
+        for trace in self.traces:
+            for name, _, duration in trace.spans:
+                total = totals.setdefault(name, {"count": 0, "total_ms": 0.0})
+                total["count"] += 1
+                total["total_ms"] = round(total["total_ms"] + duration * 1000, 3)
+        report = {
+            "cycles": [trace.as_dict() for trace in self.traces],
+            "totals": totals,
+        }
+        self.path.with_suffix(".json").write_text(json.dumps(report, indent=2))
+        return self.path.with_suffix(".json")
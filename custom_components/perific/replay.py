@@ -0,0 +1,279 @@
+"""Record and replay Perific/Enegic API traffic.
+
+A `RequestRecorder` wraps the session of a `PerificAPI` and captures every
+request with its response, status, size and latency. Credentials and personal
+details are redacted before anything is stored. A `ReplaySession` serves a
+recorded fixture in place of a session, with the original latencies or scaled
+ones, so performance problems can be reproduced without a network:
+
+    api = PerificAPI("user", "token", ReplaySession.load("fixture.json"))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Awaitable
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+FIXTURE_VERSION = 1
+REDACTED = "**REDACTED**"
+
+# Compared case-insensitively against whole keys at any depth
+REDACT_KEYS = {
+    "address",
+    "city",
+    "mac",
+    "organization",
+    "zipcode",
+}
+
+# Values under keys containing any of these, case-insensitively, are redacted
+# too, though dicts and lists under them, like "TokenInfo", are only searched
+REDACT_KEY_PARTS = (
+    "email",
+    "name",
+    "pass",
+    "phone",
+    "secret",
+    "token",
+)
+
+
+def _redact_key(key: Any, value: Any) -> bool:
+    """Return whether `value` under `key` is redacted."""
+    if not isinstance(key, str):
+        return False
+    key = key.lower()
+    if key in REDACT_KEYS:
+        return True
+    return not isinstance(value, (dict, list)) and any(
+        part in key for part in REDACT_KEY_PARTS
+    )
+
+
+def redact(value: Any) -> Any:
+    """Return a copy of `value` with credentials and personal details replaced."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if _redact_key(key, item) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def _request_body(kwargs: dict[str, Any]) -> Any:
+    """Return the redacted JSON or form body of a request."""
+    return redact(kwargs.get("json", kwargs.get("data")))
+
+
+class _ResponseContext:
+    """Awaitable async context manager, like aiohttp's request context."""
+
+    def __init__(self, response: Awaitable[ReplayResponse]) -> None:
+        self._response = response
+
+    async def __aenter__(self) -> ReplayResponse:
+        return await self._response
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class ReplayResponse:
+    """A fully read response, with the parts of aiohttp's the client uses."""
+
+    def __init__(self, method: str, url: str, status: int, content: bytes) -> None:
+        """Initialize the response."""
+        self.method = method
+        self.url = url
+        self.status = status
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        """Raise aiohttp's ClientResponseError for error statuses."""
+        if self.status < 400:
+            return
+        from aiohttp import ClientResponseError, RequestInfo
+        from multidict import CIMultiDict, CIMultiDictProxy
+        from yarl import URL
+
+        url = URL(self.url)
+        raise ClientResponseError(
+            RequestInfo(url, self.method, CIMultiDictProxy(CIMultiDict()), url),
+            (),
+            status=self.status,
+            message=self.content.decode(errors="replace"),
+        )
+
+    async def read(self) -> bytes:
+        """Return the response body."""
+        return self.content
+
+    async def json(self) -> Any:
+        """Decode the response body."""
+        return json.loads(self.content)
+
+
+class RequestRecorder:
+    """Capture the requests sent through wrapped sessions."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.started = datetime.now(timezone.utc)
+        self.records: list[dict[str, Any]] = []
+        self._first: float | None = None
+
+    def offset(self, now: float) -> float:
+        """Return seconds from the first recorded request to loop time `now`."""
+        if self._first is None:
+            self._first = now
+        return round(now - self._first, 3)
+
+    def wrap(self, session: ClientSession) -> RecordingSession:
+        """Return a session that records the requests it forwards to `session`."""
+        return RecordingSession(session, self)
+
+    def fixture(self) -> dict[str, Any]:
+        """Return the recording as a fixture."""
+        return {
+            "version": FIXTURE_VERSION,
+            "recorded": self.started.isoformat(),
+            "requests": self.records,
+        }
+
+    def write(self, path: str) -> str:
+        """Write the fixture to `path` and return the path.
+
+        This does blocking I/O, so run it in an executor.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.fixture(), file)
+        return path
+
+
+class RecordingSession:
+    """Session wrapper reading each response in full and recording it."""
+
+    def __init__(self, session: ClientSession, recorder: RequestRecorder) -> None:
+        """Initialize the wrapper."""
+        self.session = session
+        self._recorder = recorder
+
+    def request(self, method: str, url: str, **kwargs) -> _ResponseContext:
+        """Send a request like aiohttp.ClientSession.request."""
+        return _ResponseContext(self._record(method, url, **kwargs))
+
+    async def _record(self, method: str, url: str, **kwargs) -> ReplayResponse:
+        from aiohttp import ClientError
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        record = {
+            "time": self._recorder.offset(started),
+            "method": method,
+            "path": urlsplit(url).path,
+            "request": _request_body(kwargs),
+        }
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                status = response.status
+                content = await response.read()
+        except ClientError as err:
+            record.update(
+                latency=round(loop.time() - started, 3),
+                error=f"{type(err).__name__}: {err}",
+            )
+            self._recorder.records.append(record)
+            raise
+
+        record.update(
+            latency=round(loop.time() - started, 3), status=status, size=len(content)
+        )
+        try:
+            record["body"] = redact(json.loads(content))
+        except ValueError:
+            record["text"] = content.decode(errors="replace")
+        self._recorder.records.append(record)
+        return ReplayResponse(method, url, status, content)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+class ReplaySession:
+    """Serve recorded responses in place of an aiohttp session.
+
+    Requests are matched by method and path. A request with a body, such as
+    the item parameters of one item, gets the response recorded for the same
+    (redacted) body if there is one. Everything else is served in recorded
+    order, repeating the last response once a path's recording runs out.
+    Each response is delayed by its recorded latency divided by `speed`;
+    `speed=0` serves responses immediately.
+    """
+
+    def __init__(self, fixture: dict[str, Any], speed: float = 1.0) -> None:
+        """Initialize the session from a fixture."""
+        if fixture.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"Unsupported fixture version {fixture.get('version')}")
+        self.speed = speed
+        self.served = 0
+        self._records: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        for record in fixture["requests"]:
+            # Re-encode now, so decoding costs what it did against the API
+            if "body" in record:
+                record = {**record, "content": json.dumps(record["body"]).encode()}
+            elif "text" in record:
+                record = {**record, "content": record["text"].encode()}
+            self._records.setdefault((record["method"], record["path"]), []).append(
+                record
+            )
+
+    @classmethod
+    def load(cls, path: str, speed: float = 1.0) -> ReplaySession:
+        """Create a session from a fixture file."""
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file), speed)
+
+    def request(self, method: str, url: str, **kwargs) -> _ResponseContext:
+        """Handle a request like aiohttp.ClientSession.request."""
+        return _ResponseContext(self._replay(method, url, **kwargs))
+
+    def _match(self, method: str, path: str, body: Any) -> dict[str, Any] | None:
+        """Return the recorded request to answer with."""
+        key = (method, path)
+        if not (records := self._records.get(key)):
+            return None
+        if body is not None:
+            for record in records:
+                if record["request"] == body:
+                    return record
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = min(cursor + 1, len(records) - 1)
+        return records[cursor]
+
+    async def _replay(self, method: str, url: str, **kwargs) -> ReplayResponse:
+        from aiohttp import ClientConnectionError
+
+        path = urlsplit(url).path
+        record = self._match(method, path, _request_body(kwargs))
+        if record is None:
+            return ReplayResponse(method, url, 404, b'{"Message": "Not recorded"}')
+
+        if self.speed and record["latency"]:
+            await asyncio.sleep(record["latency"] / self.speed)
+        self.served += 1
+        if "error" in record:
+            raise ClientConnectionError(record["error"])
+        return ReplayResponse(method, url, record["status"], record["content"])
+
+    async def close(self) -> None:
+        """Do nothing, there is no connection to close."""
@@ -12,26 +12,47 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
     UnitOfElectricCurrent,
-    UnitOfElectricPotential,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfPower,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
-    ATTR_FIRMWARE,
-    ATTR_ITEM_ID,
-    ATTR_ITEM_NAME,
-    ATTR_SIGNAL_STRENGTH,
-    ATTR_TIMESTAMP,
+    ATTR_DATA_AGE,
+    DEADBAND_GROUPS,
     DOMAIN,
+    FOOTPRINT_INTERVAL,
+    PEAK_COUNT,
 )
+from .deadband import Deadband, StateFilter
+from .footprint import account_footprint, item_footprint
+from .metrics import METRIC_DESCRIPTIONS, PHASES, PerificMetricDescription
 
 _LOGGER = logging.getLogger(__name__)
 
+# Optional sensors parsed from the aggregated packets: (metric, period)
+ENVELOPE_SENSORS = (
+    ("current_min", "minute"),
+    ("current_max", "minute"),
+    ("current_min", "hour"),
+    ("current_max", "hour"),
+    ("current_peak", "hour"),
+    ("current_min", "day"),
+    ("current_max", "day"),
+    ("current_peak", "day"),
+    ("energy_imported", "day"),
+    ("energy_exported", "day"),
+)
+PERIOD_NAMES = {"minute": "Minute", "hour": "Hour", "day": "Today"}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -39,51 +60,84 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Perific sensor platform."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-
     entities = []
-
-    # Create sensors for each item
-    for item_id, item_data in coordinator.data.get("items", {}).items():
-        item_info = item_data["info"]
-        item_name = item_info.get("name", f"Item {item_id}")
-
-        # Power sensors
-        entities.extend(
-            [
-                PerificPowerSensor(coordinator, item_id, item_name, "total"),
-                PerificPowerSensor(coordinator, item_id, item_name, "l1"),
-                PerificPowerSensor(coordinator, item_id, item_name, "l2"),
-                PerificPowerSensor(coordinator, item_id, item_name, "l3"),
-            ]
-        )
-
-        # Voltage sensors
-        entities.extend(
-            [
-                PerificVoltageSensor(coordinator, item_id, item_name, "l1"),
-                PerificVoltageSensor(coordinator, item_id, item_name, "l2"),
-                PerificVoltageSensor(coordinator, item_id, item_name, "l3"),
-            ]
-        )
-
-        # Current sensors
-        entities.extend(
-            [
-                PerificCurrentSensor(coordinator, item_id, item_name, "l1"),
-                PerificCurrentSensor(coordinator, item_id, item_name, "l2"),
-                PerificCurrentSensor(coordinator, item_id, item_name, "l3"),
-            ]
-        )
-
-        # Energy sensors
-        entities.extend(
-            [
-                PerificEnergySensor(coordinator, item_id, item_name, "imported"),
-                PerificEnergySensor(coordinator, item_id, item_name, "exported"),
-                PerificEnergySensor(coordinator, item_id, item_name, "net"),
-            ]
-        )
+    deadbands = {
+        group: Deadband.from_options(entry.options, group) for group in DEADBAND_GROUPS
+    }
+
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    entities.append(PerificAccountMemorySensor(entry, entry_data))
+
+    # Create sensors for each item of each shard
+    for coordinator in entry_data["coordinators"]:
+        for item_id, item_data in coordinator.data.get("items", {}).items():
+            item_info = item_data["info"]
+            item_name = item_info.get("name", f"Item {item_id}")
+
+            # Power, voltage, current and derived phase sensors
+            entities.extend(
+                PerificMetricSensor(
+                    coordinator,
+                    item_id,
+                    item_name,
+                    description,
+                    deadbands.get(description.deadband_group),
+                )
+                for description in METRIC_DESCRIPTIONS
+            )
+
+            # Energy sensors
+            entities.extend(
+                [
+                    PerificEnergySensor(coordinator, item_id, item_name, "imported"),
+                    PerificEnergySensor(coordinator, item_id, item_name, "exported"),
+                    PerificEnergySensor(coordinator, item_id, item_name, "net"),
+                ]
+            )
+
+            # Diagnostic sensors
+            entities.extend(
+                [
+                    PerificSignalStrengthSensor(coordinator, item_id, item_name),
+                    PerificLastReadingSensor(coordinator, item_id, item_name),
+                    PerificMemorySensor(coordinator, item_id, item_name),
+                ]
+            )
+
+            # Projected imported energy for power tariff management
+            entities.extend(
+                [
+                    PerificForecastSensor(
+                        coordinator, item_id, item_name, "current_hour"
+                    ),
+                    PerificForecastSensor(coordinator, item_id, item_name, "next_hour"),
+                ]
+            )
+
+            # Monthly peak hours for power tariffs
+            entities.append(PerificPeakSensor(coordinator, item_id, item_name, None))
+            entities.extend(
+                PerificPeakSensor(coordinator, item_id, item_name, rank)
+                for rank in range(1, PEAK_COUNT + 1)
+            )
+
+            # Current left below the mains fuse, for EV charger load balancing
+            if "fuse" in item_data:
+                entities.extend(
+                    PerificHeadroomSensor(
+                        coordinator, item_id, item_name, phase, deadbands["current"]
+                    )
+                    for phase in PHASES
+                )
+
+            # Current envelope and per-phase energy sensors (disabled by default)
+            entities.extend(
+                PerificEnvelopeSensor(
+                    coordinator, item_id, item_name, metric, period, phase
+                )
+                for metric, period in ENVELOPE_SENSORS
+                for phase in PHASES
+            )
 
     async_add_entities(entities)
 
@@ -91,6 +145,15 @@ async def async_setup_entry(
 class PerificSensorEntity(CoordinatorEntity, SensorEntity):
     """Base class for Perific sensor entities."""
 
+    # Changes on every update, keep it out of the recorder
+    _unrecorded_attributes = frozenset({ATTR_DATA_AGE})
+
+    # Set by sensors whose small changes are not worth a state write
+    _state_filter: StateFilter | None = None
+
+    # Item data revision and availability of the last dispatched update
+    _dispatched: tuple[int | None, bool] | None = None
+
     def __init__(
         self,
         coordinator,
@@ -130,135 +193,406 @@ class PerificSensorEntity(CoordinatorEntity, SensorEntity):
         }
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional state attributes."""
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional state attributes, built once per update."""
         item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
-        power_data = item_data.get("power", {})
+        return item_data.get("attributes")
 
-        attrs = {
-            ATTR_ITEM_ID: self._item_id,
-            ATTR_ITEM_NAME: self._item_name,
-        }
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, unless the item or the value did not change.
+
+        Burst cycles only update the data of bursting items, the other
+        items' entities skip the update.
+        """
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id) or {}
+        revision = item_data.get("revision")
+        dispatched = self._dispatched
+        self._dispatched = (revision, self.available)
+        if revision is not None and dispatched == self._dispatched:
+            return
+
+        if self._state_filter is not None and not self._state_filter.should_write(
+            self._attr_native_value, self.available, dt_util.utcnow()
+        ):
+            return
 
-        if power_data.get("timestamp"):
-            attrs[ATTR_TIMESTAMP] = power_data["timestamp"]
-        if power_data.get("firmware"):
-            attrs[ATTR_FIRMWARE] = power_data["firmware"]
-        if power_data.get("signal_strength"):
-            attrs[ATTR_SIGNAL_STRENGTH] = power_data["signal_strength"]
+        super()._handle_coordinator_update()
 
-        return attrs
 
+class PerificMetricSensor(PerificSensorEntity):
+    """Representation of a sensor reading a metric derived by the coordinator."""
 
-class PerificPowerSensor(PerificSensorEntity):
-    """Representation of a Perific power sensor."""
+    entity_description: PerificMetricDescription
 
-    def __init__(self, coordinator, item_id: int, item_name: str, phase: str) -> None:
-        """Initialize the power sensor."""
-        super().__init__(coordinator, item_id, item_name, "power", phase)
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
+    def __init__(
+        self,
+        coordinator,
+        item_id: int,
+        item_name: str,
+        description: PerificMetricDescription,
+        deadband: Deadband | None = None,
+    ) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(
+            coordinator, item_id, item_name, description.sensor_type, description.phase
+        )
+        self.entity_description = description
+        if deadband is not None:
+            self._state_filter = StateFilter(deadband)
+        self._attr_name = " ".join(
+            filter(
+                None,
+                (
+                    item_name,
+                    description.sensor_type.replace("_", " ").title(),
+                    description.phase and description.phase.upper(),
+                ),
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        self._attr_native_value = item_data.get("metrics", {}).get(
+            self.entity_description.key
+        )
+
+        super()._handle_coordinator_update()
+
+
+class PerificEnergySensor(PerificSensorEntity):
+    """Representation of a Perific energy sensor."""
+
+    def __init__(
+        self, coordinator, item_id: int, item_name: str, energy_type: str
+    ) -> None:
+        """Initialize the energy sensor."""
+        super().__init__(coordinator, item_id, item_name, f"energy_{energy_type}")
+        self._energy_type = energy_type
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
-        power_data = item_data.get("power", {})
 
-        if power_data:
-            power = power_data.get("power", {})
-            if self._phase == "total":
-                self._attr_native_value = power.get("total")
+        if self._energy_type in ["imported", "exported", "net"]:
+            energy_data = item_data.get("energy_today", {})
+            self._attr_native_value = energy_data.get(self._energy_type, 0)
+        else:
+            # For total energy, use the imported/exported from power data
+            power_data = item_data.get("power", {})
+            if self._energy_type == "imported_total":
+                self._attr_native_value = power_data.get("imported_energy", 0)
+            elif self._energy_type == "exported_total":
+                self._attr_native_value = power_data.get("exported_energy", 0)
             else:
-                self._attr_native_value = power.get(self._phase)
+                self._attr_native_value = None
+
+        super()._handle_coordinator_update()
+
+
+class PerificEnvelopeSensor(PerificSensorEntity):
+    """Representation of a per-phase min/max current or energy sensor."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator,
+        item_id: int,
+        item_name: str,
+        metric: str,
+        period: str,
+        phase: str,
+    ) -> None:
+        """Initialize the envelope sensor."""
+        super().__init__(coordinator, item_id, item_name, f"{metric}_{period}", phase)
+        self._metric = metric
+        self._period = period
+        self._attr_name = (
+            f"{item_name} {metric.replace('_', ' ').title()} "
+            f"{PERIOD_NAMES[period]} {phase.upper()}"
+        )
+
+        if metric.startswith("energy"):
+            self._attr_device_class = SensorDeviceClass.ENERGY
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+            self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         else:
-            self._attr_native_value = None
+            self._attr_device_class = SensorDeviceClass.CURRENT
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+            self._attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        values = item_data.get("envelope", {}).get(self._period, {})
+        self._attr_native_value = values.get(self._metric, {}).get(self._phase)
 
         super()._handle_coordinator_update()
 
 
-class PerificVoltageSensor(PerificSensorEntity):
-    """Representation of a Perific voltage sensor."""
+class PerificSignalStrengthSensor(PerificSensorEntity):
+    """Representation of a Perific meter's signal strength."""
 
-    def __init__(self, coordinator, item_id: int, item_name: str, phase: str) -> None:
-        """Initialize the voltage sensor."""
-        super().__init__(coordinator, item_id, item_name, "voltage", phase)
-        self._attr_device_class = SensorDeviceClass.VOLTAGE
+    def __init__(self, coordinator, item_id: int, item_name: str) -> None:
+        """Initialize the signal strength sensor."""
+        super().__init__(coordinator, item_id, item_name, "signal_strength")
+        self._attr_name = f"{item_name} Signal Strength"
+        self._attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
+        self._attr_native_unit_of_measurement = SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
-        power_data = item_data.get("power", {})
+        self._attr_native_value = item_data.get("power", {}).get("signal_strength")
+
+        super()._handle_coordinator_update()
+
 
-        if power_data:
-            voltage = power_data.get("voltage", {})
-            self._attr_native_value = voltage.get(self._phase)
+class PerificLastReadingSensor(PerificSensorEntity):
+    """Representation of the time of a Perific meter's latest reading."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, item_id: int, item_name: str) -> None:
+        """Initialize the last reading sensor."""
+        super().__init__(coordinator, item_id, item_name, "last_reading")
+        self._attr_name = f"{item_name} Last Reading"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        timestamp = item_data.get("power", {}).get("timestamp")
+        self._attr_native_value = (
+            dt_util.parse_datetime(timestamp) if timestamp else None
+        )
+
+        super()._handle_coordinator_update()
+
+
+class PerificMemorySensor(PerificSensorEntity):
+    """Representation of the approximate memory held for a Perific meter."""
+
+    _attr_entity_registry_enabled_default = False
+
+    # Loop time of the last measurement and availability last written
+    _measured: float | None = None
+    _written_available: bool | None = None
+
+    def __init__(self, coordinator, item_id: int, item_name: str) -> None:
+        """Initialize the memory sensor."""
+        super().__init__(coordinator, item_id, item_name, "memory")
+        self._attr_name = f"{item_name} Memory"
+        self._attr_device_class = SensorDeviceClass.DATA_SIZE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfInformation.KIBIBYTES
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Measure the meter's footprint, at most every few minutes.
+
+        Changes of availability are written right away.
+        """
+        now = self.coordinator.hass.loop.time()
+        if (
+            self._measured is not None
+            and now - self._measured < FOOTPRINT_INTERVAL.total_seconds()
+        ):
+            if self.available == self._written_available:
+                return
         else:
-            self._attr_native_value = None
+            self._measured = now
+            self._attr_native_value = round(
+                item_footprint(self.coordinator, self._item_id) / 1024, 1
+            )
+        self._written_available = self.available
+
+        super()._handle_coordinator_update()
+
+
+class PerificForecastSensor(PerificSensorEntity):
+    """Representation of a projected hourly energy sensor."""
+
+    def __init__(self, coordinator, item_id: int, item_name: str, horizon: str) -> None:
+        """Initialize the forecast sensor."""
+        super().__init__(coordinator, item_id, item_name, f"forecast_{horizon}")
+        self._horizon = horizon
+        self._attr_name = (
+            f"{item_name} Projected Energy {horizon.replace('_', ' ').title()}"
+        )
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        self._attr_native_value = item_data.get("forecast", {}).get(self._horizon)
 
         super()._handle_coordinator_update()
 
 
-class PerificCurrentSensor(PerificSensorEntity):
-    """Representation of a Perific current sensor."""
+class PerificHeadroomSensor(PerificSensorEntity):
+    """Representation of the current available below the mains fuse."""
 
-    def __init__(self, coordinator, item_id: int, item_name: str, phase: str) -> None:
-        """Initialize the current sensor."""
-        super().__init__(coordinator, item_id, item_name, "current", phase)
+    def __init__(
+        self,
+        coordinator,
+        item_id: int,
+        item_name: str,
+        phase: str,
+        deadband: Deadband | None = None,
+    ) -> None:
+        """Initialize the headroom sensor."""
+        super().__init__(coordinator, item_id, item_name, "available_current", phase)
+        if deadband is not None:
+            self._state_filter = StateFilter(deadband)
+        self._attr_name = f"{item_name} Available Current {phase.upper()}"
         self._attr_device_class = SensorDeviceClass.CURRENT
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the fuse levels with the shared attributes."""
+        attrs = super().extra_state_attributes
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        if not (fuse := item_data.get("fuse")):
+            return attrs
+        return {**(attrs or {}), **fuse}
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
-        power_data = item_data.get("power", {})
-
-        if power_data:
-            current = power_data.get("current", {})
-            self._attr_native_value = abs(
-                current.get(self._phase, 0)
-            )  # Use absolute value
-        else:
-            self._attr_native_value = None
+        self._attr_native_value = item_data.get("headroom", {}).get(self._phase)
 
         super()._handle_coordinator_update()
 
 
-class PerificEnergySensor(PerificSensorEntity):
-    """Representation of a Perific energy sensor."""
+class PerificPeakSensor(PerificSensorEntity):
+    """Representation of a monthly peak hour, or the average of the peaks."""
 
     def __init__(
-        self, coordinator, item_id: int, item_name: str, energy_type: str
+        self, coordinator, item_id: int, item_name: str, rank: int | None
     ) -> None:
-        """Initialize the energy sensor."""
-        super().__init__(coordinator, item_id, item_name, f"energy_{energy_type}")
-        self._energy_type = energy_type
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+        """Initialize the peak sensor."""
+        sensor_type = "peak_average" if rank is None else f"peak_{rank}"
+        super().__init__(coordinator, item_id, item_name, sensor_type)
+        self._rank = rank
+        self._attr_name = (
+            f"{item_name} Peak Hour Average"
+            if rank is None
+            else f"{item_name} Peak Hour {rank}"
+        )
+        self._attr_device_class = SensorDeviceClass.POWER
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfPower.KILO_WATT
+        if rank is not None:
+            self._attr_entity_registry_enabled_default = False
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the peak hours with the shared attributes."""
+        attrs = super().extra_state_attributes
+        item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        peaks = item_data.get("peaks", {})
+        if not peaks:
+            return attrs
+        if self._rank is None:
+            extra = {"month": peaks["month"], "peaks": peaks["peaks"]}
+        elif self._rank <= len(peaks["peaks"]):
+            extra = {"start": peaks["peaks"][self._rank - 1]["start"]}
+        else:
+            return attrs
+        return {**(attrs or {}), **extra}
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         item_data = self.coordinator.data.get("items", {}).get(self._item_id, {})
+        peaks = item_data.get("peaks", {})
+        if not peaks:
+            self._attr_native_value = None
+        elif self._rank is None:
+            # An hour's energy in kWh is its average power in kW
+            self._attr_native_value = peaks["average"]
+        elif self._rank <= len(peaks["peaks"]):
+            self._attr_native_value = peaks["peaks"][self._rank - 1]["energy"]
+        else:
+            self._attr_native_value = None
 
-        if self._energy_type in ["imported", "exported", "net"]:
-            energy_data = item_data.get("energy_today", {})
-            self._attr_native_value = energy_data.get(self._energy_type, 0)
+        super()._handle_coordinator_update()
+
+
+class PerificAccountMemorySensor(CoordinatorEntity, SensorEntity):
+    """Representation of the approximate memory held for a Perific account.
+
+    The state covers every shard of the account, the attributes break it down
+    in bytes. It is updated along with the account's first coordinator.
+    """
+
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.KIBIBYTES
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    # Loop time of the last measurement and availability last written
+    _measured: float | None = None
+    _written_available: bool | None = None
+
+    def __init__(self, entry: ConfigEntry, entry_data: dict[str, Any]) -> None:
+        """Initialize the account memory sensor."""
+        super().__init__(entry_data["coordinators"][0])
+        self._entry_data = entry_data
+        self._attr_unique_id = f"{entry.entry_id}_memory"
+        self._attr_name = f"{entry.title} Memory"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Perific/Enegic",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Measure the account's footprint, at most every few minutes.
+
+        Changes of availability are written right away.
+        """
+        now = self.coordinator.hass.loop.time()
+        if (
+            self._measured is not None
+            and now - self._measured < FOOTPRINT_INTERVAL.total_seconds()
+        ):
+            if self.available == self._written_available:
+                return
         else:
-            # For total energy, use the imported/exported from power data
-            power_data = item_data.get("power", {})
-            if self._energy_type == "imported_total":
-                self._attr_native_value = power_data.get("imported_energy", 0)
-            elif self._energy_type == "exported_total":
-                self._attr_native_value = power_data.get("exported_energy", 0)
-            else:
-                self._attr_native_value = None
+            self._measured = now
+            footprint = account_footprint(self._entry_data)
+            self._attr_native_value = round(footprint["total"] / 1024, 1)
+            self._attr_extra_state_attributes = {
+                "items": sum(
+                    len((coordinator.data or {}).get("items", {}))
+                    for coordinator in self._entry_data["coordinators"]
+                ),
+                **{f"{part}_bytes": size for part, size in footprint.items()},
+            }
+        self._written_available = self.available
 
         super()._handle_coordinator_update()
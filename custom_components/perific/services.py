@@ -0,0 +1,197 @@
+"""Services for the Perific integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BURST_DURATION,
+    BURST_INTERVAL,
+    BURST_MAX_DURATION,
+    BURST_MIN_INTERVAL,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_RECORD_DURATION,
+    DOMAIN,
+    SCAN_INTERVAL_POWER,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_REQUESTS,
+    SERVICE_SET_BURST_MODE,
+)
+from .profiler import PROFILE_MODES, CycleProfiler
+from .replay import RequestRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("mode", default="timing"): vol.In(PROFILE_MODES),
+        vol.Optional("cycles", default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+SET_BURST_MODE_SCHEMA = vol.Schema(
+    {
+        vol.Required("item_id"): vol.Coerce(int),
+        vol.Optional("duration", default=BURST_DURATION.total_seconds()): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=0, max=BURST_MAX_DURATION.total_seconds()),
+        ),
+        vol.Optional("interval", default=BURST_INTERVAL.total_seconds()): vol.All(
+            vol.Coerce(float),
+            vol.Range(
+                min=BURST_MIN_INTERVAL.total_seconds(),
+                max=SCAN_INTERVAL_POWER.total_seconds(),
+            ),
+        ),
+    }
+)
+
+RECORD_REQUESTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=DEFAULT_RECORD_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=10, max=3600)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next cycles of every coordinator."""
+        coordinators = {
+            coordinator: f"{entry_id}/{index}"
+            for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+            for index, coordinator in enumerate(entry_data["coordinators"])
+        }
+        if not coordinators:
+            _LOGGER.warning("No Perific coordinators to profile")
+            return
+        if any(coordinator.profiler for coordinator in coordinators):
+            raise ServiceValidationError(
+                "Perific coordinators are already being profiled"
+            )
+
+        cycles = call.data["cycles"]
+        timestamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+        profiler = CycleProfiler(
+            call.data["mode"],
+            cycles,
+            coordinators,
+            hass.config.path(f"{DOMAIN}_profile_{timestamp}"),
+        )
+        for coordinator in coordinators:
+            coordinator.profiler = profiler
+        hass.async_create_background_task(
+            _async_finish_profile(hass, profiler, cycles), f"{DOMAIN} profile"
+        )
+
+    async def async_set_burst_mode(call: ServiceCall) -> None:
+        """Poll one item faster for a while, or stop doing so."""
+        item_id = call.data["item_id"]
+        coordinators = [
+            coordinator
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+            for coordinator in entry_data["coordinators"]
+            if item_id in (coordinator.data or {}).get("items", {})
+        ]
+        if not coordinators:
+            raise ServiceValidationError(f"No Perific meter with item ID {item_id}")
+        for coordinator in coordinators:
+            coordinator.async_set_burst(
+                item_id, call.data["duration"], call.data["interval"]
+            )
+
+    async def async_record_requests(call: ServiceCall) -> None:
+        """Record the API requests of every entry for a while."""
+        apis = [entry_data["api"] for entry_data in hass.data.get(DOMAIN, {}).values()]
+        if not apis:
+            _LOGGER.warning("No Perific API clients to record")
+            return
+        if any(api.recording for api in apis):
+            raise ServiceValidationError("Perific requests are already being recorded")
+
+        recorder = RequestRecorder()
+        for api in apis:
+            await api.async_record(recorder)
+        hass.async_create_background_task(
+            _async_finish_recording(hass, recorder, apis, call.data["duration"]),
+            f"{DOMAIN} record requests",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_REQUESTS,
+        async_record_requests,
+        schema=RECORD_REQUESTS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_BURST_MODE,
+        async_set_burst_mode,
+        schema=SET_BURST_MODE_SCHEMA,
+    )
+
+
+async def _async_finish_profile(
+    hass: HomeAssistant, profiler: CycleProfiler, cycles: int
+) -> None:
+    """Write the report once the cycles ran, or after they took too long."""
+    timeout = (cycles + 2) * SCAN_INTERVAL_POWER.total_seconds() * 2
+    try:
+        async with asyncio.timeout(timeout):
+            await profiler.finished.wait()
+    except TimeoutError:
+        _LOGGER.warning("Profiling timed out, writing the cycles captured so far")
+    finally:
+        for entry_data in hass.data.get(DOMAIN, {}).values():
+            for coordinator in entry_data["coordinators"]:
+                if coordinator.profiler is profiler:
+                    coordinator.profiler = None
+
+    path = await hass.async_add_executor_job(profiler.write)
+    _LOGGER.info("Perific profile written to %s", path)
+    persistent_notification.async_create(
+        hass,
+        f"The {profiler.mode} profile of {len(profiler.traces)} Perific "
+        f"coordinator cycles was written to `{path}`.",
+        title="Perific profile",
+        notification_id=f"{DOMAIN}_profile",
+    )
+
+
+async def _async_finish_recording(
+    hass: HomeAssistant, recorder: RequestRecorder, apis: list, duration: float
+) -> None:
+    """Stop recording after `duration` seconds and write the fixture."""
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        for api in apis:
+            await api.async_record(None)
+
+    timestamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+    path = await hass.async_add_executor_job(
+        recorder.write, hass.config.path(f"{DOMAIN}_requests_{timestamp}.json")
+    )
+    _LOGGER.info("Perific requests recorded to %s", path)
+    persistent_notification.async_create(
+        hass,
+        f"{len(recorder.records)} Perific API requests were recorded to `{path}`, "
+        "with credentials and personal details redacted.",
+        title="Perific recording",
+        notification_id=f"{DOMAIN}_record_requests",
+    )
@@ -0,0 +1,115 @@
+"""Recorder statistics for Perific/Enegic energy meters."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import HomeAssistant, callback
+
+from .backfill import floor_hour
+from .const import DOMAIN
+
+
+def power_statistic_id(item_id: int) -> str:
+    """Return the external statistic id for an item's power."""
+    return f"{DOMAIN}:power_{item_id}"
+
+
+def energy_statistic_id(item_id: int, direction: str) -> str:
+    """Return the external statistic id for an item's imported/exported energy."""
+    return f"{DOMAIN}:energy_{direction}_{item_id}"
+
+
+def hour_energy_statistics(
+    packet: dict[str, Any], received: datetime
+) -> dict[str, dict[str, Any]]:
+    """Return the imported/exported energy statistics of a PhaseHour packet.
+
+    The meter sends the hourly packet when an hour ends, carrying its
+    cumulative hwi/hwo counters at that moment. Unlike PhaseRealTime, the
+    packet has no timestamp, so a new packet closes the hour before the one
+    it was `received` in. The counters are both the state and the sum of
+    that hour.
+    """
+    data = packet.get("data", {})
+    if data.get("hwi") is None or data.get("hwo") is None:
+        return {}
+
+    start = floor_hour(received) - timedelta(hours=1)
+    return {
+        "imported": {"start": start, "state": data["hwi"], "sum": data["hwi"]},
+        "exported": {"start": start, "state": data["hwo"], "sum": data["hwo"]},
+    }
+
+
+@callback
+def _async_add_statistics(
+    hass: HomeAssistant,
+    statistic_id: str,
+    name: str,
+    unit: str,
+    statistics: list[dict[str, Any]],
+    has_sum: bool = False,
+) -> None:
+    """Add external statistics if the recorder is running."""
+    if not statistics or "recorder" not in hass.config.components:
+        return
+
+    # Recorder is only imported once it is known to be loaded
+    from homeassistant.components.recorder.models import (
+        StatisticData,
+        StatisticMetaData,
+    )
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+    )
+
+    metadata = StatisticMetaData(
+        has_mean=not has_sum,
+        has_sum=has_sum,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=unit,
+    )
+    async_add_external_statistics(
+        hass, metadata, [StatisticData(**stat) for stat in statistics]
+    )
+
+
+@callback
+def async_import_power_statistics(
+    hass: HomeAssistant,
+    item_id: int,
+    item_name: str,
+    statistics: list[dict[str, Any]],
+) -> None:
+    """Import hourly mean/min/max power statistics for an item."""
+    _async_add_statistics(
+        hass,
+        power_statistic_id(item_id),
+        f"{item_name} Power",
+        UnitOfPower.WATT,
+        statistics,
+    )
+
+
+@callback
+def async_import_energy_statistics(
+    hass: HomeAssistant,
+    item_id: int,
+    item_name: str,
+    statistics: dict[str, dict[str, Any]],
+) -> None:
+    """Import one hour of imported/exported energy statistics for an item."""
+    for direction, stat in statistics.items():
+        _async_add_statistics(
+            hass,
+            energy_statistic_id(item_id, direction),
+            f"{item_name} Energy {direction.title()}",
+            UnitOfEnergy.KILO_WATT_HOUR,
+            [stat],
+            has_sum=True,
+        )
@@ -0,0 +1,116 @@
+"""Per-phase current thresholds for Perific/Enegic energy meters."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .const import DEFAULT_THRESHOLD_HYSTERESIS
+
+PHASES = ("l1", "l2", "l3")
+
+# Per-phase values a threshold can watch, from signed currents (import < 0)
+METRICS = {
+    "current": abs,
+    "import_current": lambda current: max(-current, 0.0),
+    "export_current": lambda current: max(current, 0.0),
+}
+
+
+@dataclass(frozen=True)
+class Threshold:
+    """A level on one metric, for one or every item and phase.
+
+    The threshold is crossed upwards when the value reaches `level` and
+    downwards when it falls to `level - hysteresis` again. An upward crossing
+    of a threshold with a `burst` duration also polls the item faster for
+    that many seconds.
+    """
+
+    metric: str
+    level: float
+    hysteresis: float = DEFAULT_THRESHOLD_HYSTERESIS
+    item_id: int | None = None
+    phase: str | None = None
+    burst: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Threshold:
+        """Create a threshold from its stored options."""
+        return cls(
+            metric=data["metric"],
+            level=float(data["level"]),
+            hysteresis=float(data.get("hysteresis", DEFAULT_THRESHOLD_HYSTERESIS)),
+            item_id=int(data["item_id"]) if data.get("item_id") else None,
+            phase=data.get("phase") or None,
+            burst=float(data.get("burst", 0.0)),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the threshold as stored in the options."""
+        return asdict(self)
+
+    def label(self, item_names: dict[int, str] | None = None) -> str:
+        """Return a short description for the options flow."""
+        item = "all items"
+        if self.item_id is not None:
+            item = (item_names or {}).get(self.item_id, str(self.item_id))
+        phase = self.phase.upper() if self.phase else "any phase"
+        burst = f", burst {self.burst:g} s" if self.burst else ""
+        return (
+            f"{item} {phase}: {self.metric.replace('_', ' ')} "
+            f"≥ {self.level:g} A (hysteresis {self.hysteresis:g} A{burst})"
+        )
+
+
+class ThresholdMonitor:
+    """Detect threshold crossings in each poll's phase currents.
+
+    Only the armed state of every (threshold, item, phase) is kept, so an
+    evaluation is a few comparisons per item and reports nothing while the
+    values stay on the same side of a threshold.
+    """
+
+    def __init__(self, thresholds: Iterable[Threshold] = ()) -> None:
+        """Initialize the monitor."""
+        self.thresholds = tuple(thresholds)
+        self._above: set[tuple[int, int, str]] = set()
+
+    def evaluate(
+        self, item_id: int, current: dict[str, float] | None
+    ) -> list[dict[str, Any]]:
+        """Return the crossings of an item's latest signed phase currents."""
+        if not self.thresholds or not current:
+            return []
+
+        crossings = []
+        for index, threshold in enumerate(self.thresholds):
+            if threshold.item_id is not None and threshold.item_id != item_id:
+                continue
+            for phase in (threshold.phase,) if threshold.phase else PHASES:
+                if (raw := current.get(phase)) is None:
+                    continue
+                value = METRICS[threshold.metric](raw)
+                key = (index, item_id, phase)
+                if key not in self._above and value >= threshold.level:
+                    self._above.add(key)
+                    state = "above"
+                elif key in self._above and (
+                    value <= threshold.level - threshold.hysteresis
+                ):
+                    self._above.discard(key)
+                    state = "below"
+                else:
+                    continue
+                crossings.append(
+                    {
+                        **threshold.as_dict(),
+                        "item_id": item_id,
+                        "phase": phase,
+                        "state": state,
+                        "value": value,
+                        "current": raw,
+                    }
+                )
+        return crossings
@@ -0,0 +1,178 @@
+"""Sampled structured tracing of Perific/Enegic API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from .const import TRACE_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    from aiohttp import TraceConfig
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestTrace:
+    """Timings and sizes of one sampled request."""
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "started",
+        "time",
+        "status",
+        "request_bytes",
+        "response_bytes",
+        "dns_ms",
+        "connect_ms",
+        "limiter_ms",
+        "ttfb_ms",
+        "total_ms",
+        "reused_connection",
+        "error",
+        "_marks",
+    )
+
+    def __init__(self, method: str, url: str, started: float) -> None:
+        """Start a trace at loop time `started`."""
+        self.method = method
+        self.endpoint = urlsplit(url).path
+        self.started = started
+        self.time = datetime.now(timezone.utc).isoformat()
+        self.status: int | None = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.dns_ms: float | None = None
+        self.connect_ms: float | None = None
+        self.limiter_ms: float | None = None
+        self.ttfb_ms: float | None = None
+        self.total_ms: float | None = None
+        self.reused_connection: bool | None = None
+        self.error: str | None = None
+        self._marks: dict[str, float] = {}
+
+    def _elapsed(self, since: float) -> float:
+        return round((asyncio.get_running_loop().time() - since) * 1000, 3)
+
+    def dequeued(self) -> None:
+        """Mark the end of the rate limiter wait and the start of the request."""
+        self.limiter_ms = self._elapsed(self.started)
+        self._marks["request"] = asyncio.get_running_loop().time()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace record."""
+        return {
+            "type": "request",
+            **{slot: getattr(self, slot) for slot in self.__slots__ if slot[0] != "_"},
+        }
+
+
+class RequestTracer:
+    """Record a sample of API requests and cache lookups in a bounded buffer.
+
+    Request timings come from aiohttp trace signals, so they are only
+    available when the session was created with `trace_config()`. Without
+    one, sampled requests still record their status and total time.
+    """
+
+    def __init__(
+        self, sample_rate: float, buffer_size: int = TRACE_BUFFER_SIZE
+    ) -> None:
+        """Initialize the tracer."""
+        self.sample_rate = sample_rate
+        self.records: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+
+    def sample(self) -> bool:
+        """Return True for the share of calls to be traced."""
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def start(self, method: str, url: str) -> RequestTrace | None:
+        """Start tracing a request, if it is sampled."""
+        if not self.sample():
+            return None
+        return RequestTrace(method, url, asyncio.get_running_loop().time())
+
+    def finish(
+        self,
+        trace: RequestTrace,
+        status: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Complete a request trace and store it."""
+        trace.status = status
+        trace.total_ms = trace._elapsed(trace.started)
+        if error is not None:
+            trace.error = f"{type(error).__name__}: {error}"
+        record = trace.as_dict()
+        self.records.append(record)
+        _LOGGER.debug("API trace %s", record)
+
+    def cache_lookup(self, key: str, hit: bool, age: float) -> None:
+        """Record a snapshot cache lookup, if it is sampled."""
+        if not self.sample():
+            return
+        record = {
+            "type": "cache",
+            "time": datetime.now(timezone.utc).isoformat(),
+            "key": key,
+            "result": "hit" if hit else "miss",
+            "age_s": round(age, 3),
+        }
+        self.records.append(record)
+        _LOGGER.debug("API trace %s", record)
+
+    def trace_config(self) -> TraceConfig:
+        """Return an aiohttp trace config filling in sampled request traces."""
+        from aiohttp import TraceConfig
+
+        def handler(callback):
+            async def on_signal(session, context, params) -> None:
+                if isinstance(trace := context.trace_request_ctx, RequestTrace):
+                    callback(trace, params)
+
+            return on_signal
+
+        def mark(name):
+            return handler(
+                lambda trace, _: trace._marks.__setitem__(
+                    name, asyncio.get_running_loop().time()
+                )
+            )
+
+        def dns_end(trace, _):
+            trace.dns_ms = trace._elapsed(trace._marks.get("dns", trace.started))
+
+        def connect_end(trace, _):
+            trace.reused_connection = False
+            trace.connect_ms = trace._elapsed(
+                trace._marks.get("connect", trace.started)
+            )
+
+        def reuse(trace, _):
+            trace.reused_connection = True
+
+        def headers(trace, _):
+            trace.ttfb_ms = trace._elapsed(trace._marks.get("request", trace.started))
+
+        def sent(trace, params):
+            trace.request_bytes += len(params.chunk)
+
+        def received(trace, params):
+            trace.response_bytes += len(params.chunk)
+
+        config = TraceConfig()
+        config.on_dns_resolvehost_start.append(mark("dns"))
+        config.on_dns_resolvehost_end.append(handler(dns_end))
+        config.on_connection_create_start.append(mark("connect"))
+        config.on_connection_create_end.append(handler(connect_end))
+        config.on_connection_reuseconn.append(handler(reuse))
+        config.on_request_end.append(handler(headers))
+        config.on_request_chunk_sent.append(handler(sent))
+        config.on_response_chunk_received.append(handler(received))
+        return config
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test gap detection and minute history."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.perific.backfill import GapDetector, MinuteHistory
+
+HOUR = datetime(2025, 7, 14, 16, 0, tzinfo=timezone.utc)
+
+
+def realtime(ts: datetime, seqno: int) -> dict:
+    """Build a PhaseRealTime packet."""
+    return {"ts": int(ts.timestamp() * 1000), "seqno": seqno, "data": {}}
+
+
+def test_gap_detection():
+    """Long pauses and seqno resets are reported as gaps."""
+    detector = GapDetector(threshold=timedelta(minutes=2))
+
+    # The first packet after a restart only seeds the detector
+    assert detector.observe(1, realtime(HOUR + timedelta(minutes=10), 100)) is None
+
+    # Regular polling and repeated packets are not gaps
+    assert detector.observe(1, realtime(HOUR + timedelta(minutes=11), 110)) is None
+    assert detector.observe(1, realtime(HOUR + timedelta(minutes=11), 110)) is None
+
+    gap = detector.observe(1, realtime(HOUR + timedelta(minutes=20), 200))
+    assert gap.start == HOUR + timedelta(minutes=11)
+    assert gap.end == HOUR + timedelta(minutes=20)
+
+    reset = detector.observe(1, realtime(HOUR + timedelta(minutes=21), 3))
+    assert reset is not None
+    print("✅ Gaps detected from ts and seqno")
+
+
+def test_minute_history():
+    """Backfilled records fill the history and hourly statistics."""
+    history = MinuteHistory(retention=timedelta(hours=2))
+    response = [
+        {
+            "dt": "2025-07-14T00:00:00",
+            "data": [
+                {
+                    "ts": (HOUR + timedelta(minutes=minute)).strftime(
+                        "%Y-%m-%dT%H:%M:%S"
+                    ),
+                    "data": {"hiavg": [-1.0, 0, 0], "huavg": [200.0 + minute, 0, 0]},
+                }
+                for minute in range(60)
+            ],
+        }
+    ]
+
+    hours = history.add_phase_records(1, response)
+    stats = history.hour_statistics(1, HOUR)
+
+    assert hours == {HOUR}
+    assert stats == {"start": HOUR, "mean": 229.5, "min": 200.0, "max": 259.0}
+    assert history.hour_statistics(1, HOUR + timedelta(hours=1)) is None
+
+    # Samples older than the retention are dropped
+    for minute in range(60, 60 * 5):
+        history.add(1, HOUR + timedelta(minutes=minute), 1.0)
+    assert not history.samples(1, HOUR, HOUR + timedelta(hours=1))
+    print("✅ Minute history fills hourly statistics and stays bounded")
+
+
+def test_minute_packets():
+    """Polled PhaseMinute packets without a timestamp fill the history."""
+    history = MinuteHistory()
+    # As documented for /getlatestpackets
+    packet = {
+        "data": {
+            "dv": 2,
+            "hiavg": [-5.66, -5.41, -6.16],
+            "himin": [-5.69, -5.49, -6.19],
+            "himax": [0, 0, 0],
+            "huavg": [237.3, 238.3, 240.4],
+            "hwi": 57142.768,
+            "hwo": 222.219,
+        }
+    }
+
+    # Polled twice a minute, each minute's packet holds the previous minute
+    for poll in range(1, 121):
+        history.add_packet(1, packet, HOUR + timedelta(seconds=30 * poll + 5))
+
+    samples = history.samples(1, HOUR, HOUR + timedelta(hours=1))
+    assert [minute for minute, _ in samples] == [
+        HOUR + timedelta(minutes=minute) for minute in range(60)
+    ]
+    stats = history.hour_statistics(1, HOUR)
+    assert stats["start"] == HOUR and round(stats["mean"], 3) == 4113.185
+    print(f"✅ {len(samples)} minutes from polled packets")
+
+
+if __name__ == "__main__":
+    test_gap_detection()
+    test_minute_history()
+    test_minute_packets()
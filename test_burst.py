@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Test burst polling of single items."""
+
+import asyncio
+from unittest.mock import patch
+
+from custom_components.perific.const import DOMAIN, SERVICE_SET_BURST_MODE
+from custom_components.perific.limiter import RequestLimiter, RequestPriority
+from custom_components.perific.services import async_setup_services
+from custom_components.perific.thresholds import Threshold, ThresholdMonitor
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+METERS = [
+    FakeMeter(DEFAULT_ITEM_ID, realtime_period=5.0),
+    FakeMeter(DEFAULT_ITEM_ID + 1, realtime_period=5.0),
+]
+
+
+def test_burst_expiry():
+    """Only the bursting item is refreshed faster, until the burst expires."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        updates = []
+        coordinator.async_add_listener(
+            lambda: updates.append(
+                {
+                    item_id: item_data["revision"]
+                    for item_id, item_data in coordinator.data["items"].items()
+                }
+            )
+        )
+
+        await sim.advance(minutes=5)
+        start = sim.time
+        before = sim.backend.count("/getlatestpackets", start - 300, start)
+        coordinator.async_set_burst(DEFAULT_ITEM_ID, 300, 10)
+        assert coordinator.bursts == {DEFAULT_ITEM_ID: 300.0}
+
+        await sim.advance(minutes=5)
+        during = sim.backend.count("/getlatestpackets", start, start + 300)
+        await sim.advance(minutes=5, seconds=1)
+        after = sim.backend.count("/getlatestpackets", start + 300, start + 600)
+        return before, during, after, updates, coordinator.bursts
+
+    before, during, after, updates, bursts = run_simulation(scenario, meters=METERS)
+
+    # The first regular refresh after the burst reuses its last response
+    assert (before, during, after) == (10, 30, 9)
+    readings = {
+        item_id: len({items[item_id] for items in updates})
+        for item_id in (DEFAULT_ITEM_ID, DEFAULT_ITEM_ID + 1)
+    }
+    # Burst cycles reuse the data of the other item as is, and so does the
+    # regular refresh reusing the last burst response for the bursting item
+    assert readings == {DEFAULT_ITEM_ID: 49, DEFAULT_ITEM_ID + 1: 30}
+    assert bursts == {}
+    print(f"✅ {before} → {during} → {after} requests per 5 minutes, {readings}")
+
+
+def test_limiter_cap():
+    """Burst cycles only use tokens the limiter holds beyond its bulk reserve."""
+
+    async def take_tokens():
+        limiter = RequestLimiter(rate=0.001, burst=5, bulk_reserve=3)
+        spare = [limiter.has_spare()]
+        for _ in range(2):
+            await limiter.acquire(RequestPriority.REALTIME)
+            spare.append(limiter.has_spare())
+        return spare
+
+    assert asyncio.run(take_tokens()) == [True, True, False]
+
+    async def scenario(sim):
+        api = await sim.async_create_api()
+        coordinator = await sim.async_start_coordinator(api=api)
+        await sim.advance(seconds=45)
+        start = sim.time
+        coordinator.async_set_burst(DEFAULT_ITEM_ID, 120, 5)
+        with patch.object(api, "has_spare_capacity", return_value=False):
+            await sim.advance(minutes=2)
+        return sim.backend.times("/getlatestpackets", since=start)
+
+    times = run_simulation(scenario, meters=METERS[:1])
+
+    assert times == [60.0, 90.0, 120.0, 150.0]
+    print(f"✅ Only regular requests {times} while the limiter was busy")
+
+
+def test_threshold_and_service():
+    """A threshold crossing starts a burst, the service changes or ends it."""
+
+    async def scenario(sim):
+        monitor = ThresholdMonitor([Threshold("import_current", 6.0, burst=120)])
+        coordinator = await sim.async_start_coordinator(thresholds=monitor)
+        triggered = coordinator.bursts
+
+        async_setup_services(sim.hass)
+        sim.hass.data[DOMAIN] = {"entry": {"coordinators": [coordinator]}}
+        await sim.hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_BURST_MODE,
+            {"item_id": DEFAULT_ITEM_ID, "duration": 3600},
+            blocking=True,
+        )
+        extended = coordinator.bursts
+        coordinator.async_set_burst(DEFAULT_ITEM_ID, 7200, 1)
+        clamped = coordinator.bursts
+        await sim.hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_BURST_MODE,
+            {"item_id": DEFAULT_ITEM_ID, "duration": 0},
+            blocking=True,
+        )
+        try:
+            await sim.hass.services.async_call(
+                DOMAIN, SERVICE_SET_BURST_MODE, {"item_id": 1}, blocking=True
+            )
+        except Exception as err:  # noqa: BLE001
+            unknown = type(err).__name__
+        return triggered, extended, clamped, coordinator.bursts, unknown
+
+    triggered, extended, clamped, ended, unknown = run_simulation(
+        scenario, meters=METERS[:1]
+    )
+
+    assert triggered == {DEFAULT_ITEM_ID: 120.0}
+    assert extended == clamped == {DEFAULT_ITEM_ID: 3600.0}
+    assert ended == {}
+    assert unknown == "ServiceValidationError"
+    print(f"✅ Threshold burst {triggered}, service clamps to {clamped}")
+
+
+if __name__ == "__main__":
+    test_burst_expiry()
+    test_limiter_cap()
+    test_threshold_and_service()
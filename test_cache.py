@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test the stale-while-revalidate snapshot cache."""
+
+import asyncio
+
+from custom_components.perific.cache import SnapshotCache
+
+
+class Source:
+    """Scripted fetch function."""
+
+    def __init__(self) -> None:
+        self.value = 0
+        self.delay = 0.0
+        self.fail = False
+
+    async def fetch(self):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("API down")
+        self.value += 1
+        return self.value
+
+
+def test_fresh_and_stale():
+    """Slow or failing fetches fall back to the last good snapshot."""
+
+    async def run():
+        cache = SnapshotCache(wait=0.05)
+        source = Source()
+        results = [await cache.get("packets", source.fetch)]
+
+        # Slow fetch: the cached value is served, the fetch keeps running
+        source.delay = 0.2
+        results.append(await cache.get("packets", source.fetch))
+        await asyncio.sleep(0.25)
+        source.delay = 0.0
+        results.append(await cache.get("packets", source.fetch))
+
+        # Failing fetch: the cached value is served with a growing age
+        source.fail = True
+        await asyncio.sleep(0.05)
+        results.append(await cache.get("packets", source.fetch))
+
+        await cache.close()
+        return results, (cache.hits, cache.misses, cache.errors)
+
+    results, counts = asyncio.run(run())
+    values = [value for value, _ in results]
+
+    assert values == [1, 1, 3, 3]
+    assert results[1][1] < 0.1
+    assert results[3][1] >= 0.05
+    assert counts == (2, 2, 1)
+    print(f"✅ Served values {values}, hits/misses/errors {counts}")
+
+
+def test_first_fetch_error():
+    """Without a snapshot the fetch error is raised."""
+
+    async def run():
+        cache = SnapshotCache(wait=0.05)
+        source = Source()
+        source.fail = True
+        try:
+            await cache.get("packets", source.fetch)
+        except RuntimeError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    print("✅ First fetch errors are raised")
+
+
+if __name__ == "__main__":
+    test_fresh_and_stale()
+    test_first_fetch_error()
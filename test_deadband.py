@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test deadband and heartbeat filtering of sensor state writes."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.perific.deadband import Deadband, StateFilter
+from custom_components.perific.metrics import METRIC_DESCRIPTIONS, evaluate_metrics
+from custom_components.perific.sensor import PerificMetricSensor
+
+START = datetime(2025, 7, 14, tzinfo=timezone.utc)
+
+
+def test_deadband_options():
+    """Each group reads its own options and is off unless configured."""
+    options = {
+        "voltage_deadband": 0.5,
+        "power_deadband_percent": 2.0,
+        "heartbeat": 300,
+    }
+
+    assert Deadband.from_options(options, "voltage") == Deadband(
+        0.5, 0.0, timedelta(seconds=300)
+    )
+    assert Deadband.from_options(options, "power").width(1000.0) == 20.0
+    assert Deadband.from_options(options, "current") is None
+    assert Deadband.from_options({"current_deadband": 0.1}, "current").heartbeat
+    assert (
+        Deadband.from_options(
+            {"current_deadband": 0.1, "heartbeat": 0}, "current"
+        ).heartbeat
+        is None
+    )
+    print("✅ Deadbands per sensor group")
+
+
+def test_state_filter():
+    """Small changes wait for the heartbeat, everything else is written."""
+    state_filter = StateFilter(Deadband(0.5, 0.0, timedelta(minutes=10)))
+
+    assert state_filter.should_write(230.0, True, START)
+    assert not state_filter.should_write(230.4, True, START + timedelta(seconds=10))
+    assert not state_filter.should_write(229.6, True, START + timedelta(seconds=20))
+    assert state_filter.should_write(230.6, True, START + timedelta(seconds=30))
+    # Measured from the last written value, so slow drifts are written too
+    assert not state_filter.should_write(231.0, True, START + timedelta(seconds=40))
+    assert state_filter.should_write(231.2, True, START + timedelta(seconds=50))
+    # Availability and missing values are never filtered
+    assert state_filter.should_write(231.2, False, START + timedelta(seconds=60))
+    assert state_filter.should_write(231.2, True, START + timedelta(seconds=70))
+    assert state_filter.should_write(None, True, START + timedelta(seconds=80))
+    assert state_filter.should_write(231.2, True, START + timedelta(seconds=90))
+    # Heartbeat
+    assert not state_filter.should_write(231.3, True, START + timedelta(minutes=11))
+    assert state_filter.should_write(231.3, True, START + timedelta(minutes=12))
+    print("✅ State filter")
+
+
+def test_write_reduction():
+    """Wobbling readings write an order of magnitude fewer states."""
+    random.seed(1)
+    coordinator = SimpleNamespace(data={"items": {}}, last_update_success=True)
+    deadbands = {
+        "power": Deadband(25.0, 0.0, timedelta(minutes=10)),
+        "voltage": Deadband(0.5, 0.0, timedelta(minutes=10)),
+        "current": Deadband(0.1, 0.0, timedelta(minutes=10)),
+    }
+    writes = {"filtered": 0, "unfiltered": 0}
+
+    def sensors(kind):
+        result = []
+        for description in METRIC_DESCRIPTIONS:
+            deadband = deadbands.get(description.deadband_group)
+            sensor = PerificMetricSensor(
+                coordinator,
+                1,
+                "Meter",
+                description,
+                deadband if kind == "filtered" else None,
+            )
+            sensor.async_write_ha_state = lambda kind=kind: writes.__setitem__(
+                kind, writes[kind] + 1
+            )
+            result.append(sensor)
+        return result
+
+    entities = sensors("filtered") + sensors("unfiltered")
+    polls = 360  # an hour of 10 second polls
+    for poll in range(polls):
+        voltage = [230.0 + random.uniform(-0.1, 0.1) for _ in range(3)]
+        current = [-5.6 + random.uniform(-0.01, 0.01) for _ in range(3)]
+        power = {
+            "current": dict(zip(("l1", "l2", "l3"), current)),
+            "voltage": dict(zip(("l1", "l2", "l3"), voltage)),
+            "power": {
+                phase: abs(i) * u
+                for phase, i, u in zip(("l1", "l2", "l3"), current, voltage)
+            },
+        }
+        power["power"]["total"] = sum(power["power"].values())
+        coordinator.data = {"items": {1: {"metrics": evaluate_metrics(power)}}}
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=START + timedelta(seconds=10 * poll),
+        ):
+            for entity in entities:
+                entity._handle_coordinator_update()
+
+    assert writes["unfiltered"] == polls * len(METRIC_DESCRIPTIONS)
+    assert writes["filtered"] * 10 <= writes["unfiltered"]
+    print(f"✅ {writes['filtered']} of {writes['unfiltered']} states written")
+
+
+if __name__ == "__main__":
+    test_deadband_options()
+    test_state_filter()
+    test_write_reduction()
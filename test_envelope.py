@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test parsing min/max current and per-phase energy from latest packets."""
+
+from custom_components.perific.api import parse_envelope
+
+LATEST_PACKETS = {
+    "PhaseRealTime": {"data": {"hiavg": [-5.59, -5.59, -6.09]}},
+    "PhaseHour": {
+        "data": {
+            "himin": [-16.69, -15.69, -16.99],
+            "himax": [0, 0, 0],
+            "hwpi": [0, 0, 0],
+            "hwpo": [3.168, 3.064, 3.353],
+        }
+    },
+    "PhaseDay": {
+        "data": {
+            "himin": [-37.59, -37.69, -38.19],
+            "himax": [9.5, 14, 12.8],
+            "hwpi": [2.824, 6.508, 2.799],
+            "hwpo": [29.409, 29.401, 31.666],
+        }
+    },
+    "PhaseMinute": {
+        "data": {"himin": [-5.69, -5.49, -6.19], "himax": [0, 0, 0]},
+    },
+}
+
+
+def test_envelope():
+    """Every aggregated packet yields its current envelope per phase."""
+    envelope = parse_envelope(LATEST_PACKETS)
+
+    assert set(envelope) == {"minute", "hour", "day"}
+    assert envelope["minute"]["current_min"] == {"l1": -5.69, "l2": -5.49, "l3": -6.19}
+    assert envelope["hour"]["current_peak"]["l3"] == 16.99
+    assert envelope["day"]["current_peak"] == {"l1": 37.59, "l2": 37.69, "l3": 38.19}
+    assert envelope["day"]["energy_imported"]["l2"] == 6.508
+    assert "energy_imported" not in envelope["minute"]
+    print("✅ Parsed minute, hour and day envelopes")
+
+
+def test_missing_packets():
+    """Missing or short packets are skipped."""
+    assert parse_envelope({}) == {}
+    assert parse_envelope({"PhaseDay": {"data": {"himin": [1.0]}}}) == {}
+    print("✅ Missing packets yield no envelope")
+
+
+if __name__ == "__main__":
+    test_envelope()
+    test_missing_packets()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Test the streaming history export."""
+
+import asyncio
+import csv
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from custom_components.perific.const import PHASE_DATA_TYPES
+from custom_components.perific.export import columns, export_history
+
+START = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+
+class FakePhaseDataAPI:
+    """Return one record per hour and fail after a number of calls."""
+
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.calls = 0
+        self.fail_after = fail_after
+
+    async def get_phase_data(self, item_id, from_date, to_date, data_type="Avg"):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("connection lost")
+        await asyncio.sleep(0)
+
+        records = []
+        ts = from_date
+        while ts < to_date:
+            records.append(
+                {
+                    "ts": ts.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "data": {"hiavg": [-1.0, -2.0, -3.0], "hwi": 10.5},
+                }
+            )
+            ts += timedelta(hours=1)
+        return [{"dt": from_date.isoformat(), "data": records}]
+
+
+def read_rows(path: Path) -> list[list[str]]:
+    """Read the CSV output."""
+    with path.open(newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_export_csv():
+    """Rows are written in time order with one column set per data type."""
+    windows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "history.csv"
+        rows = asyncio.run(
+            export_history(
+                FakePhaseDataAPI(),
+                [1, 2],
+                START,
+                START + timedelta(days=3),
+                output,
+                data_types=["Avg", "Max"],
+                on_window=lambda start, count: windows.append((start, count)),
+            )
+        )
+        content = read_rows(output)
+
+    assert rows == 2 * 3 * 24
+    assert content[0] == columns(["Avg", "Max"])
+    assert content[1][:5] == ["1", "2025-07-01T00:00:00", "-1.0", "-2.0", "-3.0"]
+    assert content[-1][1] == "2025-07-03T23:00:00"
+    # Progress is reported per window, the library prints nothing
+    assert windows[0][0] == START and sum(count for _, count in windows) == rows
+    print(f"✅ Exported {rows} rows to CSV")
+
+
+def test_export_resume():
+    """An interrupted export resumes after the last finished window."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "history.csv"
+        args = ([1], START, START + timedelta(days=10), output)
+
+        try:
+            asyncio.run(
+                export_history(
+                    FakePhaseDataAPI(fail_after=12), *args, max_concurrency=1
+                )
+            )
+        except RuntimeError:
+            pass
+        partial = read_rows(output)
+
+        api = FakePhaseDataAPI()
+        asyncio.run(export_history(api, *args, resume=True))
+        content = read_rows(output)
+
+    timestamps = [row[1] for row in content[1:]]
+    assert len(partial) > 1
+    assert api.calls < 10 * 3
+    assert len(timestamps) == len(set(timestamps)) == 10 * 24
+    print(f"✅ Resumed export after {len(partial) - 1} rows, {api.calls} calls")
+
+
+def test_export_resume_missing_output():
+    """Resuming starts over when the output was removed since."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "history.csv"
+        args = ([1], START, START + timedelta(days=10), output)
+
+        try:
+            asyncio.run(
+                export_history(
+                    FakePhaseDataAPI(fail_after=12), *args, max_concurrency=1
+                )
+            )
+        except RuntimeError:
+            pass
+        output.unlink()
+
+        api = FakePhaseDataAPI()
+        asyncio.run(export_history(api, *args, resume=True))
+        content = read_rows(output)
+
+    timestamps = [row[1] for row in content[1:]]
+    assert content[0] == columns(PHASE_DATA_TYPES)
+    assert len(timestamps) == len(set(timestamps)) == 10 * 24
+    print(f"✅ Restarted export without its output, {api.calls} calls")
+
+
+if __name__ == "__main__":
+    test_export_csv()
+    test_export_resume()
+    test_export_resume_missing_output()
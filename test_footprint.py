@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Test lean coordinator data and memory footprint reporting."""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import custom_components.perific.coordinator as coordinator_module
+from custom_components.perific.api import parse_envelope
+from custom_components.perific.const import FOOTPRINT_INTERVAL
+from custom_components.perific.footprint import (
+    account_footprint,
+    deep_sizeof,
+    item_footprint,
+)
+from custom_components.perific.forecast import ConsumptionForecaster
+from custom_components.perific.peaks import PeakTracker
+from custom_components.perific.sensor import (
+    PerificAccountMemorySensor,
+    PerificMemorySensor,
+)
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+METERS = [FakeMeter(DEFAULT_ITEM_ID + index, mains_fuse=20) for index in range(4)]
+
+
+def test_deep_sizeof():
+    """Shared structures count once, foreign objects not at all."""
+    shared = {"name": "Energy Meter", "values": list(range(100))}
+    alone = deep_sizeof(shared)
+
+    pair = [shared, shared]
+    assert deep_sizeof(pair) == sys.getsizeof(pair) + alone
+
+    loop = asyncio.new_event_loop()
+    holder = {"loop": loop}
+    assert deep_sizeof(holder) == sys.getsizeof(holder) + sys.getsizeof("loop")
+    loop.close()
+    assert deep_sizeof(shared, {id(shared)}) == 0
+    print(f"✅ {alone} bytes, shared structures counted once")
+
+
+def test_snapshot_updates():
+    """Each new packet swaps in new item data that only holds what entities read."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        first = coordinator.data["items"][DEFAULT_ITEM_ID]
+        snapshot = dict(first)
+        await sim.advance(minutes=5)
+        last = coordinator.data["items"][DEFAULT_ITEM_ID]
+        return first, snapshot, last, coordinator.data, sim.backend
+
+    first, snapshot, last, data, backend = run_simulation(scenario, meters=METERS[:1])
+
+    assert first == snapshot and last is not first
+    assert last["revision"] - first["revision"] == 9
+    assert set(data) == {"items"}
+    assert backend.count("/getuserinfo") == 0
+    print(f"✅ Item data replaced over {last['revision']} revisions")
+
+
+def test_unchanged_packets():
+    """An item whose packet is unchanged keeps its data, revision included."""
+    meters = [
+        FakeMeter(DEFAULT_ITEM_ID, offline=[(60, 600)]),
+        FakeMeter(DEFAULT_ITEM_ID + 1),
+    ]
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        await sim.advance(minutes=2)
+        before = dict(coordinator.data["items"])
+        await sim.advance(minutes=2)
+        return before, coordinator.data["items"]
+
+    before, after = run_simulation(scenario, meters=meters)
+
+    assert after[DEFAULT_ITEM_ID] is before[DEFAULT_ITEM_ID]
+    assert after[DEFAULT_ITEM_ID + 1] is not before[DEFAULT_ITEM_ID + 1]
+    assert (
+        after[DEFAULT_ITEM_ID + 1]["revision"] > before[DEFAULT_ITEM_ID + 1]["revision"]
+    )
+    print(f"✅ Offline item kept revision {after[DEFAULT_ITEM_ID]['revision']}")
+
+
+def test_failed_cycle():
+    """A cycle failing halfway through leaves the previous data as it was.
+
+    Nor do thresholds, forecasts, history and peaks see any of its items.
+    """
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        # Past the shared response's max age, but before the next poll
+        await sim.advance(seconds=20)
+        data = coordinator.data
+        revisions = {
+            item_id: item["revision"] for item_id, item in data["items"].items()
+        }
+        updated = []
+        update = coordinator.forecaster.update
+
+        def recording_update(item_id, *args):
+            updated.append(item_id)
+            return update(item_id, *args)
+
+        def failing_envelope(latest_packets):
+            if latest_packets["PhaseRealTime"]["iid"] == DEFAULT_ITEM_ID + 1:
+                raise ValueError("Broken packet")
+            return parse_envelope(latest_packets)
+
+        coordinator.forecaster.update = recording_update
+        with patch.object(coordinator_module, "parse_envelope", failing_envelope):
+            await coordinator.async_refresh()
+        return data, revisions, coordinator, updated
+
+    data, revisions, coordinator, updated = run_simulation(scenario, meters=METERS[:2])
+
+    assert not coordinator.last_update_success
+    assert coordinator.data is data
+    assert {item_id: item["revision"] for item_id, item in data["items"].items()} == (
+        revisions
+    )
+    assert updated == []
+    print("✅ Failed cycle left the data and item state untouched")
+
+
+def test_bounded_footprint():
+    """The account footprint stops growing once the minute history is full."""
+
+    async def scenario(sim):
+        api = await sim.async_create_api()
+        forecaster, peaks = ConsumptionForecaster(), PeakTracker()
+        coordinators = await sim.async_start_shards(
+            api=api, shard_size=2, forecaster=forecaster, peaks=peaks
+        )
+        entry_data = {
+            "api": api,
+            "coordinators": coordinators,
+            "forecaster": forecaster,
+            "peaks": peaks,
+        }
+        sizes = []
+        for _ in range(3):
+            await sim.advance(hours=8)
+            sizes.append(account_footprint(entry_data))
+        items = [
+            item_footprint(coordinator, item_id)
+            for coordinator in coordinators
+            for item_id in coordinator.item_ids
+        ]
+        return sizes, items
+
+    sizes, items = run_simulation(scenario, meters=METERS)
+    totals = [size["total"] for size in sizes]
+
+    assert abs(totals[2] - totals[1]) < totals[1] * 0.05
+    assert sizes[2]["minute_history"] > sizes[2]["data"]
+    # Nearly all of the account is per meter state
+    assert len(items) == len(METERS)
+    assert totals[2] * 0.6 < sum(items) < totals[2]
+    print(
+        f"✅ Account footprint {[total // 1024 for total in totals]} KiB, "
+        f"{items[0] // 1024} KiB per meter"
+    )
+
+
+def memory_sensors(sim, coordinator, writes):
+    """Create both memory sensors, recording their writes."""
+    entry_data = {
+        "api": coordinator.api,
+        "coordinators": [coordinator],
+        "forecaster": coordinator.forecaster,
+        "peaks": coordinator.peaks,
+    }
+    entry = SimpleNamespace(entry_id="entry", title="Perific")
+    sensors = [
+        PerificAccountMemorySensor(entry, entry_data),
+        PerificMemorySensor(coordinator, DEFAULT_ITEM_ID, "Meter"),
+    ]
+    for sensor in sensors:
+        sensor.hass = sim.hass
+        sensor.async_write_ha_state = lambda sensor=sensor: writes.append(
+            (sim.time, sensor.available, sensor.native_value)
+        )
+        coordinator.async_add_listener(sensor._handle_coordinator_update)
+    return sensors
+
+
+def test_memory_sensors():
+    """Memory sensors measure at most every five minutes."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        writes = []
+        sensors = memory_sensors(sim, coordinator, writes)
+        await sim.advance(minutes=11)
+        return writes, sensors[0].extra_state_attributes
+
+    writes, attributes = run_simulation(scenario, meters=METERS[:1])
+
+    # Measured on the first update and five and ten minutes later
+    assert len(writes) == 6
+    account, meter = [value for _, _, value in writes[-2:]]
+    assert 0 < meter < account
+    assert attributes["items"] == 1
+    assert attributes["total_bytes"] == sum(
+        size for key, size in attributes.items() if key not in ("items", "total_bytes")
+    )
+    print(f"✅ Account {account} KiB, meter {meter} KiB")
+
+
+def test_memory_sensor_availability():
+    """Memory sensors turn unavailable with the coordinator, not minutes later."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        writes = []
+        memory_sensors(sim, coordinator, writes)
+        sim.backend.outage(sim.time + 60, sim.time + 900)
+        await sim.advance(minutes=15)
+        failed = min(time for time, available, _ in writes if not available)
+        return writes, failed
+
+    writes, failed = run_simulation(scenario, meters=METERS[:1])
+
+    # Both sensors are written when the coordinator fails between measurements
+    assert [available for time, available, _ in writes if time == failed] == [
+        False,
+        False,
+    ]
+    # Before the next measurement, five minutes after the one at 300 s
+    assert failed < writes[0][0] + 2 * FOOTPRINT_INTERVAL.total_seconds()
+    print(f"✅ Memory sensors unavailable at {failed:.0f} s")
+
+
+if __name__ == "__main__":
+    test_deep_sizeof()
+    test_snapshot_updates()
+    test_unchanged_packets()
+    test_failed_cycle()
+    test_bounded_footprint()
+    test_memory_sensors()
+    test_memory_sensor_availability()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Test the incremental consumption forecast."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.perific.forecast import ConsumptionForecaster
+from simulation import run_simulation
+
+START = datetime(2025, 7, 14, 0, 0, tzinfo=timezone.utc)
+
+
+class Meter:
+    """A meter whose import rate changes over time."""
+
+    def __init__(self) -> None:
+        self.segments = [(START, 1000.0, 0.0)]
+
+    def set_rate(self, at: datetime, rate: float) -> None:
+        """Import `rate` kWh per hour from `at` on."""
+        self.segments.append((at, self.counter(at), rate))
+
+    def counter(self, at: datetime) -> float:
+        """Return the cumulative import counter at `at`."""
+        start, counter, rate = [s for s in self.segments if s[0] <= at][-1]
+        return round(counter + rate * (at - start).total_seconds() / 3600, 6)
+
+    def packets(self, now: datetime) -> dict:
+        """Build the latest packets as polled at `now`, without timestamps."""
+        minute = now.replace(second=0, microsecond=0)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        return {
+            "PhaseMinute": {"data": {"hwi": self.counter(minute)}},
+            "PhaseHour": {"data": {"hwi": self.counter(hour), "hwo": 0.0}},
+        }
+
+
+def run(forecaster, meter, start, minutes, rate):
+    """Poll once a minute at a new rate and return the last projection."""
+    meter.set_rate(start, rate)
+    projection = {}
+    for minute in range(minutes):
+        now = start + timedelta(minutes=minute, seconds=30)
+        projection = forecaster.update(1, meter.packets(now), now)
+    return projection
+
+
+def test_steady_rate():
+    """A steady import rate projects that rate for both hours."""
+    projection = run(ConsumptionForecaster(), Meter(), START, 150, 2.0)
+
+    assert projection == {"current_hour": 2.0, "next_hour": 2.0}
+    print(f"✅ Steady projection {projection}")
+
+
+def test_profile():
+    """The next hour blends the current rate with the hour-of-day profile."""
+    forecaster, meter = ConsumptionForecaster(), Meter()
+    run(forecaster, meter, START, 24 * 60, 2.0)
+
+    # A sudden jump moves the current hour, the next hour stays in between
+    projection = run(forecaster, meter, START + timedelta(days=1), 90, 6.0)
+    assert 2.0 < projection["current_hour"] <= 6.0
+    assert 2.0 < projection["next_hour"] < 6.0
+    print(f"✅ Projection after a jump {projection}")
+
+
+def test_persistence():
+    """The state survives a restart."""
+
+    async def scenario(sim):
+        forecaster, meter = ConsumptionForecaster(sim.hass, "entry"), Meter()
+        run(forecaster, meter, START, 90, 3.0)
+        await forecaster.async_save()
+
+        restored = ConsumptionForecaster(sim.hass, "entry")
+        await restored.async_load()
+        now = START + timedelta(minutes=90, seconds=30)
+        return restored.update(1, meter.packets(now), now)
+
+    projection = run_simulation(scenario)
+    assert projection == {"current_hour": 3.0, "next_hour": 3.0}
+    print(f"✅ Restored projection {projection}")
+
+
+if __name__ == "__main__":
+    test_steady_rate()
+    test_profile()
+    test_persistence()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Test fuse headroom from EV charger reporter settings."""
+
+import asyncio
+
+from custom_components.perific.api import fuse_headroom, parse_fuse_levels
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+REPORTER_SETTINGS = {
+    "ZaptecReporters": [
+        {
+            "ReporterId": 1714035493385,
+            "AlgorithmType": "Simple",
+            "SimpleSettings": {
+                "ItemId": 1714035408660,
+                "MainsFuseLevel": 25,
+                "ChargerFuseLevel": 25,
+            },
+        }
+    ],
+    "EaseeReporters": [
+        {"SimpleSettings": {"ItemId": 1714035408660, "MainsFuseLevel": 20}},
+        {"SimpleSettings": {"ItemId": 42, "MainsFuseLevel": 16}},
+        {"SimpleSettings": {"ItemId": 43, "MainsFuseLevel": 0}},
+    ],
+    "MontaReporters": [],
+}
+
+
+def test_parse_fuse_levels():
+    """Every charger brand is read and the lowest mains fuse wins."""
+    fuses = parse_fuse_levels(REPORTER_SETTINGS)
+
+    assert fuses == {
+        1714035408660: {"mains_fuse": 20, "charger_fuse": None, "reporter": "easee"},
+        42: {"mains_fuse": 16, "charger_fuse": None, "reporter": "easee"},
+    }
+    assert parse_fuse_levels({}) == {}
+    print(f"✅ Fuse levels {fuses}")
+
+
+def test_fuse_headroom():
+    """Current in either direction counts against the fuse."""
+    headroom = fuse_headroom(25, {"l1": -5.59, "l2": 3.0, "l3": 0.0})
+
+    assert headroom == {"l1": 19.41, "l2": 22.0, "l3": 25.0}
+    assert fuse_headroom(25, None) == {}
+    print(f"✅ Headroom {headroom}")
+
+
+def test_reporter_settings_cadence():
+    """Shards compute headroom every poll from hourly reporter settings."""
+    meters = [
+        FakeMeter(DEFAULT_ITEM_ID, mains_fuse=25),
+        FakeMeter(DEFAULT_ITEM_ID + 1),
+    ]
+
+    async def scenario(sim):
+        coordinators = await sim.async_start_shards(shard_size=1)
+        await sim.advance(hours=3)
+        items = {}
+        for coordinator in coordinators:
+            items.update(coordinator.data["items"])
+        return items, sim.backend.count(path, until=sim.time)
+
+    path = "/getreporterssettingsforuser"
+    items, requests = run_simulation(scenario, meters=meters)
+
+    assert items[DEFAULT_ITEM_ID]["headroom"] == {"l1": 19.41, "l2": 19.41, "l3": 18.91}
+    assert items[DEFAULT_ITEM_ID]["fuse"]["reporter"] == "zaptec"
+    assert "headroom" not in items[DEFAULT_ITEM_ID + 1]
+    assert requests == 3
+    print(f"✅ {requests} settings requests")
+
+
+def test_reporter_settings_failures():
+    """Slow or malformed reporter settings never fail a poll."""
+    meters = [FakeMeter(DEFAULT_ITEM_ID, mains_fuse=25)]
+
+    async def scenario(sim):
+        api = await sim.async_create_api()
+        fetch = api.get_reporter_settings
+
+        async def slow():
+            await asyncio.sleep(3600)
+            return await fetch()
+
+        api.get_reporter_settings = slow
+        coordinator = await sim.async_start_coordinator(api)
+        slow_poll = sim.time, coordinator.last_update_success
+        slow_item = coordinator.data["items"][DEFAULT_ITEM_ID]
+
+        # The slow fetch finishes in the background, later polls use it
+        await sim.advance(hours=1, minutes=1)
+        headroom = coordinator.data["items"][DEFAULT_ITEM_ID]["headroom"]
+
+        async def malformed():
+            return {"ZaptecReporters": [None]}
+
+        api.get_reporter_settings = malformed
+        await sim.advance(hours=1, minutes=1)
+        item = coordinator.data["items"][DEFAULT_ITEM_ID]
+        return slow_poll, slow_item, headroom, coordinator.last_update_success, item
+
+    slow_poll, slow_item, headroom, success, item = run_simulation(
+        scenario, meters=meters
+    )
+
+    assert slow_poll[1] and slow_poll[0] < 10
+    assert "headroom" not in slow_item
+    assert headroom == {"l1": 19.41, "l2": 19.41, "l3": 18.91}
+    # The last good fuse levels are kept
+    assert success and item["headroom"] == headroom
+    print(f"✅ Polled in {slow_poll[0]:.0f} s without reporter settings")
+
+
+if __name__ == "__main__":
+    test_parse_fuse_levels()
+    test_fuse_headroom()
+    test_reporter_settings_cadence()
+    test_reporter_settings_failures()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test the bulk phase data fetcher."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from custom_components.perific.history import (
+    fetch_phase_data_bulk,
+    merge_phase_data,
+    plan_phase_data_requests,
+)
+
+START = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+
+class FakePhaseDataAPI:
+    """Return one record per call and track concurrency."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_phase_data(self, item_id, from_date, to_date, data_type="Avg"):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        value = {"Avg": 1.0, "Min": 0.5, "Max": 2.0}[data_type]
+        return [
+            {
+                "dt": from_date.isoformat(),
+                "data": [
+                    {
+                        "ts": from_date.strftime("%Y-%m-%dT%H:%M:%S"),
+                        "data": {"dv": 2, "hiavg": [value, value, value]},
+                    }
+                ],
+            }
+        ]
+
+
+def test_plan_phase_data_requests():
+    """Requests cover every item, type and chunk in time order."""
+    requests = plan_phase_data_requests(
+        [1, 2], START, START + timedelta(days=2, hours=12)
+    )
+
+    assert len(requests) == 2 * 3 * 3
+    assert requests[0].from_date == START
+    assert requests[-1].to_date == START + timedelta(days=2, hours=12)
+    assert [r.from_date for r in requests] == sorted(r.from_date for r in requests)
+    print("✅ Request planning covers the whole range")
+
+
+def test_merge_phase_data():
+    """Rows are aligned by timestamp with a slot per data type."""
+    requests = plan_phase_data_requests([1], START, START + timedelta(days=1))
+    avg, minimum, _ = requests
+    results = [
+        (avg, [{"data": [{"ts": "2025-07-01T00:01:00", "data": {"v": 1}}]}]),
+        (avg, [{"data": [{"ts": "2025-07-01T00:00:00", "data": {"v": 0}}]}]),
+        (minimum, [{"data": [{"ts": "2025-07-01T00:01:00", "data": {"v": -1}}]}]),
+    ]
+
+    merged = merge_phase_data(results)
+
+    assert [row["ts"] for row in merged[1]] == [
+        "2025-07-01T00:00:00",
+        "2025-07-01T00:01:00",
+    ]
+    assert merged[1][0] == {
+        "ts": "2025-07-01T00:00:00",
+        "avg": {"v": 0},
+        "min": None,
+        "max": None,
+    }
+    assert merged[1][1]["min"] == {"v": -1}
+    print("✅ Merged rows are aligned by timestamp")
+
+
+def test_fetch_phase_data_bulk():
+    """Bulk fetch respects the concurrency bound and merges every item."""
+    api = FakePhaseDataAPI()
+
+    merged = asyncio.run(
+        fetch_phase_data_bulk(
+            api,
+            [1, 2, 3],
+            START,
+            START + timedelta(days=10),
+            max_concurrency=4,
+        )
+    )
+
+    assert api.calls == 3 * 3 * 10
+    assert api.max_in_flight == 4
+    assert sorted(merged) == [1, 2, 3]
+    assert len(merged[1]) == 10
+    assert merged[2][0]["max"] == {"dv": 2, "hiavg": [2.0, 2.0, 2.0]}
+    print(f"✅ Bulk fetch made {api.calls} calls, max {api.max_in_flight} in flight")
+
+
+if __name__ == "__main__":
+    test_plan_phase_data_requests()
+    test_merge_phase_data()
+    test_fetch_phase_data_bulk()
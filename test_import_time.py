@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Test that loading the integration stays cheap."""
+
+import asyncio
+import subprocess
+import sys
+import threading
+
+from custom_components.perific import api as api_module
+from custom_components.perific.api import PerificAPI
+
+IMPORT_BUDGET = 0.5
+
+PROBE = """
+import sys, time
+import homeassistant.helpers.update_coordinator  # noqa: F401
+import homeassistant.components.sensor  # noqa: F401
+import homeassistant.config_entries  # noqa: F401
+preloaded = "certifi" in sys.modules
+start = time.perf_counter()
+import custom_components.perific.api  # noqa: F401
+elapsed = time.perf_counter() - start
+print(elapsed, preloaded, "certifi" in sys.modules)
+"""
+
+
+def test_import_time():
+    """Importing the API client is fast and does not load certifi."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    ).stdout.split()
+    elapsed, preloaded, loaded = float(output[0]), output[1], output[2]
+
+    assert elapsed < IMPORT_BUDGET
+    if preloaded == "False":
+        assert loaded == "False"
+    print(f"✅ API client imported in {elapsed * 1000:.1f} ms")
+
+
+def test_provided_session_skips_ssl():
+    """A session from Home Assistant never builds an SSL context."""
+    calls = []
+    original = api_module._create_ssl_context
+    api_module._create_ssl_context = lambda: calls.append(1)
+    try:
+        session = object()
+        api = PerificAPI("user@example.com", "token", session=session)
+        assert asyncio.run(api._async_get_session()) is session
+    finally:
+        api_module._create_ssl_context = original
+
+    assert calls == []
+    print("✅ Provided session used without SSL setup")
+
+
+def test_own_session_built_off_loop():
+    """Our own session's SSL context is created in an executor thread."""
+    threads = []
+    original = api_module._create_ssl_context
+
+    def create():
+        threads.append(threading.current_thread())
+        return original()
+
+    async def run():
+        api = PerificAPI("user@example.com", "token")
+        try:
+            first, second = await asyncio.gather(
+                api._async_get_session(), api._async_get_session()
+            )
+            return first, second
+        finally:
+            await api.close()
+
+    api_module._create_ssl_context = create
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        api_module._create_ssl_context = original
+
+    assert threads and threading.main_thread() not in threads
+    assert first is second
+    print(f"✅ SSL context built in {threads[0].name}, one session created")
+
+
+if __name__ == "__main__":
+    test_import_time()
+    test_provided_session_skips_ssl()
+    test_own_session_built_off_loop()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test the shared request rate limiter."""
+
+import asyncio
+
+from custom_components.perific.const import RATE_LIMIT_HOURLY
+from custom_components.perific.limiter import (
+    RequestLimiter,
+    RequestPriority,
+    get_limiter,
+)
+from simulation import run_simulation
+
+
+def test_shared_per_host():
+    """Clients of the same host share one limiter."""
+    assert get_limiter("https://api.enegic.com/a") is get_limiter(
+        "https://api.enegic.com/b"
+    )
+    assert get_limiter("https://api.enegic.com") is not get_limiter(
+        "https://example.com"
+    )
+    print("✅ Limiter is shared per host")
+
+
+def test_priority_order():
+    """Queued realtime requests are served before metadata and history."""
+
+    async def run():
+        limiter = RequestLimiter(rate=50, burst=1, bulk_reserve=0)
+        await limiter.acquire(RequestPriority.REALTIME)
+        order = []
+
+        async def request(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(request("history", RequestPriority.HISTORY)),
+            asyncio.create_task(request("metadata", RequestPriority.METADATA)),
+            asyncio.create_task(request("realtime", RequestPriority.REALTIME)),
+        ]
+        await asyncio.sleep(0)
+        depth = limiter.queue_depth
+        await asyncio.gather(*tasks)
+        return order, depth, limiter.metrics
+
+    order, depth, metrics = asyncio.run(run())
+
+    assert order == ["realtime", "metadata", "history"]
+    assert depth == {"realtime": 1, "metadata": 1, "history": 1}
+    assert metrics["max_queue_depth"] == 3
+    assert metrics["granted"] == {"realtime": 2, "metadata": 1, "history": 1}
+    print(f"✅ Requests served in priority order: {order}")
+
+
+def test_bulk_reserve():
+    """History requests leave reserved tokens for realtime polling."""
+
+    async def run():
+        limiter = RequestLimiter(rate=20, burst=5, bulk_reserve=2)
+        for _ in range(3):
+            await limiter.acquire(RequestPriority.HISTORY)
+
+        history = asyncio.create_task(limiter.acquire(RequestPriority.HISTORY))
+        await asyncio.sleep(0)
+        blocked = not history.done()
+
+        # Realtime can still use the reserved tokens immediately
+        await asyncio.wait_for(limiter.acquire(RequestPriority.REALTIME), 0.01)
+        await asyncio.wait_for(limiter.acquire(RequestPriority.REALTIME), 0.01)
+
+        await history
+        return blocked
+
+    assert asyncio.run(run())
+    print("✅ History requests cannot drain the realtime reserve")
+
+
+def test_cancelled_waiter():
+    """Cancelling a queued request removes it from the queue."""
+
+    async def run():
+        limiter = RequestLimiter(rate=10, burst=1, bulk_reserve=0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return limiter.queue_depth
+
+    assert sum(asyncio.run(run()).values()) == 0
+    print("✅ Cancelled waiters leave the queue")
+
+
+def test_hourly_cap():
+    """The default limiter grants fewer requests per hour than the API allows."""
+
+    async def scenario(sim):
+        limiter = RequestLimiter()
+        start = sim.time
+        granted = 0
+        while sim.time - start < 3600:
+            await limiter.acquire(RequestPriority.REALTIME)
+            granted += 1
+        return granted
+
+    # The last request is granted after the hour
+    granted = run_simulation(scenario) - 1
+    assert granted < RATE_LIMIT_HOURLY
+    print(f"✅ {granted} requests granted in one hour")
+
+
+if __name__ == "__main__":
+    test_shared_per_host()
+    test_priority_order()
+    test_bulk_reserve()
+    test_cancelled_waiter()
+    test_hourly_cap()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test the derived metric pipeline."""
+
+from custom_components.perific.api import parse_current_power
+from custom_components.perific.metrics import (
+    METRIC_DESCRIPTIONS,
+    PerificMetricDescription,
+    PhaseSnapshot,
+    evaluate_metrics,
+)
+
+LATEST_PACKETS = {
+    "PhaseRealTime": {
+        "ts": 1752451200000,
+        "data": {"hiavg": [-10.0, -4.0, 2.0], "huavg": [230.0, 230.0, 230.0]},
+    }
+}
+
+
+def test_metrics():
+    """Every metric is derived from one parsed reading."""
+    metrics = evaluate_metrics(parse_current_power(LATEST_PACKETS))
+
+    assert metrics["power_total"] == 3680.0
+    assert metrics["power_l1"] == 2300.0
+    assert metrics["voltage_l2"] == 230.0
+    assert metrics["current_l3"] == 2.0
+    assert metrics["net_power"] == 2760.0  # 14 A imported, 2 A exported
+    assert round(metrics["phase_imbalance"], 1) == 87.5
+    assert len(metrics) == len({d.key for d in METRIC_DESCRIPTIONS})
+    assert evaluate_metrics({}) == {}
+    print(f"✅ {len(metrics)} metrics, net power {metrics['net_power']} W")
+
+
+def test_shared_intermediates():
+    """Intermediate values are computed once, however many metrics use them."""
+    calls = []
+
+    class CountingSnapshot(PhaseSnapshot):
+        @property
+        def currents(self):
+            calls.append(1)
+            return super().currents
+
+    snapshot = CountingSnapshot(parse_current_power(LATEST_PACKETS))
+    for _ in range(100):
+        assert snapshot.magnitudes["l1"] == 10.0
+    assert len(calls) == 1
+
+    # Extra descriptions only add their own evaluation
+    descriptions = [
+        PerificMetricDescription(
+            key=f"magnitude_{index}",
+            sensor_type="magnitude",
+            value_fn=lambda snapshot: snapshot.magnitudes["l1"],
+        )
+        for index in range(50)
+    ]
+    metrics = evaluate_metrics(parse_current_power(LATEST_PACKETS), descriptions)
+    assert set(metrics.values()) == {10.0}
+    print(f"✅ {len(descriptions)} metrics from one magnitude computation")
+
+
+if __name__ == "__main__":
+    test_metrics()
+    test_shared_intermediates()
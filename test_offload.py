@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test decoding phase data history off the event loop."""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from custom_components.perific.backfill import MinuteHistory, phase_power_samples
+from custom_components.perific.history import (
+    async_iter_phase_chunks,
+    chunk_phase_response,
+)
+
+START = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+
+def phase_response(minutes):
+    """Return a /getphasedata response with one record per minute."""
+    records = [
+        {
+            "ts": (START + timedelta(minutes=minute)).strftime("%Y-%m-%dT%H:%M:%S"),
+            "data": {
+                "dv": 2,
+                "hiavg": [-5.0, -4.0, 3.0],
+                "huavg": [230.0, 231.0, 232.0],
+            },
+        }
+        for minute in range(minutes)
+    ]
+    return [{"dt": "2025-07-01T00:00:00", "data": records}]
+
+
+def test_chunk_phase_response():
+    """Chunks keep the group fields and split only the records."""
+    response = phase_response(5)
+    chunks = list(chunk_phase_response(response, 2))
+
+    assert [len(chunk[0]["data"]) for chunk in chunks] == [2, 2, 1]
+    assert all(chunk[0]["dt"] == response[0]["dt"] for chunk in chunks)
+    assert [s for chunk in chunks for s in phase_power_samples(chunk)] == (
+        phase_power_samples(response)
+    )
+    print("✅ Phase data responses chunked")
+
+
+def test_offloaded_decoding():
+    """Every chunk is decoded in the executor while the loop keeps running."""
+    response = phase_response(60000)
+    threads = []
+    ticks = 0
+
+    def decode(chunk):
+        threads.append(threading.get_ident())
+        return phase_power_samples(chunk)
+
+    async def ticker(done):
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def scenario():
+        history = MinuteHistory()
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        async for samples in async_iter_phase_chunks(decode, response):
+            history.add_samples(1, samples)
+        done.set()
+        await task
+        return history
+
+    history = asyncio.run(scenario())
+    expected = MinuteHistory()
+    expected.add_phase_records(1, response)
+
+    assert history._samples == expected._samples
+    assert len(threads) > 1 and threading.get_ident() not in threads
+    # The loop got at least one turn while each chunk was decoded
+    assert ticks >= len(threads)
+    print(f"✅ {len(threads)} chunks decoded in the executor, {ticks} loop turns")
+
+
+def test_cancellation():
+    """Cancelling the consumer stops decoding after the running chunk."""
+    response = phase_response(10000)
+    decoded = []
+
+    def decode(chunk):
+        decoded.append(len(chunk[0]["data"]))
+        return phase_power_samples(chunk)
+
+    async def consume(first):
+        async for _ in async_iter_phase_chunks(decode, response, 1000):
+            first.set()
+            await asyncio.sleep(1)
+
+    async def scenario():
+        first = asyncio.Event()
+        task = asyncio.create_task(consume(first))
+        await first.wait()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    assert decoded == [1000]
+    print(f"✅ {len(decoded)} of 10 chunks decoded before cancellation")
+
+
+if __name__ == "__main__":
+    test_chunk_phase_response()
+    test_offloaded_decoding()
+    test_cancellation()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Test the OpenMetrics endpoint."""
+
+import re
+from types import SimpleNamespace
+
+from custom_components.perific.const import CONF_OPENMETRICS, DOMAIN
+from custom_components.perific.openmetrics import (
+    CONTENT_TYPE,
+    PerificMetricsView,
+    render_openmetrics,
+)
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+SAMPLE = re.compile(r'^[a-z_]+(\{([a-z_]+="(\\.|[^"\\])*",?)*\})? -?[0-9.e+-]+$')
+
+
+def scrape(options):
+    """Poll for a while, then scrape the view twice."""
+    meters = [FakeMeter(DEFAULT_ITEM_ID, name='Main "house"'), FakeMeter(2)]
+
+    async def scenario(sim):
+        coordinators = await sim.async_start_shards(shard_size=1)
+        await sim.advance(minutes=2)
+        sim.hass.data[DOMAIN] = {
+            "entry": {"api": coordinators[0].api, "coordinators": coordinators}
+        }
+        entry = SimpleNamespace(options=options)
+        sim.hass.config_entries = SimpleNamespace(async_get_entry=lambda _: entry)
+
+        view = PerificMetricsView(sim.hass)
+        requests = sim.backend.count()
+        responses = [await view.get(None) for _ in range(2)]
+        assert sim.backend.count() == requests
+        return responses
+
+    return run_simulation(scenario, meters=meters)
+
+
+def test_render():
+    """Every item's phases and the API health counters are rendered."""
+    first, second = scrape({CONF_OPENMETRICS: True})
+    text = first.text
+    lines = text.splitlines()
+
+    assert first.headers["Content-Type"] == CONTENT_TYPE
+    assert lines[-1] == "# EOF"
+    assert all(SAMPLE.match(line) for line in lines if not line.startswith("#"))
+    assert (
+        f'perific_current_amperes{{item_id="{DEFAULT_ITEM_ID}",'
+        'item_name="Main \\"house\\"",phase="l3"} -6.09'
+    ) in lines
+    assert (
+        'perific_power_watts{item_id="2",item_name="Energy Meter",phase="total"}'
+        in (text)
+    )
+    assert "# TYPE perific_energy_imported_kwh counter" in lines
+    assert (
+        'perific_energy_imported_kwh_total{item_id="2",item_name="Energy Meter"}'
+        " 57142.835"
+    ) in lines
+    assert 'perific_coordinator_up{entry_id="entry",shard="1"} 1.0' in lines
+    assert any(line.startswith("perific_snapshot_lookups_total{") for line in lines)
+    assert any(line.startswith("perific_limiter_granted_total{") for line in lines)
+    assert second.text == text
+    print(f"✅ Rendered {len(lines)} lines without API requests")
+
+
+def test_disabled():
+    """The view is not found while no entry enables it."""
+    response, _ = scrape({})
+
+    assert response.status == 404
+    assert render_openmetrics([]) == "# EOF\n"
+    print("✅ Disabled endpoint returns 404")
+
+
+if __name__ == "__main__":
+    test_render()
+    test_disabled()
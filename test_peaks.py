@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test the monthly peak hour tracker."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.perific.peaks import PeakTracker, hourly_energy
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+START = datetime(2025, 7, 14, 0, 0, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def test_top_hours():
+    """Only the highest hours are kept, highest first."""
+    tracker = PeakTracker(count=3)
+    for hour, energy in enumerate([1.0, 5.0, 2.0, 4.0, 3.0, 0.5]):
+        tracker.add(1, START + hour * HOUR, energy)
+    tracker.add(1, START + HOUR, 9.0)  # already counted
+
+    peaks = tracker.peaks(1)
+    assert [peak["energy"] for peak in peaks["peaks"]] == [5.0, 4.0, 3.0]
+    assert peaks["peaks"][0]["start"] == (START + HOUR).isoformat()
+    assert peaks["average"] == 4.0
+    assert tracker.peaks(2) == {}
+    print(f"✅ Top hours {peaks['peaks']}")
+
+
+def test_month_reset():
+    """A new month starts with no peaks and older hours are ignored."""
+    tracker = PeakTracker()
+    tracker.add(1, START, 5.0)
+    tracker.add(1, datetime(2025, 8, 10, 12, tzinfo=timezone.utc), 1.0)
+    tracker.add(1, START + HOUR, 7.0)
+
+    peaks = tracker.peaks(1)
+    assert peaks["month"] == "2025-08"
+    assert [peak["energy"] for peak in peaks["peaks"]] == [1.0]
+    print(f"✅ Month reset {peaks}")
+
+
+def test_close_hour():
+    """Consecutive hours are measured, gaps are reported for a rebuild."""
+    tracker = PeakTracker()
+    assert tracker.close_hour(1, START, 100.0) is None
+    assert tracker.close_hour(1, START + HOUR, 102.5) is None
+    assert tracker.close_hour(1, START + HOUR, 102.5) is None
+    assert tracker.peaks(1)["peaks"][0]["energy"] == 2.5
+
+    missing = tracker.close_hour(1, START + 4 * HOUR, 110.0)
+    assert missing == (START + 2 * HOUR, START + 5 * HOUR)
+
+    # Gaps reaching into the previous month are clamped to this month
+    tracker.close_hour(1, datetime(2025, 7, 31, 20, tzinfo=timezone.utc), 200.0)
+    missing = tracker.close_hour(1, datetime(2025, 8, 2, tzinfo=timezone.utc), 300.0)
+    assert missing[0] <= datetime(2025, 8, 1, tzinfo=timezone.utc) < missing[1]
+    assert missing[0] > datetime(2025, 7, 31, 20, tzinfo=timezone.utc)
+    print(f"✅ Missing hours {missing}")
+
+
+def test_hourly_energy():
+    """Hours are measured from counters, else from the mean import power."""
+
+    def record(ts, **data):
+        return {"ts": ts.strftime("%Y-%m-%dT%H:%M:%S"), "data": {"dv": 2, **data}}
+
+    counters = [
+        record(START + minute * timedelta(minutes=1), hwi=100.0 + minute / 20)
+        for minute in range(121)
+    ]
+    energy = hourly_energy([{"dt": "2025-07-14", "data": counters}])
+    assert energy == {START: 3.0, START + HOUR: 3.0}
+
+    powers = [
+        record(START + minute * timedelta(minutes=1), hiavg=[-10, 0, 5])
+        for minute in range(60)
+    ]
+    energy = hourly_energy([{"dt": "2025-07-14", "data": powers}])
+    assert energy == {START: 2.3}
+    assert hourly_energy(None) == {}
+    print(f"✅ Hourly energy {energy}")
+
+
+def test_peaks_from_latest_packets():
+    """Hourly packets without a timestamp close the hour before they arrive."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        await sim.advance(hours=4)
+        packets = await coordinator.api.get_latest_packets()
+        return coordinator.data["items"][DEFAULT_ITEM_ID]["peaks"], packets
+
+    peaks, packets = run_simulation(scenario)
+
+    # As documented, only the realtime packet has a timestamp
+    latest = packets[0]["LatestPackets"]
+    assert "ts" in latest["PhaseRealTime"] and "ts" not in latest["PhaseHour"]
+    assert [peak["start"] for peak in peaks["peaks"]] == [
+        (START + hour * HOUR).isoformat() for hour in (2, 1, 0)
+    ]
+    assert all(peak["energy"] == 4.0 for peak in peaks["peaks"])
+    print(f"✅ Peaks from latest packets {peaks['peaks']}")
+
+
+def test_rebuild_after_outage():
+    """Hours missed while the meter was offline are rebuilt from phase data."""
+
+    async def scenario(sim):
+        tracker = PeakTracker(sim.hass, "entry")
+        coordinator = await sim.async_start_coordinator(peaks=tracker)
+        await sim.advance(hours=8)
+        await sim.hass.async_block_till_done()
+        await tracker.async_save()
+
+        restored = PeakTracker(sim.hass, "entry")
+        await restored.async_load()
+        return coordinator.data["items"][DEFAULT_ITEM_ID]["peaks"], restored
+
+    meter = FakeMeter(DEFAULT_ITEM_ID, offline=[(2.5 * 3600, 5.5 * 3600)])
+    peaks, restored = run_simulation(scenario, meters=[meter])
+
+    # The rebuilt hours, measured from mean power, are the highest
+    assert len(peaks["peaks"]) == 3
+    assert all(peak["energy"] > 4.0 for peak in peaks["peaks"])
+    assert restored.peaks(DEFAULT_ITEM_ID) == peaks
+    print(f"✅ Rebuilt peaks {peaks}")
+
+
+if __name__ == "__main__":
+    test_top_hours()
+    test_month_reset()
+    test_close_hour()
+    test_hourly_energy()
+    test_peaks_from_latest_packets()
+    test_rebuild_after_outage()
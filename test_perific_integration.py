@@ -45,7 +45,9 @@ async def test_api():
         print(f"City: {user_info.get('City')}")
 
         print("\nDiscovering items...")
-        items = await api.discover_items()
+        packets = await api.get_latest_packets()
+        await api.async_fetch_item_info(packet["ItemId"] for packet in packets)
+        items = api.discover_items(packets)
         print(f"Found {len(items)} items")
 
         for item in items:
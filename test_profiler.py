@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test on-demand profiling of coordinator cycles."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.perific.const import DOMAIN, SERVICE_PROFILE
+from custom_components.perific.profiler import CycleTrace, span
+from custom_components.perific.services import async_setup_services
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+
+def test_spans_outside_profile():
+    """Spans cost nothing and record nothing without a profile."""
+    with span("fetch"):
+        pass
+
+    trace = CycleTrace("entry/0")
+    with trace.span("parse"):
+        pass
+    assert [name for name, _, _ in trace.spans] == ["parse"]
+    print("✅ Spans only recorded in a trace")
+
+
+def run_profile(mode, cycles):
+    """Profile cycles of two shards through the service, return the report."""
+
+    async def scenario(sim):
+        coordinators = await sim.async_start_shards(shard_size=1)
+        sim.hass.data[DOMAIN] = {"entry": {"coordinators": coordinators}}
+        async_setup_services(sim.hass)
+
+        await sim.hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE, {"mode": mode, "cycles": cycles}, blocking=True
+        )
+        await sim.advance(minutes=5)
+        await sim.hass.async_block_till_done()
+
+        assert all(coordinator.profiler is None for coordinator in coordinators)
+        reports = sorted(Path(sim.hass.config.config_dir).glob(f"{DOMAIN}_profile_*"))
+        return {path.suffix: path.read_bytes() for path in reports}
+
+    meters = [FakeMeter(DEFAULT_ITEM_ID), FakeMeter(DEFAULT_ITEM_ID + 1)]
+    return run_simulation(scenario, meters=meters)
+
+
+def test_timing_profile():
+    """The timing trace splits each cycle into API, parsing and dispatch."""
+    reports = run_profile("timing", 2)
+    report = json.loads(reports[".json"])
+
+    assert len(report["cycles"]) == 4
+    assert {cycle["coordinator"] for cycle in report["cycles"]} == {
+        "entry/0",
+        "entry/1",
+    }
+    assert {"fetch", "request", "json", "discover", "parse", "dispatch"} <= set(
+        report["totals"]
+    )
+    print(f"✅ Timing totals {sorted(report['totals'])}")
+
+
+def test_cprofile():
+    """The cProfile report covers the coordinator update."""
+    reports = run_profile("cprofile", 1)
+
+    assert set(reports) == {".prof", ".txt"}
+    assert b"_async_update_data" in reports[".txt"]
+    print(f"✅ cProfile report of {len(reports['.txt'])} characters")
+
+
+def test_overlapping_profiles():
+    """A profile is rejected while another one is running."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        sim.hass.data[DOMAIN] = {"entry": {"coordinators": [coordinator]}}
+        async_setup_services(sim.hass)
+
+        data = {"mode": "cprofile", "cycles": 2}
+        await sim.hass.services.async_call(DOMAIN, SERVICE_PROFILE, data, blocking=True)
+        profiler = coordinator.profiler
+        try:
+            await sim.hass.services.async_call(
+                DOMAIN, SERVICE_PROFILE, data, blocking=True
+            )
+        except ServiceValidationError:
+            rejected = True
+        else:
+            rejected = False
+        running = coordinator.profiler is profiler
+
+        await sim.advance(minutes=5)
+        await sim.hass.async_block_till_done()
+        reports = list(Path(sim.hass.config.config_dir).glob(f"{DOMAIN}_profile_*"))
+        return rejected, running, coordinator.profiler, len(profiler.traces), reports
+
+    rejected, running, profiler, traces, reports = run_simulation(scenario)
+
+    assert rejected and running and profiler is None
+    assert traces == 2 and len(reports) == 2  # .prof and .txt
+    print("✅ Overlapping profile rejected")
+
+
+def test_lazy_imports():
+    """cProfile and pstats are only imported once a cProfile run needs them."""
+    code = (
+        "import sys, custom_components.perific.api;"
+        "print(sorted({'cProfile', 'pstats'} & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+    print("✅ Profiling modules not imported with the API client")
+
+
+if __name__ == "__main__":
+    test_spans_outside_profile()
+    test_timing_profile()
+    test_cprofile()
+    test_overlapping_profiles()
+    test_lazy_imports()
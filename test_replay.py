@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Test recording and replaying API traffic."""
+
+import json
+from pathlib import Path
+
+from custom_components.perific.api import PerificAPIError
+from custom_components.perific.const import DOMAIN, SERVICE_RECORD_REQUESTS
+from custom_components.perific.replay import (
+    REDACTED,
+    ReplaySession,
+    RequestRecorder,
+    redact,
+)
+from custom_components.perific.services import async_setup_services
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+METERS = [FakeMeter(DEFAULT_ITEM_ID, mains_fuse=20)]
+
+
+def record(minutes=5, latency=0.25):
+    """Record a coordinator polling the fake backend."""
+
+    async def scenario(sim):
+        recorder = RequestRecorder()
+        api = await sim.async_create_api(session=recorder.wrap(sim.backend))
+        coordinator = await sim.async_start_coordinator(api=api)
+        await sim.advance(minutes=minutes)
+        sim.backend.outage(sim.time, sim.time + 1)
+        try:
+            await api.get_latest_packets()
+        except PerificAPIError:
+            pass
+        return recorder.fixture(), coordinator.data["items"][DEFAULT_ITEM_ID]
+
+    return run_simulation(scenario, meters=METERS, latency=latency)
+
+
+def test_redact():
+    """Credentials and personal details are redacted at any depth."""
+    value = {
+        "TokenInfo": {"Token": "secret", "ValidTo": "2026-01-01T00:00:00Z"},
+        "User": {"UserId": 1, "Username": "user@example.com"},
+        "Items": [{"ItemId": 2, "Mac": "aa:bb"}],
+    }
+
+    assert redact(value) == {
+        "TokenInfo": {"Token": REDACTED, "ValidTo": "2026-01-01T00:00:00Z"},
+        "User": {"UserId": 1, "Username": REDACTED},
+        "Items": [{"ItemId": 2, "Mac": REDACTED}],
+    }
+    print("✅ Redaction")
+
+
+def test_redact_payloads():
+    """Recorded user info and reporter settings keep no personal details."""
+    user_info = {
+        "Organization": "Example AB",
+        "Email": "user@example.com",
+        "FirstName": "John",
+        "LastName": "Doe",
+        "Address": "Street 123",
+        "ZipCode": "12345",
+        "City": "Smallville",
+        "PhoneNumber": "0123456789",
+        "Password": "hunter2",
+        "CountryCode": "SE",
+    }
+    reporters = {
+        "ZaptecReporters": [
+            {
+                "ReporterId": 2,
+                "Name": "Garage charger",
+                "OwnerName": "John Doe",
+                "ApiSecret": "s3cr3t",
+                "SimpleSettings": {"ItemId": 1, "MainsFuseLevel": 25},
+                "Credentials": {"UserPass": "hunter2", "AccessToken": "abc"},
+            }
+        ],
+        "EaseeReporters": [],
+    }
+    fixture = {
+        "version": 1,
+        "requests": [
+            {
+                "method": method,
+                "path": path,
+                "request": None,
+                "latency": 0.0,
+                "status": 200,
+                "body": body,
+            }
+            for method, path, body in (
+                ("GET", "/getuserinfo", user_info),
+                ("POST", "/getreporterssettingsforuser", reporters),
+            )
+        ],
+    }
+
+    async def scenario(sim):
+        recorder = RequestRecorder()
+        api = await sim.async_create_api(session=sim.backend)
+        api._session = recorder.wrap(ReplaySession(fixture, 0))
+        await api.get_user_info()
+        await api.get_reporter_settings()
+        return recorder.fixture()
+
+    recorded = run_simulation(scenario)
+    text = json.dumps(recorded)
+    user, settings = (request["body"] for request in recorded["requests"])
+
+    for value in (
+        "Example AB",
+        "user@example.com",
+        "John",
+        "Doe",
+        "Street 123",
+        "12345",
+        "Smallville",
+        "0123456789",
+        "hunter2",
+        "Garage charger",
+        "s3cr3t",
+        "abc",
+    ):
+        assert value not in text, value
+    assert user["CountryCode"] == "SE"
+    assert settings["ZaptecReporters"][0]["SimpleSettings"]["MainsFuseLevel"] == 25
+    print("✅ User info and reporter settings recorded without personal details")
+
+
+def test_record():
+    """Requests are recorded with sizes and latencies, without credentials."""
+    fixture, _ = record()
+    requests = fixture["requests"]
+    text = json.dumps(fixture)
+
+    assert "user@example.com" not in text and "token-" not in text
+    assert {request["path"] for request in requests} >= {
+        "/isactivated",
+        "/refreshtoken",
+        "/getlatestpackets",
+        "/getitemuserparameters",
+        "/getreporterssettingsforuser",
+    }
+    assert all(request["latency"] == 0.25 for request in requests)
+    assert all(request["size"] > 0 for request in requests)
+    assert requests[-1]["status"] == 503
+    print(f"✅ {len(requests)} requests recorded, {len(text)} bytes")
+
+
+def test_replay():
+    """A replayed session reproduces data and scaled latencies offline."""
+    fixture, recorded = record()
+
+    def replay(speed):
+        async def scenario(sim):
+            session = ReplaySession(fixture, speed)
+            api = await sim.async_create_api(session=session)
+            coordinator = await sim.async_start_coordinator(api=api)
+            await sim.advance(minutes=5)
+
+            start = sim.time
+            await api.get_reporter_settings()
+            latency = sim.time - start
+            return (
+                coordinator.data["items"][DEFAULT_ITEM_ID],
+                latency,
+                session.served,
+                sim.backend.count(),
+            )
+
+        return run_simulation(scenario, meters=METERS)
+
+    for speed, expected in ((1.0, 0.25), (10.0, 0.025), (0, 0.0)):
+        item, latency, served, backend = replay(speed)
+
+        assert item["metrics"] == recorded["metrics"]
+        assert item["headroom"] == recorded["headroom"]
+        assert round(latency, 6) == expected
+        assert served and not backend
+    print(f"✅ {served} responses replayed, latency scaled to {latency} s")
+
+
+def test_replay_errors():
+    """Recorded connection errors and unrecorded paths fail like the API."""
+    fixture = {
+        "version": 1,
+        "requests": [
+            {
+                "method": "PUT",
+                "path": "/getlatestpackets",
+                "request": None,
+                "latency": 1.0,
+                "error": "ClientConnectorError: Cannot connect",
+            },
+            {
+                "method": "GET",
+                "path": "/getuserinfo",
+                "request": None,
+                "latency": 1.0,
+                "status": 503,
+                "size": 36,
+                "body": {"Message": "Service unavailable"},
+            },
+        ],
+    }
+
+    async def scenario(sim):
+        api = await sim.async_create_api(session=sim.backend)
+        errors = []
+        api._session = ReplaySession(fixture)
+        for call in (
+            api.get_latest_packets,
+            api.get_user_info,
+            api.get_reporter_settings,
+        ):
+            try:
+                await call()
+            except PerificAPIError as err:
+                errors.append(str(err))
+        return errors
+
+    errors = run_simulation(scenario)
+
+    assert "Cannot connect" in errors[0]
+    assert "503" in errors[1] and "Service unavailable" in errors[1]
+    assert "404" in errors[2]
+    print("✅ Replayed errors raise PerificAPIError")
+
+
+def test_record_service():
+    """The service records every entry for a while and writes the fixture."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        # Once the item's parameters were looked up
+        await sim.advance(minutes=1)
+        api = coordinator.api
+        sim.hass.data[DOMAIN] = {"entry": {"api": api, "coordinators": [coordinator]}}
+        async_setup_services(sim.hass)
+
+        await sim.hass.services.async_call(
+            DOMAIN, SERVICE_RECORD_REQUESTS, {"duration": 60}, blocking=True
+        )
+        recording = api.recording
+        await sim.advance(seconds=61)
+        await sim.hass.async_block_till_done()
+
+        paths = list(Path(sim.hass.config.config_dir).glob(f"{DOMAIN}_requests_*"))
+        return recording, api.recording, json.loads(paths[0].read_text())
+
+    recording, still_recording, fixture = run_simulation(scenario, meters=METERS)
+
+    assert recording and not still_recording
+    assert {request["path"] for request in fixture["requests"]} == {"/getlatestpackets"}
+    print(f"✅ Service recorded {len(fixture['requests'])} requests")
+
+
+if __name__ == "__main__":
+    test_redact()
+    test_redact_payloads()
+    test_record()
+    test_replay()
+    test_replay_errors()
+    test_record_service()
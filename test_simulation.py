@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Test polling and scheduling behaviour over hours of simulated time."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.perific.api import PerificAPIError
+from custom_components.perific.const import ITEM_PARAMETERS_RETRY, SCAN_INTERVAL_POWER
+from custom_components.perific.coordinator import PerificDataUpdateCoordinator
+from simulation import DEFAULT_ITEM_ID, DEFAULT_START, FakeMeter, run_simulation
+
+INTERVAL = SCAN_INTERVAL_POWER.total_seconds()
+HOURS = 6
+
+
+def test_steady_polling():
+    """One poll per interval, evenly spaced, for hours."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        await sim.advance(hours=HOURS)
+        return coordinator.last_update_success, sim.backend
+
+    success, backend = run_simulation(scenario)
+    times = backend.times("/getlatestpackets")
+    intervals = {round(b - a, 3) for a, b in zip(times, times[1:])}
+
+    assert success
+    assert len(times) == HOURS * 3600 / INTERVAL
+    assert intervals == {INTERVAL}
+    # Nothing reads the user info, so it is not polled
+    assert backend.count("/getuserinfo") == 0
+    assert backend.count("/refreshtoken") == 1
+    print(
+        f"✅ {len(times)} polls in {HOURS} simulated hours, {backend.count()} requests"
+    )
+
+
+def test_token_expiry():
+    """Tokens are refreshed shortly before they expire, never after."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        await sim.advance(hours=HOURS)
+        return coordinator.last_update_success, sim.backend
+
+    success, backend = run_simulation(scenario, token_lifetime=timedelta(hours=2))
+    refreshes = backend.times("/refreshtoken")
+    rejected = [request for request in backend.requests if request.status == 401]
+
+    assert success
+    assert not rejected
+    assert len(refreshes) == 4
+    assert all(7200 - 300 <= b - a <= 7200 for a, b in zip(refreshes, refreshes[1:]))
+    print(f"✅ Token refreshed at {[round(t / 60) for t in refreshes]} minutes")
+
+
+def test_outage():
+    """An API outage keeps the polling rate and recovers on the next poll."""
+
+    async def scenario(sim):
+        sim.backend.outage(3600, 4800)
+        coordinator = await sim.async_start_coordinator()
+        states = {}
+        for minutes in (62, 70, 81):
+            await sim.advance(minutes * 60 - sim.time)
+            states[minutes] = coordinator.last_update_success
+            if minutes == 70:
+                error = str(coordinator.last_exception)
+        return states, error, sim.backend
+
+    states, error, backend = run_simulation(scenario)
+    during = backend.count("/getlatestpackets", 3600, 4800)
+
+    # Stale data is served for a while, then the entities become unavailable
+    assert states == {62: True, 70: False, 81: True}
+    assert error.startswith("Latest data is ")
+    assert during == 1200 / INTERVAL
+    print(f"✅ {during} polls during a 20 minute outage, recovered afterwards")
+
+
+def test_backfill_after_meter_offline():
+    """A meter that stops posting is backfilled once with one history request."""
+    meter = FakeMeter(DEFAULT_ITEM_ID, offline=[(7200, 7800)])
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        await sim.advance(hours=3)
+        offline = [sim.backend.start + timedelta(seconds=t) for t in (7200, 7800)]
+        return (
+            coordinator.minute_history.samples(DEFAULT_ITEM_ID, *offline),
+            sim.backend,
+        )
+
+    samples, backend = run_simulation(scenario, meters=[meter])
+    backfills = backend.times("/getphasedata")
+
+    assert backend.times("/getphasedata", 0, 7800) == []
+    assert len(backfills) == 1 and backfills[0] - 7800 <= INTERVAL
+    assert len(samples) == 10
+    print(f"✅ Backfilled the gap {backfills[0] - 7800:.0f} s after the meter returned")
+
+
+def test_hourly_energy_statistics():
+    """Each hourly packet is imported once, with the meter's counters."""
+    imported = []
+
+    def record(hass, item_id, item_name, statistics):
+        imported.append(statistics["imported"])
+
+    async def scenario(sim):
+        await sim.async_start_coordinator()
+        await sim.advance(hours=HOURS)
+
+    with patch(
+        "custom_components.perific.coordinator.async_import_energy_statistics",
+        record,
+    ):
+        run_simulation(scenario)
+
+    hours = [stat["start"] for stat in imported]
+    sums = [stat["sum"] for stat in imported]
+
+    # Packets carry no timestamp, each closes the hour before it arrived
+    assert hours == [
+        DEFAULT_START + timedelta(hours=hour) for hour in range(-1, HOURS - 1)
+    ]
+    assert all(round(b - a, 3) == 4.0 for a, b in zip(sums, sums[1:]))
+    print(f"✅ Imported {len(hours)} hours of energy statistics")
+
+
+def test_item_attributes():
+    """Entity attributes are shared per item and hold no per-poll values."""
+
+    async def scenario(sim):
+        coordinator = await sim.async_start_coordinator()
+        # Once the poll after the item's parameters were looked up ran
+        await sim.advance(seconds=INTERVAL + 1)
+        first = coordinator.data["items"][DEFAULT_ITEM_ID]["attributes"]
+        await sim.advance(minutes=5)
+        return first, coordinator.data["items"][DEFAULT_ITEM_ID]["attributes"]
+
+    first, last = run_simulation(scenario)
+
+    assert "timestamp" not in last and "signal_strength" not in last
+    assert {key: value for key, value in first.items() if key != "data_age"} == {
+        key: value for key, value in last.items() if key != "data_age"
+    }
+    print(f"✅ Shared attributes {sorted(last)}")
+
+
+def test_shards():
+    """Shards of a large account share one packets request per interval."""
+    meters = [FakeMeter(DEFAULT_ITEM_ID + index) for index in range(100)]
+
+    async def scenario(sim):
+        coordinators = await sim.async_start_shards(shard_size=25)
+        await sim.advance(hours=1)
+        return [len(c.data["items"]) for c in coordinators], sim.backend
+
+    sizes, backend = run_simulation(scenario, meters=meters)
+
+    assert sizes == [25, 25, 25, 25]
+    # The shards poll together every interval, while item parameters are
+    # looked up once in the background, within the request rate limit
+    times = backend.times("/getlatestpackets")
+    assert {round(b - a, 3) for a, b in zip(times, times[1:])} == {INTERVAL}
+    assert backend.count("/getitemuserparameters") == len(meters)
+    print(f"✅ {len(sizes)} shards, {backend.count()} requests in one simulated hour")
+
+
+def test_phase_offsets():
+    """Coordinators with different phase offsets never poll together."""
+
+    async def scenario(sim):
+        api = await sim.async_create_api()
+        offsets = [0.0, INTERVAL / 2]
+        for offset in offsets:
+            await sim.async_start_coordinator(api, phase_offset=offset)
+        await sim.advance(hours=1)
+        return sim.backend
+
+    backend = run_simulation(scenario)
+    times = backend.times("/getlatestpackets", since=INTERVAL)
+    gaps = {round(b - a, 3) for a, b in zip(times, times[1:])}
+
+    assert gaps == {INTERVAL / 2}
+    print(f"✅ {len(times)} polls spaced {INTERVAL / 2:.0f} s apart")
+
+
+def test_lazy_item_parameters():
+    """Shards start on fallback details and look up parameters in turn."""
+    meters = [FakeMeter(DEFAULT_ITEM_ID + index) for index in range(100)]
+
+    async def scenario(sim):
+        api = await sim.async_create_api()
+        lookups = []
+        get_item_parameters = api.get_item_parameters
+
+        async def recording_lookup(item_id, *args):
+            lookups.append((item_id, sim.time))
+            return await get_item_parameters(item_id, *args)
+
+        api.get_item_parameters = recording_lookup
+        start = sim.time
+        coordinators = await sim.async_start_shards(api, shard_size=25)
+        started = sim.time - start
+        names = [
+            {item["info"]["name"] for item in c.data["items"].values()}
+            for c in coordinators
+        ]
+        await sim.advance(hours=1)
+        items = {}
+        for coordinator in coordinators:
+            items.update(coordinator.data["items"])
+        return started, names, lookups, items
+
+    started, names, lookups, items = run_simulation(scenario, meters=meters)
+
+    assert started < 1
+    assert all(name.startswith("Item ") for shard in names for name in shard)
+    assert all(item["info"]["name"] == "Energy Meter" for item in items.values())
+    # One shard after another, each item once
+    ordered = [item_id for item_id, _ in lookups]
+    assert ordered == sorted(ordered) == sorted(items)
+    print(f"✅ Started in {started:.2f} s, parameters by {lookups[-1][1]:.0f} s")
+
+
+def test_failed_item_parameters():
+    """A failed lookup is retried after a doubling backoff, not every poll."""
+
+    async def scenario(sim):
+        api = await sim.async_create_api()
+        lookups = []
+
+        async def failing_lookup(item_id, *args):
+            lookups.append(sim.time)
+            raise PerificAPIError("Item not found")
+
+        api.get_item_parameters = failing_lookup
+        coordinator = await sim.async_start_coordinator(api)
+        await sim.advance(hours=1)
+        return lookups, coordinator
+
+    lookups, coordinator = run_simulation(scenario)
+    retry = ITEM_PARAMETERS_RETRY.total_seconds()
+
+    assert [round(b - a) for a, b in zip(lookups, lookups[1:])] == [
+        retry,
+        retry * 2,
+        retry * 4,
+    ]
+    assert coordinator.last_update_success
+    assert coordinator.data["items"][DEFAULT_ITEM_ID]["info"]["name"] == (
+        f"Item {DEFAULT_ITEM_ID}"
+    )
+    print(f"✅ Failed lookup retried at {[round(t) for t in lookups]} s")
+
+
+def test_new_items_reload():
+    """A meter added after setup reloads the entry once."""
+
+    async def scenario(sim):
+        reloads = []
+        sim.hass.config_entries = SimpleNamespace(async_schedule_reload=reloads.append)
+        coordinators = await sim.async_start_shards(shard_size=1)
+        for coordinator in coordinators:
+            coordinator.config_entry = SimpleNamespace(
+                entry_id="entry",
+                pref_disable_polling=False,
+                async_create_background_task=(
+                    lambda hass, target, name: hass.async_create_background_task(
+                        target, name
+                    )
+                ),
+            )
+        await sim.advance(minutes=5)
+        sim.backend.meters[DEFAULT_ITEM_ID + 1] = FakeMeter(DEFAULT_ITEM_ID + 1)
+        await sim.advance(minutes=5)
+        return reloads
+
+    reloads = run_simulation(scenario)
+
+    assert reloads == ["entry"]
+    print("✅ New meter reloaded the entry")
+
+
+def test_polling_follows_listeners():
+    """Scheduled refreshes run while anyone listens, on the public refresh API."""
+
+    async def scenario(sim):
+        coordinator = PerificDataUpdateCoordinator(
+            sim.hass, await sim.async_create_api()
+        )
+        refreshes = []
+        refresh = coordinator.async_refresh
+
+        async def counting_refresh():
+            refreshes.append(sim.time)
+            await refresh()
+
+        coordinator.async_refresh = counting_refresh
+        await coordinator.async_refresh()
+        first = coordinator.async_add_listener(lambda: None)
+        await sim.advance(minutes=5)
+        # Removing one of two listeners keeps polling
+        coordinator.async_add_listener(lambda: None)()
+        await sim.advance(minutes=5)
+        first()
+        quiet = sim.time
+        await sim.advance(minutes=5)
+        coordinator.async_add_listener(lambda: None)
+        await sim.advance(minutes=5)
+        return coordinator.update_interval, refreshes, quiet
+
+    update_interval, refreshes, quiet = run_simulation(scenario)
+
+    assert update_interval is None
+    assert len([t for t in refreshes if t <= quiet]) == 1 + 600 / INTERVAL
+    assert not [t for t in refreshes if quiet < t <= quiet + 300]
+    resumed = [t for t in refreshes if t > quiet + 300]
+    assert resumed[0] == quiet + 300 + INTERVAL
+    assert {round(b - a, 3) for a, b in zip(resumed, resumed[1:])} == {INTERVAL}
+    print(f"✅ {len(refreshes)} scheduled refreshes, none without listeners")
+
+
+if __name__ == "__main__":
+    test_steady_polling()
+    test_token_expiry()
+    test_outage()
+    test_backfill_after_meter_offline()
+    test_hourly_energy_statistics()
+    test_item_attributes()
+    test_shards()
+    test_lazy_item_parameters()
+    test_failed_item_parameters()
+    test_new_items_reload()
+    test_phase_offsets()
+    test_polling_follows_listeners()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test that config entries set up together refresh at staggered times."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import custom_components.perific as perific
+from custom_components.perific import limiter
+from custom_components.perific.const import API_BASE_URL, DOMAIN, SCAN_INTERVAL_POWER
+from custom_components.perific.limiter import RequestLimiter
+from simulation import run_simulation
+
+INTERVAL = SCAN_INTERVAL_POWER.total_seconds()
+ENTRIES = 3
+
+
+def config_entry(entry_id: str) -> SimpleNamespace:
+    """Build the parts of a config entry that setup uses."""
+    return SimpleNamespace(
+        entry_id=entry_id,
+        data={"email": "user@example.com"},
+        options={},
+        async_on_unload=lambda func: None,
+        add_update_listener=lambda listener: None,
+    )
+
+
+def test_staggered_refreshes():
+    """Setup doesn't wait, each entry's scheduled refreshes keep to its slot."""
+
+    async def scenario(sim):
+        # Enough requests for every setup, so only a stagger could delay one
+        limiter._LIMITERS[urlsplit(API_BASE_URL).netloc] = RequestLimiter(burst=100)
+        entries = [config_entry(f"entry{slot}") for slot in range(ENTRIES)]
+        sim.hass.config_entries = SimpleNamespace(
+            async_entries=lambda domain: entries,
+            async_forward_entry_setups=lambda entry, platforms: asyncio.sleep(0),
+        )
+        with patch.object(
+            perific.aiohttp_client,
+            "async_get_clientsession",
+            lambda hass: sim.backend,
+        ):
+            # One after another, the fake backend rotates its one account's token
+            for entry in entries:
+                entry.data["token"] = sim.backend.token
+                await perific.async_setup_entry(sim.hass, entry)
+        setup = sim.time
+
+        for entry in entries:
+            for coordinator in sim.hass.data[DOMAIN][entry.entry_id]["coordinators"]:
+                coordinator.async_add_listener(lambda: None)
+        await sim.advance(minutes=5)
+        return setup, sim.backend.times("/getlatestpackets", since=setup + 1)
+
+    setup, times = run_simulation(scenario)
+
+    # Home Assistant is still starting, but no entry's setup is delayed
+    assert setup < 1
+    # The entries poll at their own offsets within every interval
+    offsets = [round(time % INTERVAL, 3) for time in times]
+    assert sorted(set(offsets)) == [
+        INTERVAL * slot / ENTRIES for slot in range(ENTRIES)
+    ]
+    assert {b - a for a, b in zip(times, times[1:])} == {INTERVAL / ENTRIES}
+    print(f"✅ Set up in {setup:.2f} s, refreshes at {sorted(set(offsets))} s")
+
+
+if __name__ == "__main__":
+    test_staggered_refreshes()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Test hourly energy statistics from PhaseHour packets."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.perific.stats import hour_energy_statistics
+
+HOUR = datetime(2025, 7, 14, 16, 0, tzinfo=timezone.utc)
+
+# As documented for /getlatestpackets, without a timestamp
+PHASE_HOUR = {
+    "data": {
+        "dv": 2,
+        "hiavg": [-13.14, -12.79, -13.81],
+        "himin": [-16.69, -15.69, -16.99],
+        "himax": [0, 0, 0],
+        "huavg": [240.1, 239.3, 241.9],
+        "hwpi": [0, 0, 0],
+        "hwpo": [3.168, 3.064, 3.353],
+        "hwi": 57142.768,
+        "hwo": 221.315,
+    }
+}
+
+
+def test_hour_energy_statistics():
+    """The hourly counters close the hour before the one they are received in."""
+    for received in (HOUR, HOUR + timedelta(seconds=20), HOUR + timedelta(minutes=59)):
+        energy = hour_energy_statistics(PHASE_HOUR, received)
+        assert energy["imported"] == {
+            "start": HOUR - timedelta(hours=1),
+            "state": 57142.768,
+            "sum": 57142.768,
+        }
+        assert energy["exported"]["sum"] == 221.315
+    print("✅ Hourly packets map to the hour they close")
+
+
+def test_incomplete_packets():
+    """Packets without counters are ignored."""
+    assert hour_energy_statistics({}, HOUR) == {}
+    assert hour_energy_statistics({"data": {"hwi": None, "hwo": 0.0}}, HOUR) == {}
+    print("✅ Incomplete packets are ignored")
+
+
+if __name__ == "__main__":
+    test_hour_energy_statistics()
+    test_incomplete_packets()
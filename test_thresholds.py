@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test threshold crossing events."""
+
+from custom_components.perific.const import EVENT_THRESHOLD
+from custom_components.perific.thresholds import Threshold, ThresholdMonitor
+from simulation import DEFAULT_ITEM_ID, FakeMeter, run_simulation
+
+
+def test_hysteresis():
+    """A crossing is reported once until the value leaves the hysteresis band."""
+    monitor = ThresholdMonitor([Threshold("import_current", 20.0, 2.0, phase="l1")])
+
+    states = []
+    for current in [-10.0, -20.0, -25.0, -19.0, -18.5, -17.9, -30.0]:
+        crossings = monitor.evaluate(1, {"l1": current, "l2": 0.0, "l3": 0.0})
+        states.extend((crossing["state"], crossing["value"]) for crossing in crossings)
+
+    assert states == [("above", 20.0), ("below", 17.9), ("above", 30.0)]
+    print(f"✅ Crossings {states}")
+
+
+def test_items_and_phases():
+    """Thresholds apply to their item and phase, or to all of them."""
+    monitor = ThresholdMonitor(
+        [
+            Threshold("export_current", 1.0),
+            Threshold("current", 10.0, item_id=2, phase="l3"),
+        ]
+    )
+    current = {"l1": 2.0, "l2": -12.0, "l3": -12.0}
+
+    first = [
+        (c["item_id"], c["metric"], c["phase"]) for c in monitor.evaluate(1, current)
+    ]
+    second = [
+        (c["item_id"], c["metric"], c["phase"]) for c in monitor.evaluate(2, current)
+    ]
+
+    assert first == [(1, "export_current", "l1")]
+    assert second == [(2, "export_current", "l1"), (2, "current", "l3")]
+    assert monitor.evaluate(2, current) == []
+    assert ThresholdMonitor().evaluate(1, current) == []
+    print(f"✅ {len(first) + len(second)} crossings for two items")
+
+
+def test_stored_options():
+    """Thresholds round-trip through the options."""
+    threshold = Threshold("current", 16.0, item_id=DEFAULT_ITEM_ID, phase="l2")
+
+    assert Threshold.from_dict(threshold.as_dict()) == threshold
+    assert Threshold.from_dict({"metric": "current", "level": "16"}).phase is None
+    print(f"✅ {threshold.label({DEFAULT_ITEM_ID: 'Main'})}")
+
+
+def test_coordinator_events():
+    """Crossings fire bus events with the raw values on the poll that sees them."""
+    meter = FakeMeter(DEFAULT_ITEM_ID, current=(-5.59, -5.59, -6.09))
+
+    async def scenario(sim):
+        events = []
+        sim.hass.bus.async_listen(EVENT_THRESHOLD, events.append)
+        monitor = ThresholdMonitor([Threshold("import_current", 6.0, 1.0)])
+        await sim.async_start_coordinator(thresholds=monitor)
+        await sim.advance(minutes=5)
+
+        meter.current = (-5.59, -5.59, -4.5)
+        await sim.advance(minutes=5)
+        await sim.hass.async_block_till_done()
+        return [event.data for event in events]
+
+    events = run_simulation(scenario, meters=[meter])
+
+    assert [(event["state"], event["phase"]) for event in events] == [
+        ("above", "l3"),
+        ("below", "l3"),
+    ]
+    assert events[1]["currents"] == {"l1": -5.59, "l2": -5.59, "l3": -4.5}
+    assert events[1]["voltages"]["l3"] == 240.0
+    assert events[1]["item_name"] == meter.name
+    print(f"✅ Events {[(event['state'], event['value']) for event in events]}")
+
+
+if __name__ == "__main__":
+    test_hysteresis()
+    test_items_and_phases()
+    test_stored_options()
+    test_coordinator_events()
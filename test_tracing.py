@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Test sampled tracing of API calls."""
+
+import asyncio
+import json
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+from custom_components.perific.api import PerificAPI, PerificAPIError
+from custom_components.perific.const import DOMAIN
+from custom_components.perific.diagnostics import async_get_config_entry_diagnostics
+from custom_components.perific.limiter import RequestPriority
+from custom_components.perific.tracing import RequestTracer
+from simulation import run_simulation
+
+
+async def serve(handler):
+    """Start a local server answering every request with `handler`."""
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def test_request_timings():
+    """Sampled requests record status, sizes and aiohttp timings."""
+
+    async def handler(request):
+        if request.path == "/missing":
+            return web.json_response({"Message": "Not found"}, status=404)
+        return web.json_response({"Email": "user@example.com", "Pad": "x" * 1000})
+
+    async def run():
+        runner, port = await serve(handler)
+        tracer = RequestTracer(1.0)
+        session = ClientSession(trace_configs=[tracer.trace_config()])
+        api = PerificAPI("user@example.com", "token", session=session, tracer=tracer)
+        try:
+            for path in ("/getuserinfo", "/getuserinfo", "/missing"):
+                try:
+                    await api._send(
+                        "POST",
+                        f"http://localhost:{port}{path}",
+                        RequestPriority.REALTIME,
+                        PerificAPIError,
+                        "Request failed",
+                        json={"itemId": 1},
+                    )
+                except PerificAPIError:
+                    pass
+        finally:
+            await session.close()
+            await runner.cleanup()
+        return list(tracer.records)
+
+    first, second, failed = asyncio.run(run())
+
+    assert first["endpoint"] == "/getuserinfo" and first["method"] == "POST"
+    assert first["status"] == 200
+    assert first["request_bytes"] > 0 and first["response_bytes"] > 1000
+    assert first["dns_ms"] is not None and first["connect_ms"] is not None
+    assert first["ttfb_ms"] <= first["total_ms"]
+    assert first["reused_connection"] is False
+    assert second["reused_connection"] is True and second["connect_ms"] is None
+    assert failed["status"] == 404 and failed["error"].startswith("ClientResponse")
+    print(f"✅ Traced {first['endpoint']} in {first['total_ms']} ms")
+
+
+def test_interrupted_requests():
+    """Timed out and cancelled requests still leave a trace."""
+
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    async def run():
+        runner, port = await serve(handler)
+        tracer = RequestTracer(1.0)
+        session = ClientSession(trace_configs=[tracer.trace_config()])
+        api = PerificAPI("user@example.com", "token", session=session, tracer=tracer)
+
+        def send(**kwargs):
+            return api._send(
+                "POST",
+                f"http://localhost:{port}/getlatestpackets",
+                RequestPriority.REALTIME,
+                PerificAPIError,
+                "Request failed",
+                **kwargs,
+            )
+
+        try:
+            try:
+                await send(timeout=ClientTimeout(total=0.05))
+            except PerificAPIError as err:
+                timed_out = str(err)
+            task = asyncio.ensure_future(send())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        finally:
+            await session.close()
+            await runner.cleanup()
+        return timed_out, list(tracer.records)
+
+    timed_out, (timeout, cancelled) = asyncio.run(run())
+
+    assert timed_out == "Request failed: request timed out"
+    assert timeout["error"].startswith("TimeoutError")
+    assert cancelled["error"].startswith("CancelledError")
+    assert timeout["total_ms"] is not None and cancelled["total_ms"] is not None
+    print(f"✅ Traced a timeout after {timeout['total_ms']} ms and a cancellation")
+
+
+def test_sampling_and_buffer():
+    """Only the sampled share is kept, in a bounded buffer."""
+    off, on = RequestTracer(0.0), RequestTracer(1.0, buffer_size=10)
+    for index in range(50):
+        off.cache_lookup("latest_packets", True, index)
+        on.cache_lookup("latest_packets", True, index)
+
+    assert len(off.records) == 0
+    assert [record["age_s"] for record in on.records] == list(range(40, 50))
+    print(f"✅ {len(on.records)} of 50 records kept")
+
+
+def test_diagnostics():
+    """Diagnostics dump cache and request traces without credentials."""
+
+    async def scenario(sim):
+        tracer = RequestTracer(1.0)
+        api = await sim.async_create_api(tracer=tracer)
+        coordinator = await sim.async_start_coordinator(api)
+        await sim.advance(minutes=2)
+
+        entry = type(
+            "Entry",
+            (),
+            {
+                "entry_id": "entry",
+                "data": {"email": "user@example.com", "token": "secret"},
+                "options": {"trace_sample_rate": 1.0},
+            },
+        )()
+        sim.hass.data[DOMAIN] = {"entry": {"api": api, "coordinators": [coordinator]}}
+        return await async_get_config_entry_diagnostics(sim.hass, entry)
+
+    diagnostics = run_simulation(scenario)
+    dumped = json.dumps(diagnostics)
+    traces = diagnostics["traces"]
+
+    assert "secret" not in dumped and "user@example.com" not in dumped
+    assert {"request", "cache"} == {trace["type"] for trace in traces}
+    assert {"hit", "miss"} <= {t["result"] for t in traces if t["type"] == "cache"}
+    assert any(t.get("endpoint") == "/getlatestpackets" for t in traces)
+    print(f"✅ Diagnostics with {len(traces)} trace records")
+
+
+if __name__ == "__main__":
+    test_request_timings()
+    test_interrupted_requests()
+    test_sampling_and_buffer()
+    test_diagnostics()